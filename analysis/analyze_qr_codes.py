@@ -12,7 +12,11 @@ import sys
 import cv2
 import argparse
 from pyzbar.pyzbar import decode
-import re
+
+# Projektverzeichnis zum Python-Pfad hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.parser import parse_label
 
 
 def decode_qr_code(image_path):
@@ -36,69 +40,8 @@ def decode_qr_code(image_path):
         # QR-Code-Daten extrahieren
         raw_data = qr.data.decode('utf-8', errors='ignore')
 
-        # Standardwerte
-        auftrags_nr = ""
-        paket_nr = ""
-        kunden_name = ""
-
-        # Spezielles durch ^ getrenntes Format (hat höchste Priorität)
-        if '^' in raw_data:
-            parts = raw_data.split('^')
-
-            # Wir benötigen mindestens 4 Teile für Auftragsnummer und Paketnummer
-            if len(parts) >= 4:
-                # Auftragsnummer ist im zweiten Feld (Index 1)
-                auftrags_nr = parts[1]
-
-                # Paketnummer ist im vierten Feld (Index 3)
-                paket_nr = parts[3]
-
-                # Falls verfügbar, Kundennummer oder ID im dritten Feld (Index 2)
-                if len(parts) > 2:
-                    kunden_name = f"Kunden-ID: {parts[2]}"
-        else:
-            # Auftragsnummer versuchen zu extrahieren
-            auftrags_nr_match = re.search(r'[A-Z]{2}-\d+', raw_data)
-            if auftrags_nr_match:
-                auftrags_nr = auftrags_nr_match.group(0)
-
-            # Paketnummer versuchen zu extrahieren
-            paket_nr_match = re.search(r'\d{10,}', raw_data)
-            if paket_nr_match:
-                paket_nr = paket_nr_match.group(0)
-
-            # Kundenname versuchen zu extrahieren
-            if "KUNDENNAME:" in raw_data:
-                parts = raw_data.split("KUNDENNAME:")
-                if len(parts) > 1:
-                    kunden_name = parts[1].strip()
-                    # Bis zum nächsten Schlüsselwort oder Ende nehmen
-                    end_markers = ["PAKET-NR", "AUFTRAG", "\n"]
-                    for marker in end_markers:
-                        if marker in kunden_name:
-                            kunden_name = kunden_name.split(marker)[0].strip()
-
-            # Zusätzlicher Versuch für Referenz-Format
-            if not auftrags_nr:
-                referenz_match = re.search(r'Referenz:\s+([A-Z0-9-]+)', raw_data)
-                if referenz_match:
-                    auftrags_nr = referenz_match.group(1)
-
-            # Nach "Tracking: XXX" oder ähnlichen Patterns suchen
-            if not paket_nr:
-                tracking_match = re.search(r'Tracking:\s+(\d+)', raw_data)
-                if tracking_match:
-                    paket_nr = tracking_match.group(1)
-
-        # Ergebnis speichern
-        result = {
-            "raw_data": raw_data,
-            "auftrags_nr": auftrags_nr,
-            "paket_nr": paket_nr,
-            "kunden_name": kunden_name
-        }
-
-        results.append(result)
+        # Gemeinsamer Etiketten-Parser (wie im Scanner)
+        results.append(parse_label(raw_data))
 
     return results
 
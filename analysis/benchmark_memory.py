@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Speicher-Benchmark der Frame-Verarbeitung
+-----------------------------------------
+Lässt Frames einer Kamera oder Videodatei durch Aufnahme, Vorfilter,
+Decoder und Anzeigepuffer laufen und misst mit tracemalloc, wie viel
+Speicher pro Frame angelegt wird und wie sich der Gesamtverbrauch
+über die Laufzeit entwickelt
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+
+# Projektverzeichnis zum Python-Pfad hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scanner.camera import Camera
+from src.scanner.decoder import QRDecoder
+from src.scanner.frame_gate import FrameGate
+
+
+def run_benchmark(source, frames, reuse_buffers=True, backend="pyzbar", report_every=100):
+    """
+    Führt den Benchmark aus
+
+    Args:
+        source: Kamera-ID oder Pfad zu einer Videodatei
+        frames: Anzahl der zu verarbeitenden Frames
+        reuse_buffers: Wiederverwendete Puffer verwenden
+        backend: Decoder-Backend
+        report_every: Abstand der Messpunkte in Frames
+
+    Returns:
+        dict: Messergebnisse
+    """
+    camera = Camera(source, threaded=True, reuse_buffers=reuse_buffers)
+    if not camera.is_opened():
+        raise RuntimeError(f"Quelle {source} konnte nicht geöffnet werden")
+
+    decoder = QRDecoder(backend=backend)
+    gate = FrameGate()
+    display_buffer = None
+
+    transient = []
+    samples = []
+    processed = 0
+    last_seq = 0
+
+    tracemalloc.start()
+    start = time.perf_counter()
+
+    try:
+        while processed < frames:
+            latest = camera.latest_frame(newer_than=last_seq, timeout=1.0, retain=True)
+            if latest is None:
+                break
+            last_seq = latest.seq
+
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+
+            try:
+                image = latest.image
+                if gate.check(image):
+                    decoder.decode_image(image)
+
+                # Anzeigebild wie in der GUI in einen wiederverwendeten Puffer kopieren
+                if reuse_buffers:
+                    if display_buffer is None or display_buffer.shape != image.shape:
+                        display_buffer = np.empty_like(image)
+                    np.copyto(display_buffer, image)
+                else:
+                    display_buffer = image.copy()
+            finally:
+                camera.release_frame(latest)
+
+            _, peak = tracemalloc.get_traced_memory()
+            transient.append(peak - before)
+            processed += 1
+
+            if processed % report_every == 0:
+                current, _ = tracemalloc.get_traced_memory()
+                samples.append((processed, current))
+    finally:
+        elapsed = time.perf_counter() - start
+        tracemalloc.stop()
+        pool_stats = camera.buffer_pool.get_stats() if camera.buffer_pool is not None else None
+        camera.release()
+
+    return {
+        "frames": processed,
+        "fps": processed / elapsed if elapsed > 0 else 0.0,
+        "mean_transient_bytes": float(np.mean(transient)) if transient else 0.0,
+        "samples": samples,
+        "pool": pool_stats
+    }
+
+
+def print_results(results):
+    """Gibt die Messergebnisse aus"""
+    print(f"\nVerarbeitete Frames: {results['frames']} ({results['fps']:.1f} FPS)")
+    print(f"Angelegter Speicher pro Frame (Mittel): {results['mean_transient_bytes'] / 1024:.1f} KiB")
+    if results["pool"] is not None:
+        print(f"Puffer-Pool: {results['pool']}")
+
+    print("\nBelegter Speicher im Verlauf:")
+    print("-" * 40)
+    for frame, current in results["samples"]:
+        print(f"Frame {frame:>7}: {current / 1024:10.1f} KiB")
+    print("-" * 40)
+
+
+def parse_arguments():
+    """Parst die Kommandozeilenargumente"""
+    parser = argparse.ArgumentParser(description="Speicher-Benchmark der Frame-Verarbeitung")
+
+    parser.add_argument("--source", default="0", help="Kamera-ID oder Videodatei (Standard: 0)")
+    parser.add_argument("--frames", type=int, default=1000, help="Anzahl der Frames")
+    parser.add_argument("--no-reuse", action="store_true", help="Ohne wiederverwendete Puffer messen")
+    parser.add_argument("--backend", default="pyzbar", help="Decoder-Backend")
+    parser.add_argument("--report-every", type=int, default=100, help="Abstand der Messpunkte")
+
+    return parser.parse_args()
+
+
+def main():
+    """Hauptfunktion"""
+    args = parse_arguments()
+    source = int(args.source) if args.source.isdigit() else args.source
+
+    results = run_benchmark(source, args.frames, not args.no_reuse, args.backend, args.report_every)
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Decoder-Kalibrierung
+--------------------
+Misst Latenz und Trefferquote der Decoder-Backends auf einer Sammlung
+von Etiketten-Bildern und speichert das schnellste zuverlässige Backend
+in den Einstellungen der Anwendung
+"""
+
+import os
+import sys
+import cv2
+import argparse
+
+# Projektverzeichnis zum Python-Pfad hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scanner.decoder import calibrate_backends, BACKENDS
+
+
+def load_images(paths):
+    """Lädt alle Bilder aus den angegebenen Dateien und Verzeichnissen"""
+    image_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith((".png", ".jpg", ".jpeg", ".bmp")):
+                    image_paths.append(os.path.join(path, name))
+        else:
+            image_paths.append(path)
+
+    images = []
+    for image_path in image_paths:
+        image = cv2.imread(image_path)
+        if image is None:
+            print(f"Fehler: Bild {image_path} konnte nicht geladen werden")
+            continue
+        images.append(image)
+
+    return images
+
+
+def print_results(results):
+    """Gibt die Kalibrierungsergebnisse aus"""
+    print("\nDecoder-Backends:")
+    print("-" * 40)
+
+    for result in results:
+        print(f"{result['name']:<20} {result['mean_ms']:8.2f} ms  Trefferquote {result['hit_rate']:.0%}")
+
+    print("-" * 40)
+
+
+def parse_arguments():
+    """Parst die Kommandozeilenargumente"""
+    parser = argparse.ArgumentParser(description="Kalibrierung der Decoder-Backends")
+
+    parser.add_argument("images", nargs="+", help="Bilder oder Verzeichnisse mit Etiketten")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS),
+                        help="Zu messende Backends (z.B. pyzbar opencv race fallback:opencv,pyzbar)")
+    parser.add_argument("--repeat", type=int, default=3, help="Durchläufe pro Bild")
+    parser.add_argument("--save", action="store_true",
+                        help="Bestes Backend in den Einstellungen der Anwendung speichern")
+
+    return parser.parse_args()
+
+
+def main():
+    """Hauptfunktion"""
+    args = parse_arguments()
+
+    images = load_images(args.images)
+    if not images:
+        print("Keine Bilder gefunden")
+        return
+
+    results = calibrate_backends(images, args.backends, args.repeat)
+    print_results(results)
+
+    best = results[0]["name"]
+    print(f"Empfohlenes Backend: {best}")
+
+    if args.save:
+        from PyQt6.QtCore import QSettings
+        settings = QSettings("Shirtful", "QR-Code Scanner")
+        settings.setValue("decoder/backend", best)
+        settings.sync()
+        print("Backend in den Einstellungen gespeichert")
+
+
+if __name__ == "__main__":
+    main()
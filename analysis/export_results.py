@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Scan-Ergebnisse exportieren
+---------------------------
+Exportiert die Ergebnisse einer SQLite-Datenbank, eines Journals oder
+eines JSON-Archivs zeilenweise als CSV, JSON oder JSONL (mit .gz komprimiert) - auch bei
+Millionen von Zeilen mit konstantem Speicherbedarf.
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Projektverzeichnis zum Python-Pfad hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.archive import ScanArchive
+from src.data.storage import ScanResultStorage, ArchiveBackend, read_checkpoint
+
+
+def open_storage(path):
+    """
+    Öffnet eine Datenbank (.db), ein Journal (.jsonl) oder ein JSON-Archiv (.json) zum Lesen
+
+    Raises:
+        ValueError: Bei einer unbekannten Dateiendung
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    if path.lower().endswith((".db", ".sqlite", ".sqlite3")):
+        return ScanResultStorage(directory, backend="sqlite", database_path=path)
+    if path.lower().endswith(".jsonl"):
+        # Nur lesend ab dem Checkpoint: das Journal einer laufenden Anwendung wird weder
+        # vollständig geladen noch verändert (eine halb geschriebene Zeile wird übersprungen)
+        archive = ScanArchive(path, use_index_file=False, start=read_checkpoint(path))
+        return ScanResultStorage(directory, backend=ArchiveBackend(archive))
+    if path.lower().endswith(".json"):
+        storage = ScanResultStorage(directory)
+        if not storage.load_from_json(path):
+            raise ValueError(f"Ungültiges JSON-Archiv: {path}")
+        return storage
+    raise ValueError(f"Unbekannter Speicher: {path} (erwartet: .db, .jsonl oder .json)")
+
+
+def parse_arguments():
+    """Parst die Kommandozeilenargumente"""
+    parser = argparse.ArgumentParser(description="Scan-Ergebnisse exportieren")
+
+    parser.add_argument("storage", help="SQLite-Datenbank (.db), Journal (.jsonl) oder JSON-Archiv (.json)")
+    parser.add_argument("output", help="Zieldatei (.csv, .json oder .jsonl, optional mit .gz)")
+    parser.add_argument("--since", help="Nur Ergebnisse ab diesem Zeitpunkt (ISO-Format, z.B. 2026-01-01)")
+    parser.add_argument("--until", help="Nur Ergebnisse vor diesem Zeitpunkt (ISO-Format)")
+    parser.add_argument("--offset", type=int, default=0, help="So viele Ergebnisse überspringen")
+    parser.add_argument("--limit", type=int, default=None, help="Höchstens so viele Ergebnisse exportieren")
+
+    return parser.parse_args()
+
+
+def main():
+    """Hauptfunktion"""
+    args = parse_arguments()
+
+    if not os.path.exists(args.storage):
+        print(f"Datei nicht gefunden: {args.storage}")
+        return
+
+    try:
+        storage = open_storage(args.storage)
+    except ValueError as e:
+        print(f"Fehler: {e}")
+        return
+
+    try:
+        total = max(0, storage.count_results(since=args.since, until=args.until) - args.offset)
+        if args.limit is not None:
+            total = min(total, args.limit)
+
+        def progress(count):
+            percent = 100.0 * count / total if total else 100.0
+            print(f"\r{count}/{total} Zeilen ({percent:.0f} %)", end="", file=sys.stderr, flush=True)
+
+        start = time.perf_counter()
+        count = storage.export(args.output, since=args.since, until=args.until,
+                               offset=args.offset, limit=args.limit, progress=progress)
+        elapsed = time.perf_counter() - start
+        print(file=sys.stderr)
+        print(f"{count} Ergebnisse in {elapsed:.2f} s nach {args.output} exportiert")
+    except (ValueError, OSError) as e:
+        print(f"Fehler beim Export: {e}")
+    finally:
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
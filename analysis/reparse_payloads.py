@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Rohdaten neu parsen
+-------------------
+Parst gespeicherte Rohdaten (raw_data) nach einer Änderung am Etiketten-Parser
+erneut - blockweise über mehrere Prozesse und mit Ausgabe in Eingabereihenfolge.
+
+Eingabeformate:
+    lines  Ein Inhalt pro Zeile
+    jsonl  Ein JSON-Wert pro Zeile: Objekt mit raw_data oder Zeichenkette
+    csv    CSV-Export des Scanners (Spalte raw_data)
+    json   JSON-Export des Scanners (Liste von Objekten mit raw_data)
+
+Die Ausgabe ist JSONL: pro Eingabe das ursprüngliche Objekt mit den neu
+geparsten Feldern.
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+from collections import deque
+
+# Projektverzeichnis zum Python-Pfad hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.parser import KEY_KEYWORDS, parse_many
+
+# Dateiendung -> Eingabeformat
+FORMAT_EXTENSIONS = {
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".csv": "csv",
+    ".json": "json"
+}
+
+
+def detect_format(path):
+    """Ermittelt das Eingabeformat anhand der Dateiendung (Standard: lines)"""
+    return FORMAT_EXTENSIONS.get(os.path.splitext(path)[1].lower(), "lines")
+
+
+def read_records(f, input_format):
+    """
+    Liest die Einträge einer Eingabedatei nacheinander
+
+    Args:
+        f: Geöffnete Textdatei
+        input_format: "lines", "jsonl", "csv" oder "json"
+
+    Yields:
+        dict: Eintrag mit mindestens raw_data
+    """
+    if input_format == "csv":
+        for row in csv.DictReader(f):
+            if row.get("raw_data") is not None:
+                yield row
+        return
+
+    if input_format == "json":
+        # Der JSON-Export ist eine einzige Liste und wird vollständig geladen
+        for item in json.load(f):
+            if isinstance(item, dict) and item.get("raw_data") is not None:
+                yield item
+        return
+
+    for line_number, line in enumerate(f, 1):
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
+
+        if input_format == "lines":
+            yield {"raw_data": line}
+            continue
+
+        try:
+            item = json.loads(line)
+        except ValueError as e:
+            print(f"Zeile {line_number} übersprungen: {e}", file=sys.stderr)
+            continue
+
+        if isinstance(item, str):
+            yield {"raw_data": item}
+        elif isinstance(item, dict) and isinstance(item.get("raw_data"), str):
+            yield item
+        else:
+            print(f"Zeile {line_number} übersprungen: kein raw_data", file=sys.stderr)
+
+
+def reparse(records, workers=None, chunk_size=500, synonyms=None):
+    """
+    Parst die Rohdaten der Einträge neu
+
+    Args:
+        records: Iterierbare Einträge mit raw_data
+        workers: Anzahl der Worker-Prozesse
+        chunk_size: Anzahl der Inhalte pro Block
+        synonyms: Zusätzliche Schlüsselwörter pro Feld
+
+    Yields:
+        dict: Eintrag mit den neu geparsten Feldern, in Eingabereihenfolge
+    """
+    # Einträge, deren Inhalt bereits an parse_many übergeben wurde
+    waiting = deque()
+
+    def payloads():
+        for record in records:
+            waiting.append(record)
+            yield record["raw_data"]
+
+    for parsed in parse_many(payloads(), workers=workers, chunk_size=chunk_size, synonyms=synonyms):
+        record = waiting.popleft()
+        record.update(parsed)
+        yield record
+
+
+def parse_synonyms(values):
+    """
+    Liest zusätzliche Schlüsselwörter aus Angaben der Form feld=wort
+
+    Raises:
+        argparse.ArgumentTypeError: Bei einer ungültigen Angabe
+    """
+    synonyms = {}
+    for value in values or []:
+        field, _, word = value.partition("=")
+        if field not in KEY_KEYWORDS or not word:
+            raise argparse.ArgumentTypeError(
+                f"Ungültiges Schlüsselwort '{value}' (erwartet: feld=wort, feld aus {', '.join(KEY_KEYWORDS)})")
+        synonyms.setdefault(field, []).append(word)
+    return synonyms
+
+
+def parse_arguments():
+    """Parst die Kommandozeilenargumente"""
+    parser = argparse.ArgumentParser(description="Gespeicherte Rohdaten neu parsen")
+
+    parser.add_argument("input", help="Eingabedatei ('-' für die Standardeingabe)")
+    parser.add_argument("--format", choices=["auto", "lines", "jsonl", "csv", "json"], default="auto",
+                        help="Eingabeformat (Standard: anhand der Dateiendung)")
+    parser.add_argument("--output", help="Ausgabedatei (JSONL, Standard: Standardausgabe)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Anzahl der Worker-Prozesse (1 = ohne Prozess-Pool)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Anzahl der Inhalte pro Block")
+    parser.add_argument("--synonym", action="append", metavar="FELD=WORT",
+                        help="Zusätzliches Schlüsselwort, z.B. paket_nr=colli (mehrfach möglich)")
+
+    return parser.parse_args()
+
+
+def main():
+    """Hauptfunktion"""
+    args = parse_arguments()
+
+    try:
+        synonyms = parse_synonyms(args.synonym)
+    except argparse.ArgumentTypeError as e:
+        print(f"Fehler: {e}", file=sys.stderr)
+        return
+
+    input_format = args.format
+    if input_format == "auto":
+        input_format = "lines" if args.input == "-" else detect_format(args.input)
+
+    if args.input == "-":
+        infile = sys.stdin
+    else:
+        try:
+            infile = open(args.input, "r", newline="" if input_format == "csv" else None, encoding="utf-8")
+        except OSError as e:
+            print(f"Fehler: {e}", file=sys.stderr)
+            return
+
+    outfile = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+
+    count = 0
+    start = time.perf_counter()
+    try:
+        for record in reparse(read_records(infile, input_format), workers=args.workers,
+                              chunk_size=args.chunk_size, synonyms=synonyms):
+            outfile.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed > 0 else 0.0
+    print(f"{count} Inhalte neu geparst in {elapsed:.2f} s ({rate:.0f} pro Sekunde)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
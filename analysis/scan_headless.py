@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Scannen ohne GUI
+----------------
+Lässt eine Kamera, eine Videodatei, ein Bildverzeichnis oder eine
+aufgezeichnete Sitzung durch die komplette Scan-Pipeline (Decoder,
+Duplikaterkennung, Parser, Speicherung) laufen - für Lasttests, die
+Neuverarbeitung aufgezeichneter Daten und den Vergleich von Änderungen
+an der Pipeline auf echten Aufnahmen
+"""
+
+import os
+import sys
+import argparse
+from functools import partial
+
+# Projektverzeichnis zum Python-Pfad hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.scanner.decoder import QRDecoder
+from src.scanner.frame_gate import FrameGate
+from src.scanner.pipeline import ScanPipeline
+from src.scanner.sources import open_source
+from src.data.storage import ScanResultStorage
+
+# Dateiendungen, für die direkt in eine SQLite-Datenbank bzw. ein Journal geschrieben wird
+DATABASE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+JOURNAL_EXTENSIONS = (".jsonl",)
+
+
+def print_results(stats):
+    """Gibt die Statistik des Durchlaufs aus"""
+    print("\nErgebnis des Durchlaufs:")
+    print("-" * 40)
+    print(f"{'Gelesene Frames:':<26}{stats['frames']}")
+    print(f"{'Vom Vorfilter verworfen:':<26}{stats['skipped_gate']}")
+    print(f"{'Decodierte Frames:':<26}{stats['decoded']} (Fehler: {stats['failed']})")
+    print(f"{'Erkannte Etiketten:':<26}{stats['detections']}")
+    print(f"{'Laufzeit:':<26}{stats['elapsed']:.2f} s ({stats['fps']:.1f} FPS)")
+    print("-" * 40)
+
+
+def parse_arguments():
+    """Parst die Kommandozeilenargumente"""
+    parser = argparse.ArgumentParser(description="Scan-Pipeline ohne GUI")
+
+    parser.add_argument("source", help="Kamera-ID, Videodatei, Bildverzeichnis oder Sitzungsverzeichnis")
+    parser.add_argument("--max-speed", action="store_true",
+                        help="Ohne Echtzeit-Taktung so schnell wie möglich verarbeiten")
+    parser.add_argument("--max-frames", type=int, default=None, help="Höchstens so viele Frames lesen")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Anzahl der Decodier-Worker")
+    parser.add_argument("--processes", action="store_true", help="Prozess-Pool statt Thread-Pool verwenden")
+    parser.add_argument("--backend", default="pyzbar", help="Decoder-Backend")
+    parser.add_argument("--tracking", action="store_true",
+                        help="Decoder-Tracking wie in der GUI (mit nur einem Worker, damit das Ergebnis "
+                             "reproduzierbar bleibt)")
+    parser.add_argument("--no-gate", action="store_true", help="Ohne Vorfilter decodieren")
+    parser.add_argument("--dedup-ttl", type=float, default=10.0,
+                        help="Zeitfenster der Duplikaterkennung in Sekunden")
+    parser.add_argument("--output", help="Ergebnisse speichern (.json, .csv, Journal .jsonl oder SQLite-Datenbank .db)")
+
+    return parser.parse_args()
+
+
+def main():
+    """Hauptfunktion"""
+    args = parse_arguments()
+
+    try:
+        source = open_source(args.source, max_speed=args.max_speed)
+    except ValueError as e:
+        print(f"Fehler: {e}")
+        return
+
+    storage = None
+    if args.output:
+        output_path = os.path.abspath(args.output)
+        if output_path.lower().endswith(DATABASE_EXTENSIONS):
+            # Direkt in die Datenbank schreiben, die Ergebnisse liegen nicht im Speicher
+            storage = ScanResultStorage(os.path.dirname(output_path), backend="sqlite",
+                                        database_path=output_path)
+        elif output_path.lower().endswith(JOURNAL_EXTENSIONS):
+            # Jeder Scan wird sofort als Zeile angehängt
+            storage = ScanResultStorage(os.path.dirname(output_path), backend="journal",
+                                        journal_path=output_path)
+        else:
+            storage = ScanResultStorage(os.path.dirname(output_path))
+
+    # Mit Tracking hängt das Ergebnis eines Decoders von den vorherigen Frames ab,
+    # daher müssen alle Frames in Reihenfolge durch denselben Decoder laufen
+    workers = 1 if args.tracking else args.workers
+
+    pipeline = ScanPipeline(
+        source,
+        storage=storage,
+        workers=workers,
+        use_processes=args.processes,
+        decoder_factory=partial(QRDecoder, backend=args.backend, tracking=args.tracking),
+        gate=None if args.no_gate else FrameGate(),
+        dedup_ttl=args.dedup_ttl,
+        on_detection=lambda qr_code: print(f"Erkannt: {qr_code.get('raw_data', '')}")
+    )
+
+    try:
+        stats = pipeline.run(max_frames=args.max_frames)
+    finally:
+        source.release()
+
+    print_results(stats)
+
+    if storage is not None:
+        filename = os.path.basename(args.output)
+        if filename.lower().endswith(DATABASE_EXTENSIONS + JOURNAL_EXTENSIONS):
+            storage.close()
+            success = True
+        elif filename.lower().endswith(".csv"):
+            success = storage.save_to_csv(filename)
+        else:
+            success = storage.save_to_json(filename)
+        print(f"Ergebnisse {'gespeichert' if success else 'konnten nicht gespeichert werden'}: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
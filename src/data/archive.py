@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Seitenweiser Zugriff auf große Archive von Scan-Ergebnissen (JSON-Liste oder JSONL)
+
+Beim ersten Öffnen wird die Datei einmal durchlaufen und die Position jedes
+Eintrags in einer Indexdatei neben dem Archiv abgelegt (ARCHIV.idx). Danach
+werden nur die angeforderten Einträge gelesen. Solange sich das Archiv nicht
+ändert (Größe und Änderungszeit), wird der Index beim erneuten Öffnen
+wiederverwendet.
+"""
+
+import os
+import json
+import codecs
+import logging
+from array import array
+
+logger = logging.getLogger("ScanResultStorage")
+
+# Dateiendung und Version der Indexdatei
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+
+# Blockgröße beim Einlesen
+READ_SIZE = 1 << 20
+
+# Leerzeichen zwischen den Einträgen einer JSON-Liste
+_WHITESPACE = " \t\r\n"
+
+
+class ScanArchive:
+    """Archiv von Scan-Ergebnissen mit Index der Eintragspositionen"""
+
+    def __init__(self, path, use_index_file=True, start=0):
+        """
+        Öffnet ein Archiv und lädt oder erstellt seinen Index
+
+        Args:
+            path: JSON-Datei (Liste von Objekten) oder JSONL-Datei (ein Objekt pro Zeile)
+            use_index_file: Index in ARCHIV.idx zwischenspeichern und wiederverwenden
+            start: Erst ab dieser Byte-Position lesen (nur JSONL, z.B. der Checkpoint eines
+                   Journals); ohne Indexdatei
+
+        Raises:
+            OSError: Wenn die Datei nicht gelesen werden kann
+            ValueError: Wenn die Datei kein gültiges Archiv ist
+        """
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+        self.format = None
+
+        # Position und Länge (Bytes) jedes Eintrags
+        self.offsets = array("Q")
+        self.lengths = array("Q")
+        self.index_reused = False
+
+        stat = os.stat(path)
+        self._signature = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        self.start = start if 0 <= start <= stat.st_size else 0
+        if self.start:
+            use_index_file = False
+
+        if use_index_file and self._load_index():
+            self.index_reused = True
+        else:
+            self._build_index()
+            if use_index_file:
+                self._save_index()
+
+        self._file = open(path, "rb")
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def _load_index(self):
+        """
+        Lädt den Index aus der Indexdatei, sofern er zum Archiv passt
+
+        Returns:
+            bool: True, wenn der Index geladen wurde
+        """
+        try:
+            with open(self.index_path, "rb") as f:
+                header = json.loads(f.readline())
+                if (header.get("version") != INDEX_VERSION or header.get("size") != self._signature["size"]
+                        or header.get("mtime_ns") != self._signature["mtime_ns"]):
+                    return False
+
+                count = header["count"]
+                offsets = array("Q")
+                lengths = array("Q")
+                offsets.fromfile(f, count)
+                lengths.fromfile(f, count)
+        except FileNotFoundError:
+            return False
+        except (OSError, ValueError, KeyError, EOFError) as e:
+            logger.warning(f"Index {self.index_path} ist ungültig und wird neu erstellt: {e}")
+            return False
+
+        self.format = header["format"]
+        self.offsets, self.lengths = offsets, lengths
+        return True
+
+    def _save_index(self):
+        """Schreibt den Index atomar in die Indexdatei"""
+        header = dict(self._signature, version=INDEX_VERSION, format=self.format, count=len(self.offsets))
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(json.dumps(header).encode("utf-8") + b"\n")
+                self.offsets.tofile(f)
+                self.lengths.tofile(f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            # Ohne Index funktioniert das Archiv weiterhin, er wird nur beim nächsten Mal neu erstellt
+            logger.warning(f"Index {self.index_path} konnte nicht gespeichert werden: {e}")
+
+    def _build_index(self):
+        """Durchläuft das Archiv einmal und merkt sich die Position jedes Eintrags"""
+        with open(self.path, "rb") as f:
+            f.seek(self.start)
+            start = f.read(64).lstrip(codecs.BOM_UTF8 + b" \t\r\n")
+            f.seek(self.start)
+
+            if start.startswith(b"[") and not self.start:
+                self.format = "json"
+                self._index_json_array(f)
+            elif self.path.lower().endswith(".json"):
+                # Eine .json-Datei muss eine Liste sein (z.B. kein einzelnes Objekt)
+                raise ValueError(f"{self.path} enthält keine gültige Liste von Scan-Ergebnissen")
+            elif start.startswith(b"{") or not start:
+                self.format = "jsonl"
+                self._index_json_lines(f)
+            else:
+                raise ValueError(f"{self.path} ist weder eine JSON-Liste noch eine JSONL-Datei")
+
+        logger.info(f"Archiv {self.path} indiziert: {len(self.offsets)} Einträge")
+
+    def _index_json_lines(self, f):
+        """
+        Index einer JSONL-Datei: jede nicht leere Zeile ist ein Eintrag
+
+        Jede Zeile wird einmal decodiert und muss ein Objekt sein. Eine unvollständige
+        letzte Zeile ohne Zeilenumbruch (z.B. ein Journal, in das gerade geschrieben wird)
+        wird übersprungen.
+
+        Raises:
+            ValueError: Bei einer ungültigen Zeile
+        """
+        offset = self.start
+        for number, line in enumerate(f, 1):
+            # Ein BOM am Dateianfang gehört nicht zum Eintrag
+            skip = len(codecs.BOM_UTF8) if offset == 0 and line.startswith(codecs.BOM_UTF8) else 0
+            content = line[skip:].strip()
+
+            if content:
+                try:
+                    record = json.loads(content)
+                except ValueError as e:
+                    if not line.endswith(b"\n"):
+                        logger.warning(f"Unvollständige letzte Zeile in {self.path} übersprungen")
+                        break
+                    raise ValueError(f"Ungültige Zeile {number} in {self.path}: {e}")
+                if not isinstance(record, dict):
+                    raise ValueError(f"Zeile {number} in {self.path} ist kein Scan-Ergebnis")
+
+                self.offsets.append(offset + skip)
+                self.lengths.append(len(line) - skip)
+            offset += len(line)
+
+    def _index_json_array(self, f):
+        """
+        Index einer JSON-Liste
+
+        Jeder Eintrag wird einmal mit raw_decode gelesen, um sein Ende zu finden; der
+        Text wird blockweise decodiert, die Byte-Positionen werden mitgezählt.
+        """
+        decoder = json.JSONDecoder()
+        text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+
+        buffer = ""
+        position = 0        # Position in buffer
+        byte_position = 0   # Byte-Position von buffer[position] in der Datei
+        eof = False
+        started = False
+        read_size = READ_SIZE
+
+        if f.read(len(codecs.BOM_UTF8)) == codecs.BOM_UTF8:
+            byte_position = len(codecs.BOM_UTF8)
+        else:
+            f.seek(0)
+
+        def advance(new_position):
+            nonlocal position, byte_position
+            byte_position += len(buffer[position:new_position].encode("utf-8"))
+            position = new_position
+
+        while True:
+            # Trennzeichen überspringen
+            end = position
+            while end < len(buffer) and (buffer[end] in _WHITESPACE or (started and buffer[end] == ",")):
+                end += 1
+            advance(end)
+
+            if position < len(buffer):
+                char = buffer[position]
+                if not started:
+                    if char != "[":
+                        raise ValueError(f"{self.path} beginnt nicht mit einer JSON-Liste")
+                    started = True
+                    advance(position + 1)
+                    continue
+                if char == "]":
+                    # Nach dem Ende der Liste darf nur noch Leerraum folgen
+                    rest = buffer[position + 1:] + text_decoder.decode(f.read(), final=True)
+                    if rest.strip(_WHITESPACE):
+                        raise ValueError(f"{self.path} enthält Daten nach dem Ende der JSON-Liste")
+                    return
+
+                try:
+                    record, end = decoder.raw_decode(buffer, position)
+                except ValueError:
+                    if eof:
+                        raise ValueError(f"Ungültiger Eintrag in {self.path} bei Byte {byte_position}")
+                    end = None
+
+                # Ein Eintrag am Ende des Puffers kann noch unvollständig sein
+                if end is not None and (end < len(buffer) or eof):
+                    if not isinstance(record, dict):
+                        raise ValueError(f"Eintrag {len(self.offsets) + 1} in {self.path} ist kein Scan-Ergebnis")
+                    start = byte_position
+                    advance(end)
+                    self.offsets.append(start)
+                    self.lengths.append(byte_position - start)
+                    continue
+
+            if eof:
+                raise ValueError(f"{self.path} endet vor dem Ende der JSON-Liste")
+
+            # Verarbeiteten Teil verwerfen und den nächsten Block lesen
+            buffer = buffer[position:]
+            position = 0
+            data = f.read(read_size)
+            eof = not data
+            buffer += text_decoder.decode(data, final=eof)
+
+            # Sehr große Einträge: Blockgröße verdoppeln, damit nicht quadratisch oft decodiert wird
+            if len(buffer) > read_size:
+                read_size *= 2
+
+    def get(self, index):
+        """
+        Liest einen Eintrag
+
+        Args:
+            index: Nummer des Eintrags (negativ vom Ende)
+
+        Returns:
+            dict: Der Eintrag
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Eintrag außerhalb des Archivs")
+        return self.page(index, 1)[0]
+
+    def page(self, offset=0, limit=None):
+        """
+        Liest einen zusammenhängenden Bereich von Einträgen mit einem Lesezugriff
+
+        Args:
+            offset: Nummer des ersten Eintrags
+            limit: Höchstens so viele Einträge (Standard: bis zum Ende)
+
+        Returns:
+            list: Die Einträge
+        """
+        offset = max(0, offset)
+        end = len(self) if limit is None else min(len(self), offset + limit)
+        if offset >= end:
+            return []
+
+        first = self.offsets[offset]
+        self._file.seek(first)
+        data = self._file.read(self.offsets[end - 1] + self.lengths[end - 1] - first)
+
+        return [json.loads(data[self.offsets[i] - first:self.offsets[i] - first + self.lengths[i]])
+                for i in range(offset, end)]
+
+    def iter_records(self, offset=0, limit=None, page_size=1000):
+        """
+        Liefert die Einträge seitenweise nacheinander
+
+        Yields:
+            dict: Die Einträge ab offset
+        """
+        end = len(self) if limit is None else min(len(self), offset + limit)
+        for start in range(offset, end, page_size):
+            yield from self.page(start, min(page_size, end - start))
+
+    def __iter__(self):
+        return self.iter_records()
+
+    def close(self):
+        """Schließt die Archivdatei"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
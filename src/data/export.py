@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Export der Scan-Ergebnisse als CSV, JSON oder JSONL
+
+Die Ergebnisse werden aus einem Iterator (z.B. ScanResultStorage.iter_results)
+Zeile für Zeile geschrieben, der Speicherbedarf hängt daher nicht von der Anzahl
+der Ergebnisse ab. Endet der Dateiname auf .gz, wird gzip-komprimiert geschrieben.
+"""
+
+import csv
+import gzip
+import json
+
+# Spalten eines Exports (weitere Felder der Ergebnisse werden nicht exportiert)
+EXPORT_COLUMNS = ["timestamp", "auftrags_nr", "paket_nr", "kunden_name", "raw_data", "symbology", "camera_id"]
+
+# Unterstützte Formate
+EXPORT_FORMATS = ("csv", "json", "jsonl")
+
+# Nach so vielen Zeilen wird der Fortschritt gemeldet
+PROGRESS_INTERVAL = 1000
+
+
+def export_format(path):
+    """
+    Ermittelt das Exportformat anhand des Dateinamens (auch mit .gz)
+
+    Args:
+        path: Zieldatei, z.B. "scans.csv.gz"
+
+    Returns:
+        str: "csv", "json" oder "jsonl"
+
+    Raises:
+        ValueError: Bei einer unbekannten Dateiendung
+    """
+    name = path.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+
+    extension = name.rpartition(".")[2]
+    if extension not in EXPORT_FORMATS:
+        raise ValueError(f"Unbekanntes Exportformat: {path}")
+    return extension
+
+
+def open_export_file(path, compress=None):
+    """
+    Öffnet eine Exportdatei zum Schreiben (Text, UTF-8)
+
+    Args:
+        path: Zieldatei
+        compress: gzip verwenden (Standard: wenn der Dateiname auf .gz endet)
+
+    Returns:
+        Die geöffnete Textdatei
+    """
+    if compress is None:
+        compress = path.lower().endswith(".gz")
+    if compress:
+        return gzip.open(path, "wt", encoding="utf-8", newline="")
+    return open(path, "w", encoding="utf-8", newline="")
+
+
+def _counted(results, progress, interval):
+    """Zählt die Ergebnisse beim Durchlaufen und meldet den Fortschritt"""
+    count = 0
+    for result in results:
+        yield result
+        count += 1
+        if progress is not None and count % interval == 0:
+            progress(count)
+    if progress is not None and count % interval != 0:
+        progress(count)
+
+
+def export_csv(results, f, columns=None, header=None, progress=None, interval=PROGRESS_INTERVAL):
+    """
+    Schreibt Ergebnisse als CSV
+
+    Args:
+        results: Iterierbare Ergebnisse
+        f: Geöffnete Textdatei
+        columns: Exportierte Felder (Standard: EXPORT_COLUMNS)
+        header: Spaltenüberschriften (Standard: die Feldnamen)
+        progress: Funktion progress(anzahl), wird alle interval Zeilen aufgerufen
+        interval: Abstand der Fortschrittsmeldungen in Zeilen
+
+    Returns:
+        int: Anzahl der geschriebenen Zeilen
+    """
+    columns = columns or EXPORT_COLUMNS
+    writer = csv.writer(f)
+    writer.writerow(header or columns)
+
+    count = 0
+    for result in _counted(results, progress, interval):
+        writer.writerow([result.get(column, "") for column in columns])
+        count += 1
+    return count
+
+
+def export_json(results, f, progress=None, interval=PROGRESS_INTERVAL):
+    """
+    Schreibt Ergebnisse als JSON-Liste (ein eingerücktes Objekt nach dem anderen)
+
+    Args:
+        results: Iterierbare Ergebnisse
+        f: Geöffnete Textdatei
+        progress: Funktion progress(anzahl), wird alle interval Zeilen aufgerufen
+        interval: Abstand der Fortschrittsmeldungen in Zeilen
+
+    Returns:
+        int: Anzahl der geschriebenen Ergebnisse
+    """
+    count = 0
+    f.write("[")
+    for result in _counted(results, progress, interval):
+        item = json.dumps(result, indent=2, ensure_ascii=False, default=str)
+        f.write(",\n  " if count else "\n  ")
+        f.write(item.replace("\n", "\n  "))
+        count += 1
+    f.write("\n]" if count else "]")
+    return count
+
+
+def export_jsonl(results, f, progress=None, interval=PROGRESS_INTERVAL):
+    """
+    Schreibt Ergebnisse als JSONL (ein Objekt pro Zeile)
+
+    Args:
+        results: Iterierbare Ergebnisse
+        f: Geöffnete Textdatei
+        progress: Funktion progress(anzahl), wird alle interval Zeilen aufgerufen
+        interval: Abstand der Fortschrittsmeldungen in Zeilen
+
+    Returns:
+        int: Anzahl der geschriebenen Ergebnisse
+    """
+    count = 0
+    for result in _counted(results, progress, interval):
+        f.write(json.dumps(result, ensure_ascii=False, default=str))
+        f.write("\n")
+        count += 1
+    return count
+
+
+def export_results(results, path, format=None, compress=None, columns=None, header=None,
+                   progress=None, interval=PROGRESS_INTERVAL):
+    """
+    Exportiert Ergebnisse in eine Datei
+
+    Args:
+        results: Iterierbare Ergebnisse
+        path: Zieldatei
+        format: "csv", "json" oder "jsonl" (Standard: anhand des Dateinamens)
+        compress: gzip verwenden (Standard: wenn der Dateiname auf .gz endet)
+        columns: Exportierte Felder bei CSV (Standard: EXPORT_COLUMNS)
+        header: Spaltenüberschriften bei CSV (Standard: die Feldnamen)
+        progress: Funktion progress(anzahl), wird alle interval Zeilen aufgerufen
+        interval: Abstand der Fortschrittsmeldungen in Zeilen
+
+    Returns:
+        int: Anzahl der exportierten Ergebnisse
+
+    Raises:
+        ValueError: Bei einem unbekannten Format
+        OSError: Wenn die Datei nicht geschrieben werden kann
+    """
+    format = format or export_format(path)
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"Unbekanntes Exportformat: {format}")
+
+    with open_export_file(path, compress) as f:
+        if format == "csv":
+            return export_csv(results, f, columns, header, progress, interval)
+        if format == "json":
+            return export_json(results, f, progress, interval)
+        return export_jsonl(results, f, progress, interval)
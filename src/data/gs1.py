@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Parser für GS1-Elementketten (Application Identifier) auf Versandetiketten
+
+Unterstützt werden die Rohform mit FNC1/GS (Zeichen 29) als Trennzeichen, optional
+mit Symbologie-Kennung (]C1, ]d2, ]Q3, ]e0), sowie die Klarschrift mit Klammern,
+z.B. "(00)340123450000000017(401)AB-12345".
+"""
+
+from collections import namedtuple
+
+# Trennzeichen für Elemente variabler Länge (FNC1 in der Rohform)
+GS = "\x1d"
+
+# Symbologie-Kennungen, die GS1-Daten ankündigen
+SYMBOLOGY_PREFIXES = ("]C1", "]d2", "]Q3", "]e0", "]J1")
+
+# Maximale Länge eines Datenelements variabler Länge
+MAX_VARIABLE_LENGTH = 90
+
+# Beschreibung eines Application Identifiers
+#   length: feste Länge der Daten oder None (variabel, endet an GS oder am Ende)
+#   max_length: maximale Länge bei variabler Länge
+#   numeric: Daten bestehen nur aus Ziffern
+#   check_digit: letzte Ziffer ist eine GS1-Prüfziffer
+AISpec = namedtuple("AISpec", ["name", "length", "max_length", "numeric", "check_digit"])
+
+# Bekannte Application Identifier (Auswahl der auf Versandetiketten üblichen)
+APPLICATION_IDENTIFIERS = {
+    "00": AISpec("SSCC", 18, 18, True, True),
+    "01": AISpec("GTIN", 14, 14, True, True),
+    "02": AISpec("CONTENT", 14, 14, True, True),
+    "10": AISpec("BATCH/LOT", None, 20, False, False),
+    "11": AISpec("PROD DATE", 6, 6, True, False),
+    "12": AISpec("DUE DATE", 6, 6, True, False),
+    "13": AISpec("PACK DATE", 6, 6, True, False),
+    "15": AISpec("BEST BEFORE", 6, 6, True, False),
+    "17": AISpec("USE BY", 6, 6, True, False),
+    "20": AISpec("VARIANT", 2, 2, True, False),
+    "21": AISpec("SERIAL", None, 20, False, False),
+    "37": AISpec("COUNT", None, 8, True, False),
+    "400": AISpec("ORDER NUMBER", None, 30, False, False),
+    "401": AISpec("GINC", None, 30, False, False),
+    "402": AISpec("GSIN", 17, 17, True, True),
+    "403": AISpec("ROUTE", None, 30, False, False),
+    "410": AISpec("SHIP TO LOC", 13, 13, True, True),
+    "411": AISpec("BILL TO", 13, 13, True, True),
+    "412": AISpec("PURCHASE FROM", 13, 13, True, True),
+    "413": AISpec("SHIP FOR LOC", 13, 13, True, True),
+    "414": AISpec("LOC No.", 13, 13, True, True),
+    "415": AISpec("PAY TO", 13, 13, True, True),
+    "420": AISpec("SHIP TO POST", None, 20, False, False),
+    "421": AISpec("SHIP TO POST", None, 12, False, False),
+}
+
+# Länge des AI anhand seiner ersten beiden Ziffern (GS1 General Specifications)
+AI_LENGTHS = {}
+AI_LENGTHS.update({f"{prefix:02d}": 2 for prefix in (0, 1, 2, 3, 4, 10, 11, 12, 13, 14, 15, 16, 17,
+                                                       18, 19, 20, 21, 22, 30, 37, 90, 91, 92, 93,
+                                                       94, 95, 96, 97, 98, 99)})
+AI_LENGTHS.update({f"{prefix:02d}": 3 for prefix in (23, 24, 25, 40, 41, 42, 71)})
+AI_LENGTHS.update({f"{prefix:02d}": 4 for prefix in (31, 32, 33, 34, 35, 36, 39, 43, 70, 72, 80, 81, 82)})
+
+# Vordefinierte Datenlängen unbekannter AIs anhand der ersten beiden Ziffern;
+# alle übrigen AIs haben variable Länge
+PREDEFINED_LENGTHS = {
+    "03": 14, "04": 16, "14": 6, "16": 6, "18": 6, "19": 6,
+    "31": 6, "32": 6, "33": 6, "34": 6, "35": 6, "36": 6, "41": 13
+}
+
+# Zuordnung zu den Etikettenfeldern (Reihenfolge = Priorität)
+FIELD_IDENTIFIERS = {
+    "paket_nr": ("00",),
+    "auftrags_nr": ("401", "400", "402"),
+    "kunden_name": ("410",)
+}
+
+
+def check_digit(digits):
+    """
+    Berechnet die GS1-Prüfziffer (Modulo 10, Gewichte 3 und 1 von rechts)
+
+    Args:
+        digits: Ziffern ohne Prüfziffer
+
+    Returns:
+        str: Die Prüfziffer
+    """
+    total = 0
+    for position, digit in enumerate(reversed(digits)):
+        total += int(digit) * (3 if position % 2 == 0 else 1)
+    return str((10 - total % 10) % 10)
+
+
+def has_valid_check_digit(value):
+    """Überprüft die Prüfziffer am Ende einer Ziffernfolge"""
+    return len(value) > 1 and value.isdigit() and check_digit(value[:-1]) == value[-1]
+
+
+def _spec_for(ai):
+    """Gibt die Beschreibung eines AI zurück (unbekannte AIs anhand ihres Präfixes)"""
+    spec = APPLICATION_IDENTIFIERS.get(ai)
+    if spec is not None:
+        return spec
+
+    length = PREDEFINED_LENGTHS.get(ai[:2])
+    return AISpec(ai, length, length or MAX_VARIABLE_LENGTH, length is not None, False)
+
+
+def _validate(spec, value):
+    """Überprüft ein Datenelement gegen die Beschreibung seines AI"""
+    if not value or len(value) > spec.max_length:
+        return False
+    if spec.length is not None and len(value) != spec.length:
+        return False
+    if spec.numeric and not value.isdigit():
+        return False
+    if spec.check_digit and not has_valid_check_digit(value):
+        return False
+    return True
+
+
+def _parse_raw(data):
+    """
+    Zerlegt die Rohform in einem Durchlauf
+
+    Returns:
+        dict: AI -> Wert oder None, wenn die Daten keine gültige Elementkette sind
+    """
+    elements = {}
+    position = 0
+    end = len(data)
+
+    while position < end:
+        # Überzählige Trennzeichen (z.B. FNC1 nach Elementen fester Länge) überspringen
+        if data[position] == GS:
+            position += 1
+            continue
+
+        ai_length = AI_LENGTHS.get(data[position:position + 2])
+        if ai_length is None:
+            return None
+
+        ai = data[position:position + ai_length]
+        if len(ai) != ai_length or not ai.isdigit():
+            return None
+        position += ai_length
+
+        spec = _spec_for(ai)
+        if spec.length is not None:
+            value = data[position:position + spec.length]
+            position += spec.length
+        else:
+            separator = data.find(GS, position)
+            if separator < 0:
+                separator = end
+            value = data[position:separator]
+            position = separator
+
+        if not _validate(spec, value):
+            return None
+        elements.setdefault(ai, value)
+
+    return elements or None
+
+
+def _parse_bracketed(data):
+    """
+    Zerlegt die Klarschrift "(AI)Wert(AI)Wert..." in einem Durchlauf
+
+    Returns:
+        dict: AI -> Wert oder None, wenn die Daten keine gültige Elementkette sind
+    """
+    elements = {}
+    position = 0
+    end = len(data)
+
+    while position < end:
+        if data[position] != "(":
+            return None
+
+        close = data.find(")", position + 1)
+        if close < 0:
+            return None
+
+        ai = data[position + 1:close]
+        if not ai.isdigit() or AI_LENGTHS.get(ai[:2]) != len(ai):
+            return None
+
+        following = data.find("(", close + 1)
+        if following < 0:
+            following = end
+        value = data[close + 1:following].strip()
+        position = following
+
+        if not _validate(_spec_for(ai), value):
+            return None
+        elements.setdefault(ai, value)
+
+    return elements or None
+
+
+def parse_gs1(content):
+    """
+    Zerlegt eine GS1-Elementkette in ihre Application Identifier
+
+    Ohne Symbologie-Kennung, GS oder Klammern wird eine reine Ziffernfolge nur als
+    GS1 akzeptiert, wenn sie mit einer gültigen SSCC (AI 00) beginnt.
+
+    Args:
+        content: Inhalt des Codes
+
+    Returns:
+        dict: AI -> Wert in der Reihenfolge des Codes, None wenn kein GS1-Inhalt vorliegt
+    """
+    if not content:
+        return None
+
+    data = content.strip(" \r\n")
+    explicit = False
+
+    if data.startswith(SYMBOLOGY_PREFIXES):
+        data = data[3:]
+        explicit = True
+
+    if data.startswith("("):
+        return _parse_bracketed(data)
+
+    if not explicit and GS not in data and not (data.startswith("00") and data[:20].isdigit()):
+        return None
+
+    return _parse_raw(data.lstrip(GS))
+
+
+def label_fields(elements):
+    """
+    Ermittelt die Etikettenfelder aus den Elementen einer GS1-Kette
+
+    Args:
+        elements: Ergebnis von parse_gs1
+
+    Returns:
+        dict: auftrags_nr, paket_nr, kunden_name (leer, falls nicht enthalten)
+    """
+    fields = {}
+    for field, identifiers in FIELD_IDENTIFIERS.items():
+        value = next((elements[ai] for ai in identifiers if ai in elements), "")
+        if field == "kunden_name" and value:
+            value = f"GLN: {value}"
+        fields[field] = value
+    return fields
@@ -3,20 +3,140 @@
 
 """
 Parser für QR-Code-Daten von Versandetiketten
+
+Alle Einstiegspunkte (Decoder, GUI, Analyse-Skripte) verwenden diesen Parser.
+Das Format wird am ersten Zeichen bzw. Präfix erkannt, jeder Inhalt wird
+höchstens einmal durchlaufen.
 """
 
+import os
 import re
 import json
 import logging
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlsplit, parse_qsl
+
+from src.data.gs1 import GS, parse_gs1, label_fields
+
+# Schlüsselwörter, an denen ein Feld im Schlüssel eines Schlüssel-Wert-Paars
+# oder JSON-Objekts erkannt wird (siehe build_keyword_index)
+KEY_KEYWORDS = {
+    "auftrags_nr": ("auftrag", "order", "bestellung", "referenz"),
+    "paket_nr": ("paket", "package", "sendung", "tracking"),
+    "kunden_name": ("kunde", "customer", "client", "name")
+}
+
+# URL-Parameter (exakte Namen) pro Feld
+URL_PARAMETERS = {
+    "auftrags_nr": ("order", "auftrag", "orderid", "auftragsid"),
+    "paket_nr": ("package", "paket", "packageid", "paketid", "tracking"),
+    "kunden_name": ("customer", "kunde", "name", "customername", "kundenname")
+}
+
+_URL_FIELDS = {name: field for field, names in URL_PARAMETERS.items() for name in names}
+
+# Ein Durchlauf über den Inhalt findet Schlüssel-Wert-Paare (am Zeilenanfang oder nach
+# "," bzw. ";") sowie freie Auftrags- und Paketnummern. Ein Wert endet am Zeilenende,
+# an ";" oder an einem "," vor dem nächsten Schlüssel.
+_TOKEN_PATTERN = re.compile(r"""
+    (?:^|(?<=[,;]))[ \t]*
+    (?P<key>[^\W\d_][^\n:,;]*?)[ \t]*:[ \t]*
+    (?P<value>[^\n;]*?)[ \t\r]*
+    (?=[,;][ \t]*[^\W\d_][^\n:,;]*:|[;\n]|$)
+  | (?P<order>[A-Z]{2}-\d+)
+  | (?P<parcel>\d{10,})
+""", re.MULTILINE | re.VERBOSE)
+
+# Auftrags- bzw. Paketnummer in einem Wert mit unbekanntem Schlüssel
+_VALUE_PATTERN = re.compile(r"(?P<order>[A-Z]{2}-\d+)|(?P<parcel>\d{10,})")
+
+# Zeichen, die vor dem eigentlichen Inhalt ignoriert werden (u.a. Byte Order Mark)
+_LEADING_CHARACTERS = "\ufeff \t\r\n"
+
+# Erste Zeichen, mit denen eine GS1-Elementkette beginnen kann
+_GS1_START_CHARACTERS = "](0" + GS
+
+# Maximale Anzahl zwischengespeicherter Schlüssel -> Feld-Zuordnungen
+_FIELD_CACHE_SIZE = 1024
+
+
+def build_keyword_index(keywords):
+    """
+    Fasst die Schlüsselwörter aller Felder in einem regulären Ausdruck zusammen
+
+    Ein Schlüssel wird dem Feld zugeordnet, dessen Schlüsselwort am weitesten links
+    im Schlüssel steht; an derselben Stelle gewinnt das längere Schlüsselwort.
+
+    Args:
+        keywords: Feldname -> Schlüsselwörter (kleingeschrieben); kommt ein Wort bei
+                  mehreren Feldern vor, gilt das erste Feld
+
+    Returns:
+        tuple: (re.Pattern, dict Schlüsselwort -> Feldname)
+    """
+    fields = {}
+    for field, words in keywords.items():
+        for word in words:
+            fields.setdefault(word, field)
+
+    if not fields:
+        # Passt auf nichts
+        return re.compile(r"(?!)"), fields
+
+    words = sorted(fields, key=len, reverse=True)
+    return re.compile("|".join(map(re.escape, words))), fields
 
 
 class ShippingLabelParser:
     """Parser für die Daten von Versandetiketten"""
 
-    def __init__(self):
-        """Initialisiert den Parser"""
+    def __init__(self, synonyms=None):
+        """
+        Initialisiert den Parser
+
+        Args:
+            synonyms: Zusätzliche Schlüsselwörter pro Feld (z.B. {"paket_nr": ["colli"]})
+        """
         self.logger = logging.getLogger("ShippingLabelParser")
 
+        self.keywords = {field: list(words) for field, words in KEY_KEYWORDS.items()}
+        for field, words in (synonyms or {}).items():
+            self._add_keywords(field, words)
+        self._rebuild_index()
+
+    def add_synonyms(self, field, *words):
+        """
+        Ergänzt standortspezifische Schlüsselwörter für ein Feld
+
+        Der Index wird dabei einmal neu aufgebaut, das Parsen bleibt gleich schnell.
+
+        Args:
+            field: "auftrags_nr", "paket_nr" oder "kunden_name"
+            words: Zusätzliche Schlüsselwörter (Groß-/Kleinschreibung egal)
+
+        Raises:
+            ValueError: Bei einem unbekannten Feld
+        """
+        self._add_keywords(field, words)
+        self._rebuild_index()
+
+    def _add_keywords(self, field, words):
+        """Fügt Schlüsselwörter ohne Neuaufbau des Index hinzu"""
+        if field not in self.keywords:
+            raise ValueError(f"Unbekanntes Feld: {field}")
+
+        for word in words:
+            word = word.strip().lower()
+            if word and word not in self.keywords[field]:
+                self.keywords[field].append(word)
+
+    def _rebuild_index(self):
+        """Baut den Schlüsselwort-Index neu auf und leert den Zuordnungs-Cache"""
+        self._keyword_index, self._keyword_fields = build_keyword_index(self.keywords)
+        self._field_cache = {}
+
     def parse_qr_content(self, content):
         """
         Parst den Inhalt eines QR-Codes von einem Versandetikett
@@ -25,7 +145,7 @@ class ShippingLabelParser:
             content: Der zu parsende Inhalt
 
         Returns:
-            dict: Extrahierte Daten
+            dict: Extrahierte Daten (auftrags_nr, paket_nr, kunden_name, raw_data)
         """
         result = {
             "auftrags_nr": "",
@@ -34,174 +154,225 @@ class ShippingLabelParser:
             "raw_data": content
         }
 
-        # Versuch, die Daten in verschiedenen Formaten zu parsen
-
-        # 0. Spezielles durch ^ getrenntes Format (hat höchste Priorität)
-        if '^' in content:
-            delimited_result = self._parse_delimited_format(content)
-            if delimited_result["auftrags_nr"] or delimited_result["paket_nr"]:
-                return delimited_result
+        text = content.lstrip(_LEADING_CHARACTERS)
+        if not text:
+            return result
 
-        # 1. Versuch: JSON-Format
-        if self._try_parse_json(content, result):
+        # GS1-Elementkette (SSCC, Sendungsnummer) über die AI-Tabelle, ohne weitere Formate
+        if text[0] in _GS1_START_CHARACTERS and self._parse_gs1(text, result):
             return result
 
-        # 2. Versuch: URL-Format
-        if self._try_parse_url(content, result):
+        # Durch ^ getrenntes Format
+        if "^" in text and self._parse_delimited(text, result):
             return result
 
-        # 3. Versuch: Schlüssel-Wert-Format
-        if self._try_parse_key_value(content, result):
+        # Format am ersten Zeichen bzw. Präfix erkennen
+        if text[0] == "{" and self._parse_json(text, result):
             return result
 
-        # 4. Versuch: Reguläre Ausdrücke für bekannte Muster
-        self._try_parse_regex(content, result)
+        if text[0] in "hH" and text[:8].lower().startswith(("http://", "https://")):
+            self._parse_url(text, result)
+            return result
 
+        # Schlüssel-Wert-Paare und freie Nummern in einem Durchlauf
+        self._parse_text(text, result)
         return result
 
-    def _parse_delimited_format(self, content):
+    def _parse_gs1(self, content, result):
+        """
+        Parst eine GS1-Elementkette
+
+        Returns:
+            bool: True, wenn der Inhalt eine gültige GS1-Elementkette ist
+        """
+        elements = parse_gs1(content)
+        if elements is None:
+            return False
+
+        result.update(label_fields(elements))
+        return True
+
+    def _parse_delimited(self, content, result):
         """
         Parst Daten im Format mit ^ als Trennzeichen:
         typ^auftragsnummer^kundennummer^paketnummer^anzahl^artikelnummer
 
-        Args:
-            content: Der zu parsende Inhalt
+        Returns:
+            bool: True, wenn das Format erkannt wurde
+        """
+        parts = content.split("^")
+
+        # Wir benötigen mindestens 4 Teile für Auftragsnummer und Paketnummer
+        if len(parts) < 4 or not (parts[1] or parts[3]):
+            return False
+
+        result["auftrags_nr"] = parts[1]
+        result["paket_nr"] = parts[3]
+        result["kunden_name"] = f"Kunden-ID: {parts[2]}"
+        return True
+
+    def _parse_json(self, content, result):
+        """
+        Parst ein JSON-Objekt anhand seiner Schlüssel
 
         Returns:
-            dict: Extrahierte Daten
+            bool: True, wenn der Inhalt ein JSON-Objekt ist
         """
-        result = {
-            "auftrags_nr": "",
-            "paket_nr": "",
-            "kunden_name": "",
-            "raw_data": content
-        }
+        try:
+            data = json.loads(content)
+        except ValueError:
+            return False
 
-        # Prüfen ob das Format dem erwarteten Muster entspricht (^ als Trennzeichen)
-        if '^' in content:
-            parts = content.split('^')
+        if not isinstance(data, dict):
+            return False
 
-            # Wir benötigen mindestens 4 Teile für Auftragsnummer und Paketnummer
-            if len(parts) >= 4:
-                # Auftragsnummer ist im zweiten Feld (Index 1)
-                result["auftrags_nr"] = parts[1]
+        for key, value in data.items():
+            field = self._field_for_key(key)
+            if field is not None and value is not None and not result[field]:
+                result[field] = str(value)
 
-                # Paketnummer ist im vierten Feld (Index 3)
-                result["paket_nr"] = parts[3]
+        return True
 
-                # Falls verfügbar, Kundennummer oder ID im dritten Feld (Index 2)
-                if len(parts) > 2:
-                    result["kunden_name"] = f"Kunden-ID: {parts[2]}"
+    def _parse_url(self, content, result):
+        """Parst die Parameter einer URL"""
+        try:
+            params = parse_qsl(urlsplit(content).query)
+        except ValueError as e:
+            self.logger.debug(f"URL konnte nicht geparst werden: {e}")
+            return
+
+        for name, value in params:
+            field = _URL_FIELDS.get(name.lower())
+            if field is not None and value and not result[field]:
+                result[field] = value
+
+    def _parse_text(self, content, result):
+        """Parst Schlüssel-Wert-Paare und freie Nummern in einem Durchlauf"""
+        # Werte mit passendem Schlüssel haben Vorrang vor frei gefundenen Nummern
+        found = {}
+
+        for match in _TOKEN_PATTERN.finditer(content):
+            key = match.group("key")
+            if key is not None:
+                value = match.group("value")
+                if not value:
+                    continue
+
+                field = self._field_for_key(key)
+                if field is not None:
+                    if not result[field]:
+                        result[field] = value
+                    continue
+
+                # Unbekannter Schlüssel: nur im Wert nach Nummern suchen
+                value_match = _VALUE_PATTERN.search(value)
+                if value_match is None:
+                    continue
+                match = value_match
+
+            if match.group("order"):
+                found.setdefault("auftrags_nr", match.group("order"))
+            elif match.group("parcel"):
+                found.setdefault("paket_nr", match.group("parcel"))
+
+        for field, value in found.items():
+            if not result[field]:
+                result[field] = value
+
+    def _field_for_key(self, key):
+        """
+        Ordnet einen Schlüssel einem Feld zu
 
-        return result
+        Args:
+            key: Schlüssel aus einem Schlüssel-Wert-Paar oder JSON-Objekt
 
-    def _try_parse_json(self, content, result):
-        """Versucht, den Inhalt als JSON zu parsen"""
+        Returns:
+            str: Feldname oder None
+        """
         try:
-            data = json.loads(content)
+            return self._field_cache[key]
+        except KeyError:
+            pass
 
-            # Nach bekannten Feldern suchen
-            for key, value in data.items():
-                key_lower = key.lower()
+        match = self._keyword_index.search(key.lower())
+        field = self._keyword_fields[match.group(0)] if match else None
 
-                if any(x in key_lower for x in ["auftrag", "order", "bestellung"]):
-                    result["auftrags_nr"] = str(value)
+        # Dieselben Schlüssel wiederholen sich von Etikett zu Etikett
+        if len(self._field_cache) >= _FIELD_CACHE_SIZE:
+            self._field_cache.clear()
+        self._field_cache[key] = field
+        return field
 
-                elif any(x in key_lower for x in ["paket", "package", "sendung"]):
-                    result["paket_nr"] = str(value)
 
-                elif any(x in key_lower for x in ["kunde", "customer", "client", "name"]):
-                    result["kunden_name"] = str(value)
+# Gemeinsame Instanz für Decoder und Skripte
+default_parser = ShippingLabelParser()
 
-            return True
-        except json.JSONDecodeError:
-            return False
 
-    def _try_parse_url(self, content, result):
-        """Versucht, den Inhalt als URL zu parsen"""
-        if content.startswith(("http://", "https://")):
-            # URL-Parameter extrahieren
-            try:
-                from urllib.parse import urlparse, parse_qs
-                parsed_url = urlparse(content)
-                params = parse_qs(parsed_url.query)
-
-                # Nach bekannten Parametern suchen
-                param_mapping = {
-                    "auftrags_nr": ["order", "auftrag", "orderid", "auftragsid"],
-                    "paket_nr": ["package", "paket", "packageid", "paketid", "tracking"],
-                    "kunden_name": ["customer", "kunde", "name", "customername", "kundenname"]
-                }
-
-                for result_key, param_keys in param_mapping.items():
-                    for param_key in param_keys:
-                        if param_key in params:
-                            result[result_key] = params[param_key][0]
-
-                return True
-            except Exception:
-                return False
-
-        return False
-
-    def _try_parse_key_value(self, content, result):
-        """Versucht, den Inhalt als Schlüssel-Wert-Paare zu parsen"""
-        # Nach Mustern wie "Schlüssel: Wert" suchen
-        lines = content.split("\n")
-
-        key_mappings = {
-            "auftrags_nr": ["auftrag", "order", "bestellung", "auftrags-nr", "auftragsnr", "referenz"],
-            "paket_nr": ["paket", "package", "sendung", "paket-nr", "paketnr", "tracking"],
-            "kunden_name": ["kunde", "customer", "client", "name", "kundenname"]
-        }
+def parse_label(content):
+    """
+    Parst den Inhalt eines Etiketts mit dem gemeinsamen Parser
+
+    Args:
+        content: Der zu parsende Inhalt
+
+    Returns:
+        dict: Extrahierte Daten (auftrags_nr, paket_nr, kunden_name, raw_data)
+    """
+    return default_parser.parse_qr_content(content)
+
+
+# Parser der Worker-Prozesse von parse_many
+_process_parser = None
+
+
+def _init_parse_worker(synonyms):
+    """Erzeugt den Parser in einem Worker-Prozess"""
+    global _process_parser
+    _process_parser = ShippingLabelParser(synonyms)
+
+
+def _parse_chunk(payloads):
+    """Parst einen Block von Inhalten im Worker-Prozess"""
+    return [_process_parser.parse_qr_content(payload) for payload in payloads]
+
+
+def parse_many(payloads, workers=None, chunk_size=500, synonyms=None):
+    """
+    Parst viele Inhalte blockweise über einen Prozess-Pool
+
+    Die Ergebnisse werden in der Reihenfolge der Eingabe geliefert, sobald der
+    jeweilige Block fertig ist. Es werden höchstens zwei Blöcke pro Worker
+    gleichzeitig gelesen, die Eingabe darf daher beliebig groß sein.
+
+    Args:
+        payloads: Iterierbare Inhalte (z.B. Zeilen einer Datei)
+        workers: Anzahl der Worker-Prozesse (Standard: Anzahl der CPUs, 1 = ohne Pool)
+        chunk_size: Anzahl der Inhalte pro Block
+        synonyms: Zusätzliche Schlüsselwörter pro Feld (wie bei ShippingLabelParser)
+
+    Yields:
+        dict: Ergebnis von parse_qr_content pro Inhalt
+    """
+    workers = workers or os.cpu_count() or 1
+    payloads = iter(payloads)
+    chunks = iter(lambda: list(itertools.islice(payloads, chunk_size)), [])
+
+    if workers <= 1:
+        parser = ShippingLabelParser(synonyms) if synonyms else default_parser
+        for chunk in chunks:
+            for payload in chunk:
+                yield parser.parse_qr_content(payload)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_parse_worker,
+                             initargs=(synonyms,)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_parse_chunk, chunk))
+
+            # Nur so viele Blöcke vorauslesen, wie die Worker verarbeiten können
+            while len(pending) >= workers * 2:
+                yield from pending.popleft().result()
 
-        for line in lines:
-            if ":" in line:
-                key, value = line.split(":", 1)
-                key = key.strip().lower()
-                value = value.strip()
-
-                for result_key, possible_keys in key_mappings.items():
-                    if any(key.find(possible) >= 0 for possible in possible_keys):
-                        result[result_key] = value
-
-        # Prüfen, ob mindestens ein Feld gefunden wurde
-        return any(result[key] for key in ["auftrags_nr", "paket_nr", "kunden_name"])
-
-    def _try_parse_regex(self, content, result):
-        """Versucht, den Inhalt mit regulären Ausdrücken zu parsen"""
-        # Auftragsnummer: Typischerweise Format wie "NL-2581949"
-        auftrags_nr_match = re.search(r'[A-Z]{2}-\d+', content)
-        if auftrags_nr_match:
-            result["auftrags_nr"] = auftrags_nr_match.group(0)
-
-        # Paketnummer: Lange Zahlenfolge, typischerweise 10-18 Stellen
-        paket_nr_match = re.search(r'\d{10,18}', content)
-        if paket_nr_match:
-            result["paket_nr"] = paket_nr_match.group(0)
-
-        # Kundenname ist schwieriger zu extrahieren ohne Kontext
-        # Versuchen wir einige Heuristiken
-        if "KUNDENNAME:" in content:
-            parts = content.split("KUNDENNAME:")
-            if len(parts) > 1:
-                kunden_name = parts[1].strip()
-                # Bis zum nächsten Schlüsselwort oder Ende nehmen
-                end_markers = ["PAKET-NR", "AUFTRAG", "\n"]
-                for marker in end_markers:
-                    if marker in kunden_name:
-                        kunden_name = kunden_name.split(marker)[0].strip()
-                result["kunden_name"] = kunden_name
-
-        # Zusätzliche Suche für andere Formate
-        # Nach "Referenz: XXX" oder ähnlichen Patterns suchen
-        if not result["auftrags_nr"]:
-            referenz_match = re.search(r'Referenz:\s+([A-Z0-9-]+)', content)
-            if referenz_match:
-                result["auftrags_nr"] = referenz_match.group(1)
-
-        # Nach "Tracking: XXX" oder ähnlichen Patterns suchen
-        if not result["paket_nr"]:
-            tracking_match = re.search(r'Tracking:\s+(\d+)', content)
-            if tracking_match:
-                result["paket_nr"] = tracking_match.group(1)
\ No newline at end of file
+        while pending:
+            yield from pending.popleft().result()
@@ -7,20 +7,747 @@ Speicherung und Verwaltung der Scan-Ergebnisse
 
 import os
 import json
-import csv
+import queue
+import itertools
+import time
+import sqlite3
 import datetime
 import logging
+import threading
+
+from src.data.archive import ScanArchive
+from src.data.export import export_results
+
+# Felder mit eigener Spalte in der Datenbank
+STANDARD_KEYS = ["timestamp", "auftrags_nr", "paket_nr", "kunden_name", "raw_data"]
+
+# Name der Datenbankdatei im Speicherverzeichnis
+DATABASE_FILE = "scan_results.db"
+
+# Namen des Journals, seines Checkpoints und Snapshots im Speicherverzeichnis
+JOURNAL_FILE = "scan_journal.jsonl"
+CHECKPOINT_SUFFIX = ".checkpoint"
+SNAPSHOT_SUFFIX = ".snapshot"
+
+
+def _matches(result, paket_nr=None, auftrags_nr=None, since=None, until=None):
+    """Überprüft, ob ein Ergebnis zu den Suchkriterien passt"""
+    if paket_nr is not None and result.get("paket_nr") != paket_nr:
+        return False
+    if auftrags_nr is not None and result.get("auftrags_nr") != auftrags_nr:
+        return False
+    timestamp = result.get("timestamp", "")
+    if since is not None and timestamp < since:
+        return False
+    if until is not None and timestamp >= until:
+        return False
+    return True
+
+
+def _load_checkpoint(journal_path):
+    """
+    Liest den Checkpoint eines Journals
+
+    Returns:
+        dict: offset (Byte-Position, ab der das Journal gilt) und optional snapshot;
+              leer, falls kein gültiger Checkpoint existiert
+    """
+    try:
+        with open(journal_path + CHECKPOINT_SUFFIX, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        checkpoint["offset"] = int(checkpoint["offset"])
+        return checkpoint
+    except FileNotFoundError:
+        return {}
+    except (ValueError, KeyError, TypeError) as e:
+        logging.getLogger("ScanResultStorage").warning(
+            f"Ungültiger Checkpoint, das Journal wird vollständig gelesen: {e}")
+        return {}
+
+
+def read_checkpoint(journal_path):
+    """
+    Liest die Position des Checkpoints eines Journals
+
+    Returns:
+        int: Byte-Position, ab der das Journal gilt (0, falls kein Checkpoint existiert)
+    """
+    return _load_checkpoint(journal_path).get("offset", 0)
+
+
+class StorageBackend:
+    """Basisklasse für die Ablage der Scan-Ergebnisse"""
+
+    name = "base"
+
+    # Ergebnisse bleiben über das Programmende hinaus erhalten
+    persistent = False
+
+    def add(self, scan_result):
+        """Legt ein Ergebnis ab"""
+        raise NotImplementedError
+
+    def add_many(self, scan_results):
+        """Legt mehrere Ergebnisse ab"""
+        for scan_result in scan_results:
+            self.add(scan_result)
+
+    def import_results(self, scan_results, replace=False):
+        """
+        Übernimmt Ergebnisse, z.B. aus einem Archiv
+
+        Args:
+            scan_results: Iterierbare Ergebnisse
+            replace: Vorhandene Ergebnisse vorher löschen (sonst werden sie ergänzt)
+        """
+        if replace:
+            self.clear()
+        self.add_many(scan_results)
+        self.flush()
+
+    def query(self, paket_nr=None, auftrags_nr=None, since=None, until=None, limit=None, offset=0):
+        """
+        Sucht Ergebnisse (in Reihenfolge des Hinzufügens)
+
+        Args:
+            paket_nr: Nur Ergebnisse mit dieser Paketnummer
+            auftrags_nr: Nur Ergebnisse mit dieser Auftragsnummer
+            since: Nur Ergebnisse ab diesem Zeitstempel (ISO-Format, einschließlich)
+            until: Nur Ergebnisse vor diesem Zeitstempel (ISO-Format, ausschließlich)
+            limit: Höchstens so viele Ergebnisse (Standard: alle)
+            offset: So viele passende Ergebnisse überspringen
+
+        Returns:
+            list: Die passenden Ergebnisse
+        """
+        raise NotImplementedError
+
+    def iter_results(self, paket_nr=None, auftrags_nr=None, since=None, until=None, limit=None, offset=0,
+                     batch_size=1000):
+        """
+        Liefert die passenden Ergebnisse nacheinander (Argumente wie bei query)
+
+        Args:
+            batch_size: Anzahl der Ergebnisse, die auf einmal gelesen werden
+
+        Yields:
+            dict: Die Ergebnisse in Reihenfolge des Hinzufügens
+        """
+        yield from self.query(paket_nr, auftrags_nr, since, until, limit, offset)
+
+    def count(self, paket_nr=None, auftrags_nr=None, since=None, until=None):
+        """Zählt die passenden Ergebnisse"""
+        return len(self.query(paket_nr, auftrags_nr, since, until))
+
+    def clear(self):
+        """Löscht alle Ergebnisse"""
+        raise NotImplementedError
+
+    def flush(self):
+        """Schreibt zwischengespeicherte Ergebnisse"""
+
+    def close(self):
+        """Schreibt alle Ergebnisse und gibt die Ablage frei"""
+        self.flush()
+
+
+class MemoryBackend(StorageBackend):
+    """Ergebnisse in einer Liste im Speicher (bisheriges Verhalten)"""
+
+    name = "memory"
+
+    def __init__(self):
+        self.results = []
+
+    def add(self, scan_result):
+        self.results.append(scan_result)
+
+    def query(self, paket_nr=None, auftrags_nr=None, since=None, until=None, limit=None, offset=0):
+        matches = [result for result in self.results
+                   if _matches(result, paket_nr, auftrags_nr, since, until)]
+        end = None if limit is None else offset + limit
+        return matches[offset:end]
+
+    def iter_results(self, paket_nr=None, auftrags_nr=None, since=None, until=None, limit=None, offset=0,
+                     batch_size=1000):
+        matches = (result for result in self.results if _matches(result, paket_nr, auftrags_nr, since, until))
+        end = None if limit is None else offset + limit
+        return itertools.islice(matches, offset, end)
+
+    def clear(self):
+        self.results = []
+
+
+class ArchiveBackend(StorageBackend):
+    """
+    Ergebnisse aus einem Archiv (JSON oder JSONL), die erst beim Zugriff seitenweise gelesen werden
+
+    Neu hinzugefügte Ergebnisse werden nicht in das Archiv geschrieben, sondern
+    im Speicher hinter den Einträgen des Archivs geführt.
+    """
+
+    name = "archive"
+
+    def __init__(self, archive):
+        """
+        Args:
+            archive: Geöffnetes ScanArchive
+        """
+        self.archive = archive
+        self.added = []
+
+    def _archive_length(self):
+        return len(self.archive) if self.archive is not None else 0
+
+    def add(self, scan_result):
+        self.added.append(scan_result)
+
+    def query(self, paket_nr=None, auftrags_nr=None, since=None, until=None, limit=None, offset=0):
+        return list(self.iter_results(paket_nr, auftrags_nr, since, until, limit, offset))
+
+    def iter_results(self, paket_nr=None, auftrags_nr=None, since=None, until=None, limit=None, offset=0,
+                     batch_size=1000):
+        length = self._archive_length()
+        end = None if limit is None else offset + limit
+
+        if paket_nr is None and auftrags_nr is None and since is None and until is None:
+            # Ohne Filter direkt zur gesuchten Seite springen
+            archived = self.archive.iter_records(offset, limit, batch_size) if offset < length else ()
+            added_offset = max(0, offset - length)
+            added_end = None if end is None else max(0, end - length)
+            return itertools.chain(archived, itertools.islice(self.added, added_offset, added_end))
+
+        archived = self.archive.iter_records(page_size=batch_size) if length else ()
+        matches = (result for result in itertools.chain(archived, self.added)
+                   if _matches(result, paket_nr, auftrags_nr, since, until))
+        return itertools.islice(matches, offset, end)
+
+    def count(self, paket_nr=None, auftrags_nr=None, since=None, until=None):
+        if paket_nr is None and auftrags_nr is None and since is None and until is None:
+            return self._archive_length() + len(self.added)
+        return sum(1 for _ in self.iter_results(paket_nr, auftrags_nr, since, until))
+
+    def clear(self):
+        self.close()
+        self.added = []
+
+    def close(self):
+        if self.archive is not None:
+            self.archive.close()
+            self.archive = None
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    Ergebnisse in einer SQLite-Datenbank (WAL-Modus)
+
+    Neue Ergebnisse werden gesammelt und gemeinsam in einer Transaktion geschrieben,
+    sobald batch_size erreicht ist, spätestens aber nach max_delay Sekunden.
+    Abfragen schreiben vorher alle gesammelten Ergebnisse.
+    """
+
+    name = "sqlite"
+    persistent = True
+
+    def __init__(self, database_path, batch_size=100, max_delay=1.0):
+        """
+        Initialisiert die Datenbank
+
+        Args:
+            database_path: Pfad zur Datenbankdatei (wird angelegt)
+            batch_size: Anzahl der Ergebnisse pro Transaktion
+            max_delay: Maximale Zeit in Sekunden, die ein Ergebnis ungeschrieben bleibt
+        """
+        self.logger = logging.getLogger("ScanResultStorage")
+        self.database_path = database_path
+        self.batch_size = max(1, batch_size)
+        self.max_delay = max_delay
+
+        self._lock = threading.RLock()
+        self._pending = []
+        self._timer = None
+
+        # Die Verbindung wird auch vom Timer-Thread verwendet (durch _lock geschützt)
+        self._connection = sqlite3.connect(database_path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        """Legt Tabelle und Indizes an, falls sie nicht existieren"""
+        with self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS scan_results (
+                    id INTEGER PRIMARY KEY,
+                    timestamp TEXT NOT NULL,
+                    auftrags_nr TEXT NOT NULL DEFAULT '',
+                    paket_nr TEXT NOT NULL DEFAULT '',
+                    kunden_name TEXT NOT NULL DEFAULT '',
+                    raw_data TEXT NOT NULL DEFAULT '',
+                    extra TEXT
+                )
+            """)
+            for column in ("paket_nr", "auftrags_nr", "timestamp"):
+                self._connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_scan_results_{column} ON scan_results ({column})")
+
+    @staticmethod
+    def _to_row(scan_result):
+        """Wandelt ein Ergebnis in eine Tabellenzeile um (weitere Felder als JSON)"""
+        extra = {key: value for key, value in scan_result.items() if key not in STANDARD_KEYS}
+        return (
+            str(scan_result.get("timestamp", "")),
+            str(scan_result.get("auftrags_nr") or ""),
+            str(scan_result.get("paket_nr") or ""),
+            str(scan_result.get("kunden_name") or ""),
+            str(scan_result.get("raw_data") or ""),
+            json.dumps(extra, ensure_ascii=False, default=str) if extra else None
+        )
+
+    @staticmethod
+    def _from_row(row):
+        """Wandelt eine Tabellenzeile in ein Ergebnis um"""
+        result = {key: row[key] for key in STANDARD_KEYS}
+        if row["extra"]:
+            result.update(json.loads(row["extra"]))
+        return result
+
+    def add(self, scan_result):
+        self.add_many([scan_result])
+
+    def add_many(self, scan_results):
+        # In Blöcken von batch_size übernehmen, damit ein Iterator (z.B. über ein großes
+        # Archiv) nie vollständig im Speicher landet
+        scan_results = iter(scan_results)
+        while True:
+            rows = [self._to_row(scan_result) for scan_result in itertools.islice(scan_results, self.batch_size)]
+            if not rows:
+                return
+
+            with self._lock:
+                self._pending.extend(rows)
+
+                if len(self._pending) >= self.batch_size or self.max_delay <= 0:
+                    self._flush_locked()
+                elif self._timer is None:
+                    self._timer = threading.Timer(self.max_delay, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+
+    def import_results(self, scan_results, replace=False):
+        """
+        Übernimmt Ergebnisse in einer einzigen Transaktion: schlägt der Import fehl,
+        bleibt die Datenbank unverändert (auch beim Ersetzen)
+
+        Args:
+            scan_results: Iterierbare Ergebnisse (werden nacheinander gelesen, nicht gesammelt)
+            replace: Vorhandene Ergebnisse vorher löschen (sonst werden sie ergänzt)
+        """
+        with self._lock:
+            self._flush_locked()
+            with self._connection:
+                if replace:
+                    self._connection.execute("DELETE FROM scan_results")
+                self._connection.executemany(
+                    "INSERT INTO scan_results (timestamp, auftrags_nr, paket_nr, kunden_name, raw_data, extra) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", map(self._to_row, scan_results))
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        """Schreibt die gesammelten Ergebnisse in einer Transaktion (Lock muss gehalten werden)"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._pending or self._connection is None:
+            return
+
+        rows, self._pending = self._pending, []
+        try:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT INTO scan_results (timestamp, auftrags_nr, paket_nr, kunden_name, raw_data, extra) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            # Beim nächsten Schreiben erneut versuchen
+            self._pending = rows + self._pending
+            self.logger.error(f"Fehler beim Schreiben in die Datenbank: {e}")
+
+    @staticmethod
+    def _where(paket_nr, auftrags_nr, since, until):
+        """Erzeugt die WHERE-Klausel und ihre Parameter"""
+        conditions = []
+        params = []
+        for condition, value in (("paket_nr = ?", paket_nr), ("auftrags_nr = ?", auftrags_nr),
+                                 ("timestamp >= ?", since), ("timestamp < ?", until)):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return clause, params
+
+    def query(self, paket_nr=None, auftrags_nr=None, since=None, until=None, limit=None, offset=0):
+        clause, params = self._where(paket_nr, auftrags_nr, since, until)
+        sql = f"SELECT * FROM scan_results{clause} ORDER BY id LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else limit, offset]
+
+        with self._lock:
+            self._flush_locked()
+            rows = self._connection.execute(sql, params).fetchall()
+        return [self._from_row(row) for row in rows]
+
+    def iter_results(self, paket_nr=None, auftrags_nr=None, since=None, until=None, limit=None, offset=0,
+                     batch_size=1000):
+        clause, params = self._where(paket_nr, auftrags_nr, since, until)
+        clause = f"{clause} AND id > ?" if clause else " WHERE id > ?"
+        sql = f"SELECT * FROM scan_results{clause} ORDER BY id LIMIT ? OFFSET ?"
+
+        # Seitenweise über die ID lesen; der Lock wird zwischen den Seiten freigegeben,
+        # damit neue Ergebnisse auch während eines langen Exports geschrieben werden
+        last_id = 0
+        remaining = limit
+        while remaining is None or remaining > 0:
+            size = batch_size if remaining is None else min(batch_size, remaining)
+            with self._lock:
+                self._flush_locked()
+                rows = self._connection.execute(sql, params + [last_id, size, offset]).fetchall()
+            if not rows:
+                return
+
+            offset = 0
+            last_id = rows[-1]["id"]
+            if remaining is not None:
+                remaining -= len(rows)
+            for row in rows:
+                yield self._from_row(row)
+
+    def count(self, paket_nr=None, auftrags_nr=None, since=None, until=None):
+        clause, params = self._where(paket_nr, auftrags_nr, since, until)
+        with self._lock:
+            self._flush_locked()
+            return self._connection.execute(f"SELECT COUNT(*) FROM scan_results{clause}", params).fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self._pending = []
+            with self._connection:
+                self._connection.execute("DELETE FROM scan_results")
+
+    def close(self):
+        with self._lock:
+            if self._connection is None:
+                return
+            self._flush_locked()
+            self._connection.close()
+            self._connection = None
+
+
+class JournalBackend(MemoryBackend):
+    """
+    Ergebnisse im Speicher, zusätzlich als Journal (eine JSON-Zeile pro Scan) auf der Festplatte
+
+    Ein eigener Thread hängt die Zeilen an das Journal an. fsync erfolgt gesammelt,
+    sobald sync_count Zeilen ungesichert sind oder seit dem letzten fsync sync_interval
+    Sekunden vergangen sind. clear() setzt den Checkpoint an das Ende des Journals,
+    ältere Zeilen bleiben als Historie erhalten.
+
+    Nach einem fsync schreibt der Thread einen Snapshot der Ergebnisse (eine JSON-Liste,
+    die in einem Stück gelesen wird), sobald seit dem letzten Snapshot mindestens
+    snapshot_count und mindestens so viele Zeilen wie im Snapshot hinzugekommen sind,
+    außerdem beim Schließen. Der Checkpoint vermerkt, bis zu welcher Position des
+    Journals der Snapshot reicht; beim Start werden der Snapshot und danach nur die
+    Zeilen dahinter gelesen.
+    """
+
+    name = "journal"
+    persistent = True
+
+    def __init__(self, journal_path, sync_interval=1.0, sync_count=100, snapshot_count=10000):
+        """
+        Initialisiert das Journal und stellt die Ergebnisse ab dem Checkpoint wieder her
+
+        Args:
+            journal_path: Pfad zur Journaldatei (wird angelegt)
+            sync_interval: Maximale Zeit in Sekunden bis zum fsync einer Zeile
+            sync_count: Anzahl ungesicherter Zeilen, ab der sofort fsync erfolgt
+            snapshot_count: Mindestanzahl neuer Zeilen für einen Snapshot (0 = keine Snapshots)
+        """
+        super().__init__()
+        self.logger = logging.getLogger("ScanResultStorage")
+        self.journal_path = journal_path
+        self.checkpoint_path = journal_path + CHECKPOINT_SUFFIX
+        self.snapshot_path = journal_path + SNAPSHOT_SUFFIX
+        self.sync_interval = sync_interval
+        self.sync_count = max(1, sync_count)
+        self.snapshot_count = max(0, snapshot_count)
+
+        # Statistik
+        self.replayed = 0
+        self.replayed_lines = 0
+        self.syncs = 0
+        self.snapshots = 0
+
+        # Position des Checkpoints, Anzahl der Ergebnisse bis self._offset und im letzten Snapshot
+        self._checkpoint_offset = 0
+        self._count = 0
+        self._snapshot_count = 0
+
+        self._offset = self._replay()
+        self._file = open(journal_path, "ab")
+
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._write_loop, name="ScanJournal", daemon=True)
+        self._thread.start()
+
+    def _write_checkpoint(self, offset, snapshot=None):
+        """
+        Schreibt den Checkpoint atomar
+
+        Args:
+            offset: Byte-Position, ab der das Journal gilt
+            snapshot: Position und Anzahl der Ergebnisse des Snapshots ({"offset", "count"})
+        """
+        checkpoint = {"offset": offset, "created": datetime.datetime.now().isoformat()}
+        if snapshot is not None:
+            checkpoint["snapshot"] = snapshot
+
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _write_snapshot(self):
+        """Schreibt die Ergebnisse bis zum Ende des Journals als Snapshot (im Schreib-Thread)"""
+        count, offset = self._count, self._offset
+        tmp_path = self.snapshot_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(self.results[:count], ensure_ascii=False, default=str))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+            self._write_checkpoint(self._checkpoint_offset, {"offset": offset, "count": count})
+        except OSError as e:
+            self.logger.error(f"Fehler beim Schreiben des Snapshots: {e}")
+            return
+
+        self._snapshot_count = count
+        self.snapshots += 1
+
+    def _load_snapshot(self, checkpoint, size):
+        """
+        Lädt den Snapshot, auf den der Checkpoint verweist
+
+        Returns:
+            tuple: (Ergebnisse, Position im Journal, bis zu der sie reichen) oder None,
+                   wenn es keinen passenden Snapshot gibt
+        """
+        snapshot = checkpoint.get("snapshot")
+        if not snapshot:
+            return None
+
+        try:
+            offset, count = int(snapshot["offset"]), int(snapshot["count"])
+            if not checkpoint["offset"] <= offset <= size:
+                raise ValueError("Snapshot reicht über das Ende des Journals hinaus")
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                results = json.load(f)
+            if not isinstance(results, list) or len(results) != count:
+                raise ValueError("Snapshot passt nicht zum Checkpoint")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"Snapshot wird nicht verwendet, das Journal wird ab dem Checkpoint gelesen: {e}")
+            return None
+        return results, offset
+
+    def _replay(self):
+        """
+        Liest den Snapshot und die Ergebnisse dahinter bzw. ab dem Checkpoint ein
+
+        Eine unvollständige letzte Zeile (Absturz beim Schreiben) wird abgeschnitten.
+
+        Returns:
+            int: Länge des gültigen Journals in Bytes
+        """
+        if not os.path.exists(self.journal_path):
+            return 0
+
+        checkpoint = _load_checkpoint(self.journal_path)
+        offset = checkpoint.get("offset", 0)
+        with open(self.journal_path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if offset > size:
+                self.logger.warning("Checkpoint liegt hinter dem Ende des Journals, es wird vollständig gelesen")
+                checkpoint, offset = {}, 0
+            self._checkpoint_offset = offset
+
+            snapshot = self._load_snapshot(checkpoint, size)
+            if snapshot is not None:
+                self.results, offset = snapshot
+                self._snapshot_count = len(self.results)
+
+            f.seek(offset)
+            data = f.read()
+
+        valid = len(data) if data.endswith(b"\n") else data.rfind(b"\n") + 1
+        for line in data[:valid].splitlines():
+            if not line:
+                continue
+            self.replayed_lines += 1
+            try:
+                self.results.append(json.loads(line))
+            except ValueError as e:
+                self.logger.warning(f"Ungültige Zeile im Journal übersprungen: {e}")
+        self.replayed = self._count = len(self.results)
+
+        end = offset + valid
+        if end < size:
+            self.logger.warning(f"Unvollständige letzte Zeile im Journal entfernt ({size - end} Bytes)")
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(end)
+        return end
+
+    def add(self, scan_result):
+        if self._closed:
+            raise ValueError("Das Journal ist geschlossen")
+
+        # Zum Zeitpunkt des Hinzufügens serialisieren, spätere Änderungen am Dict zählen nicht
+        line = json.dumps(scan_result, ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+        self.results.append(scan_result)
+        self._queue.put(line)
+
+    def _write_loop(self):
+        """Hängt die Zeilen an das Journal an und sichert sie gesammelt (läuft im eigenen Thread)"""
+        unsynced = 0
+        last_sync = time.monotonic()
+
+        while True:
+            timeout = None
+            if unsynced:
+                timeout = max(0.0, self.sync_interval - (time.monotonic() - last_sync))
+
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = b""
+
+            if isinstance(item, bytes) and item:
+                try:
+                    self._file.write(item)
+                    self._offset += len(item)
+                    self._count += 1
+                    unsynced += 1
+                except OSError as e:
+                    self.logger.error(f"Fehler beim Schreiben in das Journal: {e}")
+
+            # Sichern, wenn genug Zeilen offen sind, die Zeit abgelaufen ist oder flush() wartet
+            waiting = item if isinstance(item, threading.Event) else None
+            due = unsynced and (unsynced >= self.sync_count or
+                                time.monotonic() - last_sync >= self.sync_interval)
+            if due or (waiting is not None and unsynced) or item is None:
+                self._sync()
+                unsynced = 0
+                last_sync = time.monotonic()
+
+                # Snapshot, wenn das Journal seit dem letzten um mindestens dessen Größe
+                # gewachsen ist (so bleibt der Aufwand pro Zeile konstant)
+                new = self._count - self._snapshot_count
+                if self.snapshot_count and new >= max(self.snapshot_count, self._snapshot_count):
+                    self._write_snapshot()
+
+            if waiting is not None:
+                waiting.set()
+            if item is None:
+                return
+
+    def _sync(self):
+        """Schreibt die Zeilen auf die Festplatte (fsync)"""
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.syncs += 1
+        except OSError as e:
+            self.logger.error(f"Fehler beim Sichern des Journals: {e}")
+
+    def flush(self):
+        """Wartet, bis alle Zeilen geschrieben und gesichert sind"""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def clear(self):
+        """Löscht alle Ergebnisse, indem der Checkpoint an das Ende des Journals gesetzt wird"""
+        self.flush()
+        self._checkpoint_offset = self._offset
+        self._write_checkpoint(self._offset)
+        self._count = self._snapshot_count = 0
+        if os.path.exists(self.snapshot_path):
+            os.remove(self.snapshot_path)
+        super().clear()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+
+        # Beim nächsten Start nur den Snapshot lesen
+        if self.snapshot_count and self._count > self._snapshot_count:
+            self._write_snapshot()
+
+
+def create_storage_backend(name, storage_dir, **options):
+    """
+    Erzeugt eine Ablage für Scan-Ergebnisse
+
+    Args:
+        name: "memory", "sqlite" oder "journal" (oder eine fertige StorageBackend-Instanz)
+        storage_dir: Speicherverzeichnis (für die Datenbankdatei)
+        options: Weitere Argumente für das Backend (z.B. batch_size)
+
+    Returns:
+        StorageBackend: Die erzeugte Ablage
+
+    Raises:
+        ValueError: Bei einem unbekannten Backend
+    """
+    if isinstance(name, StorageBackend):
+        return name
+    if name == "memory":
+        return MemoryBackend()
+    if name == "sqlite":
+        database_path = options.pop("database_path", None) or os.path.join(storage_dir, DATABASE_FILE)
+        return SQLiteBackend(database_path, **options)
+    if name == "journal":
+        journal_path = options.pop("journal_path", None) or os.path.join(storage_dir, JOURNAL_FILE)
+        return JournalBackend(journal_path, **options)
+
+    raise ValueError(f"Unbekanntes Speicher-Backend: {name}")
 
 
 class ScanResultStorage:
     """Klasse zur Speicherung und Verwaltung der Scan-Ergebnisse"""
 
-    def __init__(self, storage_dir=None):
+    def __init__(self, storage_dir=None, backend="memory", **backend_options):
         """
         Initialisiert den Speicher
 
         Args:
             storage_dir: Verzeichnis für die Speicherung (Standard: Benutzerverzeichnis)
+            backend: "memory" (Liste im Speicher), "sqlite" (Datenbank im Speicherverzeichnis)
+                     oder "journal" (Liste im Speicher mit Journal im Speicherverzeichnis)
+            backend_options: Weitere Argumente für das Backend (z.B. database_path, batch_size)
         """
         self.logger = logging.getLogger("ScanResultStorage")
 
@@ -34,7 +761,12 @@ class ScanResultStorage:
         if not os.path.exists(self.storage_dir):
             os.makedirs(self.storage_dir)
 
-        self.results = []
+        self.backend = create_storage_backend(backend, self.storage_dir, **backend_options)
+
+    @property
+    def results(self):
+        """Alle Scan-Ergebnisse als Liste"""
+        return self.get_results()
 
     def add_result(self, scan_result):
         """
@@ -47,102 +779,183 @@ class ScanResultStorage:
         if "timestamp" not in scan_result:
             scan_result["timestamp"] = datetime.datetime.now().isoformat()
 
-        self.results.append(scan_result)
+        self.backend.add(scan_result)
 
-    def get_results(self):
+    def get_results(self, limit=None, offset=0):
         """
-        Gibt alle Scan-Ergebnisse zurück
+        Gibt die Scan-Ergebnisse zurück
+
+        Args:
+            limit: Höchstens so viele Ergebnisse (Standard: alle)
+            offset: So viele Ergebnisse überspringen
 
         Returns:
             list: Liste der Scan-Ergebnisse
         """
-        return self.results
+        if isinstance(self.backend, MemoryBackend) and limit is None and offset == 0:
+            return self.backend.results
+        return self.backend.query(limit=limit, offset=offset)
+
+    def find_results(self, paket_nr=None, auftrags_nr=None, since=None, until=None, limit=100, offset=0):
+        """
+        Sucht Scan-Ergebnisse seitenweise
+
+        Args:
+            paket_nr: Nur Ergebnisse mit dieser Paketnummer
+            auftrags_nr: Nur Ergebnisse mit dieser Auftragsnummer
+            since: Nur Ergebnisse ab diesem Zeitstempel (ISO-Format, einschließlich)
+            until: Nur Ergebnisse vor diesem Zeitstempel (ISO-Format, ausschließlich)
+            limit: Größe der Seite (None = alle)
+            offset: Anzahl der übersprungenen Ergebnisse
+
+        Returns:
+            list: Die Ergebnisse der Seite
+        """
+        return self.backend.query(paket_nr, auftrags_nr, since, until, limit, offset)
+
+    def count_results(self, paket_nr=None, auftrags_nr=None, since=None, until=None):
+        """
+        Zählt die Scan-Ergebnisse
+
+        Returns:
+            int: Anzahl der passenden Ergebnisse
+        """
+        return self.backend.count(paket_nr, auftrags_nr, since, until)
 
     def clear_results(self):
         """Löscht alle Scan-Ergebnisse"""
-        self.results = []
+        self.backend.clear()
+
+    def flush(self):
+        """Schreibt zwischengespeicherte Ergebnisse sofort"""
+        self.backend.flush()
+
+    def close(self):
+        """Schreibt alle Ergebnisse und gibt das Backend frei"""
+        self.backend.close()
+
+    def iter_results(self, paket_nr=None, auftrags_nr=None, since=None, until=None, limit=None, offset=0):
+        """
+        Liefert die Scan-Ergebnisse nacheinander, ohne sie alle zu laden
 
-    def save_to_json(self, filename=None):
+        Args:
+            paket_nr: Nur Ergebnisse mit dieser Paketnummer
+            auftrags_nr: Nur Ergebnisse mit dieser Auftragsnummer
+            since: Nur Ergebnisse ab diesem Zeitstempel (ISO-Format, einschließlich)
+            until: Nur Ergebnisse vor diesem Zeitstempel (ISO-Format, ausschließlich)
+            limit: Höchstens so viele Ergebnisse (Standard: alle)
+            offset: Anzahl der übersprungenen Ergebnisse
+
+        Yields:
+            dict: Die Ergebnisse in Reihenfolge des Hinzufügens
+        """
+        return self.backend.iter_results(paket_nr, auftrags_nr, since, until, limit, offset)
+
+    def save_to_json(self, filename=None, **options):
         """
         Speichert die Scan-Ergebnisse als JSON
 
         Args:
             filename: Dateiname (Standard: scan_results_DATUM.json)
+            options: Wie bei export()
 
         Returns:
             bool: True bei Erfolg, False bei Fehler
         """
-        if filename is None:
-            date_str = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"scan_results_{date_str}.json"
-
-        file_path = os.path.join(self.storage_dir, filename)
-
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.results, f, indent=2, ensure_ascii=False)
-            return True
-        except Exception as e:
-            self.logger.error(f"Fehler beim Speichern der Ergebnisse als JSON: {e}")
-            return False
+        return self._save(filename, "json", **options)
 
-    def save_to_csv(self, filename=None):
+    def save_to_csv(self, filename=None, **options):
         """
         Speichert die Scan-Ergebnisse als CSV
 
         Args:
             filename: Dateiname (Standard: scan_results_DATUM.csv)
+            options: Wie bei export()
 
         Returns:
             bool: True bei Erfolg, False bei Fehler
         """
+        return self._save(filename, "csv", **options)
+
+    def _save(self, filename, format, compress=False, **options):
+        """Exportiert in eine Datei im Speicherverzeichnis und meldet Fehler über das Log"""
         if filename is None:
             date_str = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"scan_results_{date_str}.csv"
-
-        file_path = os.path.join(self.storage_dir, filename)
+            filename = f"scan_results_{date_str}.{format}"
+        if compress and not filename.lower().endswith(".gz"):
+            filename += ".gz"
 
         try:
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                # Alle Schlüssel aus allen Ergebnissen sammeln
-                keys = set()
-                for result in self.results:
-                    keys.update(result.keys())
-
-                # Standard-Spalten an den Anfang setzen
-                standard_keys = ["timestamp", "auftrags_nr", "paket_nr", "kunden_name", "raw_data"]
-                header = [key for key in standard_keys if key in keys]
-                header.extend([key for key in sorted(keys) if key not in standard_keys])
-
-                writer = csv.DictWriter(f, fieldnames=header)
-                writer.writeheader()
-                writer.writerows(self.results)
-
+            self.export(os.path.join(self.storage_dir, filename), format=format, **options)
             return True
         except Exception as e:
-            self.logger.error(f"Fehler beim Speichern der Ergebnisse als CSV: {e}")
+            self.logger.error(f"Fehler beim Speichern der Ergebnisse als {format.upper()}: {e}")
             return False
 
-    def load_from_json(self, file_path):
+    def export(self, file_path, format=None, since=None, until=None, offset=0, limit=None,
+               columns=None, progress=None):
+        """
+        Exportiert die Scan-Ergebnisse zeilenweise (konstanter Speicherbedarf)
+
+        Args:
+            file_path: Zieldatei; endet sie auf .gz, wird gzip-komprimiert
+            format: "csv", "json" oder "jsonl" (Standard: anhand des Dateinamens)
+            since: Nur Ergebnisse ab diesem Zeitstempel (ISO-Format, einschließlich)
+            until: Nur Ergebnisse vor diesem Zeitstempel (ISO-Format, ausschließlich)
+            offset: Anzahl der übersprungenen Ergebnisse
+            limit: Höchstens so viele Ergebnisse (Standard: alle)
+            columns: Spalten bei CSV (Standard: EXPORT_COLUMNS)
+            progress: Funktion progress(anzahl) für die Fortschrittsanzeige
+
+        Returns:
+            int: Anzahl der exportierten Ergebnisse
+
+        Raises:
+            ValueError: Bei einem unbekannten Format
+            OSError: Wenn die Datei nicht geschrieben werden kann
         """
-        Lädt Scan-Ergebnisse aus einer JSON-Datei
+        results = self.iter_results(since=since, until=until, limit=limit, offset=offset)
+        return export_results(results, file_path, format=format, columns=columns, progress=progress)
+
+    def load_from_json(self, file_path, lazy=None, replace=False):
+        """
+        Lädt Scan-Ergebnisse aus einer JSON-Liste oder einer JSONL-Datei
+
+        Die Datei wird nicht auf einmal eingelesen: Beim ersten Öffnen werden nur die
+        Positionen der Einträge indiziert (und in DATEI.idx für das nächste Öffnen
+        gespeichert), die Ergebnisse selbst werden seitenweise gelesen. In eine Datenbank
+        werden sie in einer Transaktion übernommen und ergänzen die vorhandenen
+        Ergebnisse; das Journal hält dagegen wie immer alle Ergebnisse im Speicher.
 
         Args:
-            file_path: Pfad zur JSON-Datei
+            file_path: Pfad zur JSON- oder JSONL-Datei
+            lazy: Das Archiv anstelle der bisherigen Ablage nur lesend verwenden, statt die
+                  Ergebnisse zu übernehmen (Standard: wenn das Backend nicht dauerhaft speichert)
+            replace: Beim Übernehmen die vorhandenen Ergebnisse ersetzen statt sie zu ergänzen
 
         Returns:
             bool: True bei Erfolg, False bei Fehler
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                loaded_results = json.load(f)
-
-            if isinstance(loaded_results, list):
-                self.results = loaded_results
-                return True
-            else:
-                self.logger.error("Die geladene Datei enthält keine gültige Liste von Scan-Ergebnissen")
-                return False
+            archive = ScanArchive(file_path)
+        except Exception as e:
+            self.logger.error(f"Fehler beim Laden der Ergebnisse aus JSON: {e}")
+            return False
+
+        if lazy is None:
+            lazy = not self.backend.persistent
+
+        if lazy:
+            previous, self.backend = self.backend, ArchiveBackend(archive)
+            previous.close()
+            return True
+
+        # In eine Datenbank oder ein Journal seitenweise übernehmen
+        try:
+            self.backend.import_results(archive.iter_records(), replace=replace)
+            return True
         except Exception as e:
             self.logger.error(f"Fehler beim Laden der Ergebnisse aus JSON: {e}")
-            return False
\ No newline at end of file
+            return False
+        finally:
+            archive.close()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Hintergrund-Schreiber für die Scan-Ergebnisse
+
+Alle Zugriffe auf die Festplatte (Speichern, Exportieren) laufen in einem eigenen
+Thread, damit langsame Laufwerke (Netzwerkfreigaben, USB) weder die GUI noch das
+Scannen blockieren.
+"""
+
+import time
+import queue
+import logging
+import datetime
+import threading
+
+logger = logging.getLogger('QRScanner')
+
+
+class StorageService:
+    """Reicht Scan-Ergebnisse und Aufträge über eine begrenzte Warteschlange an einen Schreib-Thread weiter"""
+
+    def __init__(self, storage, queue_size=1000, put_timeout=0.05):
+        """
+        Initialisiert den Dienst und startet den Schreib-Thread
+
+        Args:
+            storage: ScanResultStorage, in den geschrieben wird
+            queue_size: Maximale Anzahl wartender Einträge
+            put_timeout: So lange wartet add_result bei voller Warteschlange, bevor das
+                         Ergebnis verworfen wird (in Sekunden)
+        """
+        self.storage = storage
+        self.put_timeout = put_timeout
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._lock = threading.Lock()
+
+        # Statistik
+        self.queued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.write_time = 0.0
+
+        self._thread = threading.Thread(target=self._write_loop, name="StorageService", daemon=True)
+        self._thread.start()
+
+    def add_result(self, scan_result):
+        """
+        Übergibt ein Scan-Ergebnis zum Speichern (kehrt sofort zurück)
+
+        Args:
+            scan_result: Das Scan-Ergebnis; der Zeitstempel wird beim Übergeben gesetzt
+
+        Returns:
+            bool: False, wenn das Ergebnis verworfen wurde (Warteschlange voll oder geschlossen)
+        """
+        if "timestamp" not in scan_result:
+            scan_result["timestamp"] = datetime.datetime.now().isoformat()
+        if self._closed:
+            return False
+
+        if self._put(("result", scan_result, None), self.put_timeout):
+            return True
+
+        with self._lock:
+            self.dropped += 1
+        logger.warning("Speicher-Warteschlange voll, Scan-Ergebnis verworfen")
+        return False
+
+    def submit(self, task, callback=None, timeout=0.0):
+        """
+        Führt eine Aufgabe (z.B. einen Export) im Schreib-Thread aus
+
+        Bei voller Warteschlange wird die Aufgabe abgelehnt, damit der Aufrufer (z.B. der
+        GUI-Thread) nicht blockiert; er kann den Speicher als ausgelastet melden.
+
+        Args:
+            task: Funktion ohne Argumente
+            callback: Funktion callback(result, error), wird im Schreib-Thread aufgerufen
+            timeout: So lange auf einen freien Platz warten (in Sekunden, 0 = gar nicht)
+
+        Returns:
+            bool: False, wenn die Warteschlange voll oder der Dienst bereits geschlossen ist
+        """
+        if self._closed:
+            return False
+
+        if self._put(("task", task, callback), timeout):
+            return True
+
+        logger.warning("Speicher-Warteschlange voll, Aufgabe abgelehnt")
+        return False
+
+    def _put(self, item, timeout):
+        """
+        Stellt einen Eintrag in die Warteschlange und aktualisiert die Statistik
+
+        Returns:
+            bool: False, wenn innerhalb von timeout Sekunden kein Platz frei wurde
+        """
+        try:
+            self._queue.put(item, timeout=timeout)
+        except queue.Full:
+            return False
+
+        with self._lock:
+            self.queued += 1
+            self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    def _write_loop(self):
+        """Arbeitet die Warteschlange ab (läuft im eigenen Thread)"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            kind, payload, callback = item
+            start = time.perf_counter()
+
+            if kind == "flush":
+                self._run(self.storage.flush)
+                payload.set()
+                continue
+
+            if kind == "result":
+                success = self._run(self.storage.add_result, payload)
+                with self._lock:
+                    if success:
+                        self.written += 1
+                    self.write_time += time.perf_counter() - start
+                continue
+
+            try:
+                result = payload()
+                error = None
+            except Exception as e:
+                result, error = None, e
+                logger.error(f"Fehler in einer Speicher-Aufgabe: {e}")
+
+            if callback is not None:
+                try:
+                    callback(result, error)
+                except Exception as e:
+                    logger.error(f"Fehler im Callback einer Speicher-Aufgabe: {e}")
+
+    def _run(self, function, *args):
+        """Führt einen Speicherzugriff aus und zählt Fehler"""
+        try:
+            function(*args)
+            return True
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            logger.error(f"Fehler beim Speichern: {e}")
+            return False
+
+    def flush(self, timeout=None):
+        """
+        Wartet, bis alle bisher übergebenen Einträge geschrieben sind
+
+        Args:
+            timeout: Maximale Wartezeit in Sekunden (None = unbegrenzt)
+
+        Returns:
+            bool: True, wenn alles geschrieben wurde
+        """
+        if self._closed:
+            return not self._thread.is_alive()
+
+        done = threading.Event()
+        try:
+            self._queue.put(("flush", done, None), timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def get_stats(self):
+        """
+        Gibt die Statistik des Dienstes zurück
+
+        Returns:
+            dict: Zähler, aktuelle und maximale Länge der Warteschlange und mittlere Schreibzeit
+        """
+        with self._lock:
+            return {
+                "queued": self.queued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "failed": self.failed,
+                "depth": self._queue.qsize(),
+                "max_depth": self.max_depth,
+                "capacity": self._queue.maxsize,
+                "avg_write_ms": 1000.0 * self.write_time / self.written if self.written else 0.0
+            }
+
+    def close(self, timeout=5.0):
+        """
+        Schreibt alle wartenden Einträge, beendet den Thread und schließt den Speicher
+
+        Args:
+            timeout: Maximale Wartezeit in Sekunden
+
+        Returns:
+            bool: True, wenn alle Einträge geschrieben wurden
+        """
+        if self._closed:
+            return not self._thread.is_alive()
+        self._closed = True
+
+        deadline = time.monotonic() + timeout
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            logger.error("Speicher-Warteschlange konnte nicht geleert werden")
+            return False
+
+        self._thread.join(max(0.0, deadline - time.monotonic()))
+        if self._thread.is_alive():
+            logger.error("Speicher-Thread wurde nicht rechtzeitig beendet")
+            return False
+
+        self.storage.close()
+        return True
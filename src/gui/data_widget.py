@@ -5,7 +5,6 @@
 Widget zur Anzeige und Verwaltung der gescannten QR-Code-Daten
 """
 
-import csv
 import datetime
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QTableWidget, QTableWidgetItem, QHeaderView,
@@ -13,6 +12,8 @@ from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QIcon
 
+from src.data.export import export_results
+
 
 class DataWidget(QWidget):
     """Widget zur Anzeige und Verwaltung der gescannten QR-Code-Daten"""
@@ -150,29 +151,23 @@ class DataWidget(QWidget):
         self.kunden_name_field.clear()
         self.raw_data_field.clear()
 
-    def export_to_csv(self, file_path):
-        """Exportiert die Scan-Ergebnisse nach CSV"""
-        try:
-            with open(file_path, 'w', newline='', encoding='utf-8') as file:
-                writer = csv.writer(file)
-
-                # Header schreiben
-                writer.writerow([
-                    "Zeitstempel", "Auftrags-Nr.", "Paket-Nr.",
-                    "Kundenname", "Rohdaten"
-                ])
-
-                # Daten schreiben
-                for result in self.scan_results:
-                    writer.writerow([
-                        result.get("timestamp", ""),
-                        result.get("auftrags_nr", ""),
-                        result.get("paket_nr", ""),
-                        result.get("kunden_name", ""),
-                        result.get("raw_data", "")
-                    ])
+    def export_to_csv(self, file_path, results=None, progress=None):
+        """
+        Exportiert die Scan-Ergebnisse nach CSV (zeilenweise, mit .gz komprimiert; Spalten
+        wie beim Export aus der Ablage, siehe src.data.export.EXPORT_COLUMNS)
 
+        Args:
+            file_path: Zieldatei
+            results: Zu exportierende Ergebnisse (Standard: alle angezeigten); für den
+                     Export außerhalb des GUI-Threads eine Kopie übergeben
+            progress: Funktion progress(anzahl) für die Fortschrittsanzeige
+        """
+        if results is None:
+            results = self.scan_results
+
+        try:
+            export_results(results, file_path, format="csv", progress=progress)
             return True
         except Exception as e:
             print(f"Fehler beim Export: {e}")
-            return False
\ No newline at end of file
+            return False
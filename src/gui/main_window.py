@@ -9,16 +9,24 @@ import os
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                              QSplitter, QLabel, QPushButton, QTableWidget,
                              QTableWidgetItem, QMessageBox, QFileDialog)
-from PyQt6.QtCore import Qt, QSize, QSettings
+from PyQt6.QtCore import Qt, QSize, QSettings, pyqtSignal
 from PyQt6.QtGui import QIcon, QAction
 
 from src.gui.scanner_widget import ScannerWidget
 from src.gui.data_widget import DataWidget
+from src.data.storage import ScanResultStorage
+from src.data.storage_service import StorageService
 
 
 class MainWindow(QMainWindow):
     """Hauptfenster der Anwendung"""
 
+    # Signal für das Ende eines Exports (Dateipfad, Erfolg), aus dem Speicher-Thread
+    export_finished = pyqtSignal(str, bool)
+
+    # Signal für den Fortschritt eines Exports (exportierte Zeilen), aus dem Speicher-Thread
+    export_progress = pyqtSignal(int)
+
     def __init__(self):
         super().__init__()
 
@@ -30,6 +38,14 @@ class MainWindow(QMainWindow):
         self.settings = QSettings()
         self.loadSettings()
 
+        # Alle Festplattenzugriffe laufen im Speicher-Thread
+        self.storage_service = StorageService(
+            self.create_storage(),
+            queue_size=int(self.settings.value("storage/queue_size", 1000))
+        )
+        self.export_finished.connect(self.on_export_finished)
+        self.export_progress.connect(self.on_export_progress)
+
         # Hauptwidget und Layout
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -97,26 +113,64 @@ class MainWindow(QMainWindow):
         about_action.triggered.connect(self.show_about)
         help_menu.addAction(about_action)
 
+    def create_storage(self):
+        """Erzeugt den Speicher für die Scan-Historie (Backend aus den Einstellungen)"""
+        backend = str(self.settings.value("storage/backend", "sqlite"))
+        try:
+            return ScanResultStorage(backend=backend)
+        except Exception as e:
+            print(f"Speicher '{backend}' konnte nicht geöffnet werden, Ergebnisse werden nicht gesichert: {e}")
+            return ScanResultStorage(backend="memory")
+
     def on_qr_code_detected(self, qr_data):
         """Wird aufgerufen, wenn ein QR-Code erkannt wurde"""
+        # Kopie für den Speicher-Thread; die Anzeige ändert den Zeitstempel des Originals
+        stored = self.storage_service.add_result(dict(qr_data))
+
         self.data_widget.add_scan_result(qr_data)
-        self.statusBar().showMessage(f"QR-Code erkannt: {qr_data.get('raw_data', '')}", 3000)
+
+        if stored:
+            self.statusBar().showMessage(f"QR-Code erkannt: {qr_data.get('raw_data', '')}", 3000)
+        else:
+            stats = self.storage_service.get_stats()
+            self.statusBar().showMessage(
+                f"Speicher ausgelastet, Scan nicht gesichert ({stats['dropped']} verworfen)", 5000)
 
     def export_data(self):
         """Exportiert die Scan-Ergebnisse"""
         file_path, _ = QFileDialog.getSaveFileName(
             self, "Ergebnisse exportieren", "",
-            "CSV-Dateien (*.csv);;Alle Dateien (*)"
+            "CSV-Dateien (*.csv);;Komprimierte CSV-Dateien (*.csv.gz);;Alle Dateien (*)"
         )
 
         if file_path:
-            success = self.data_widget.export_to_csv(file_path)
-            if success:
-                QMessageBox.information(self, "Export erfolgreich",
-                                        f"Die Daten wurden erfolgreich nach {file_path} exportiert.")
+            # Im Speicher-Thread direkt aus der Ablage exportieren (zeilenweise, ohne Kopie
+            # der Ergebnisse); vorher eingereihte Ergebnisse sind dann bereits gespeichert
+            storage = self.storage_service.storage
+            submitted = self.storage_service.submit(
+                lambda: storage.export(file_path, format="csv", progress=self.export_progress.emit),
+                lambda count, error: self.export_finished.emit(file_path, error is None)
+            )
+
+            # Bei voller Warteschlange nicht warten, sondern den Benutzer informieren
+            if submitted:
+                self.statusBar().showMessage(f"Exportiere nach {file_path} ...")
             else:
-                QMessageBox.warning(self, "Export fehlgeschlagen",
-                                    "Die Daten konnten nicht exportiert werden.")
+                self.statusBar().showMessage("Speicher ausgelastet, bitte den Export später erneut starten", 5000)
+
+    def on_export_progress(self, count):
+        """Zeigt den Fortschritt eines Exports an (GUI-Thread)"""
+        self.statusBar().showMessage(f"Exportiere ... {count} Zeilen geschrieben")
+
+    def on_export_finished(self, file_path, success):
+        """Wird aufgerufen, wenn ein Export abgeschlossen ist (GUI-Thread)"""
+        self.statusBar().clearMessage()
+        if success:
+            QMessageBox.information(self, "Export erfolgreich",
+                                    f"Die Daten wurden erfolgreich nach {file_path} exportiert.")
+        else:
+            QMessageBox.warning(self, "Export fehlgeschlagen",
+                                "Die Daten konnten nicht exportiert werden.")
 
     def clear_data(self):
         """Löscht alle Scan-Ergebnisse"""
@@ -148,7 +202,11 @@ class MainWindow(QMainWindow):
         self.settings.setValue("geometry", self.saveGeometry())
         self.settings.setValue("windowState", self.saveState())
 
-        # Scanner stoppen
-        self.scanner_widget.stop_camera()
+        # Scanner stoppen und Decodier-Pool beenden
+        self.scanner_widget.shutdown()
+
+        # Wartende Scans und Exporte schreiben, danach den Speicher schließen
+        if not self.storage_service.close(timeout=float(self.settings.value("storage/close_timeout", 10.0))):
+            print("Nicht alle Scan-Ergebnisse konnten gespeichert werden")
 
         event.accept()
\ No newline at end of file
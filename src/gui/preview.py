@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Vorschau-Darstellung des Kamerabilds, unabhängig von der Decodierung
+"""
+
+import cv2
+import numpy as np
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtGui import QImage, QPixmap
+
+# Untergrenze der Vorschau-Bildrate (0 oder negative Einstellungen werden angehoben)
+MIN_FPS = 1
+
+
+class PreviewRenderer(QObject):
+    """Zeichnet das Kamerabild verkleinert und mit begrenzter Bildrate in ein QLabel"""
+
+    def __init__(self, label, max_fps=15, parent=None):
+        """
+        Initialisiert die Vorschau
+
+        Args:
+            label: QLabel, in dem die Vorschau angezeigt wird
+            max_fps: Maximale Bildrate der Vorschau (mindestens MIN_FPS)
+            parent: Übergeordnetes QObject
+        """
+        super().__init__(parent)
+
+        self.label = label
+        self.camera = None
+        self.positions = []
+        self.last_seq = 0
+
+        # Wiederverwendeter Puffer für das verkleinerte Bild
+        self._buffer = None
+
+        # Eigener Timer mit begrenzter Bildrate
+        self.max_fps = max(MIN_FPS, max_fps)
+        self.timer = QTimer(self)
+        self.timer.setInterval(max(1, int(1000 / self.max_fps)))
+        self.timer.timeout.connect(self.update_preview)
+
+    def start(self, camera):
+        """Startet die Vorschau für eine Kamera"""
+        self.camera = camera
+        self.last_seq = 0
+        self.positions = []
+        self.timer.start()
+
+    def stop(self):
+        """Stoppt die Vorschau"""
+        self.timer.stop()
+        self.camera = None
+        self.positions = []
+
+    def set_positions(self, positions):
+        """Setzt die Positionen der zuletzt erkannten Codes (in Originalkoordinaten)"""
+        self.positions = positions
+
+    def update_preview(self):
+        """Zeichnet den neuesten Frame der Kamera, falls ein neuer vorliegt"""
+        camera = self.camera
+        if camera is None:
+            return
+
+        latest = camera.latest_frame(newer_than=self.last_seq, retain=True)
+        if latest is None:
+            return
+
+        try:
+            self.last_seq = latest.seq
+            self.render(latest.image, self.positions)
+        finally:
+            camera.release_frame(latest)
+
+    def render(self, image, positions=()):
+        """
+        Verkleinert ein Bild auf die Größe des Labels und zeigt es mit markierten Codes an
+
+        Args:
+            image: BGR-Bild in voller Auflösung (wird nicht verändert)
+            positions: Polygone der erkannten Codes in Originalkoordinaten
+        """
+        height, width = image.shape[:2]
+        label_width = max(1, self.label.width())
+        label_height = max(1, self.label.height())
+
+        # Seitenverhältnis beibehalten, nie vergrößern
+        scale = min(label_width / float(width), label_height / float(height), 1.0)
+        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+
+        if self._buffer is None or self._buffer.shape[:2] != (size[1], size[0]):
+            self._buffer = np.empty((size[1], size[0], 3), dtype=np.uint8)
+
+        # In OpenCV verkleinern (INTER_AREA), das Original bleibt für den Decoder unverändert
+        preview = cv2.resize(image, size, dst=self._buffer, interpolation=cv2.INTER_AREA)
+
+        # QR-Code-Positionen markieren (auf die Vorschaugröße umgerechnet)
+        for position in positions:
+            cv2.polylines(preview, [(position * scale).astype(np.int32)], True, (0, 255, 0), 2)
+
+        # BGR direkt übernehmen, ohne Kanaltausch-Kopie; QPixmap kopiert die Daten
+        q_img = QImage(preview.data, size[0], size[1], preview.strides[0], QImage.Format.Format_BGR888)
+        self.label.setPixmap(QPixmap.fromImage(q_img))
@@ -7,14 +7,23 @@ Widget für den QR-Code Scanner
 
 import os
 import cv2
+import datetime
+import threading
 import traceback
+from functools import partial
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                              QLabel, QComboBox, QFileDialog)
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QSize
-from PyQt6.QtGui import QImage, QPixmap, QIcon
+from PyQt6.QtCore import Qt, pyqtSignal, QSize, QSettings
+from PyQt6.QtGui import QIcon
 
-from src.scanner.camera import Camera
 from src.scanner.decoder import QRDecoder
+from src.scanner.discovery import discover_cameras, CameraCache
+from src.scanner.frame_gate import FrameGate
+from src.scanner.multi_camera import MultiCameraScanner
+from src.scanner.recorder import SessionRecorder
+from src.scanner.profiles import (DEFAULT_PROFILE, ProfileCache, negotiate_profile,
+                                  profile_to_string, profile_from_string)
+from src.gui.preview import PreviewRenderer
 
 
 class ScannerWidget(QWidget):
@@ -23,6 +32,21 @@ class ScannerWidget(QWidget):
     # Signal, das emittiert wird, wenn ein QR-Code erkannt wurde
     qr_code_detected = pyqtSignal(dict)
 
+    # Signal aus dem Decodier-Pool: (Kamera-ID, neue Codes, Positionen)
+    decode_finished = pyqtSignal(object, list, list)
+
+    # Signal aus dem Lese-Thread einer Kamera, die keine Bilder mehr liefert: Kamera-ID
+    camera_lost = pyqtSignal(object)
+
+    # Signal aus der Kamerasuche im Hintergrund: Liste der gefundenen Kamera-IDs
+    cameras_discovered = pyqtSignal(list)
+
+    # Signal aus der Profilmessung im Hintergrund: (Kamera-ID, Messergebnisse)
+    profiles_measured = pyqtSignal(object, list)
+
+    # Signal aus dem Kamerastart im Hintergrund: (Kamera-ID, Fehlermeldung oder None)
+    camera_started = pyqtSignal(object, object)
+
     def __init__(self):
         super().__init__()
 
@@ -46,6 +70,16 @@ class ScannerWidget(QWidget):
         # Start/Stop-Taste
         self.camera_button = QPushButton("Kamera starten")
         self.camera_button.clicked.connect(self.toggle_camera)
+        self.camera_combo.currentIndexChanged.connect(self.update_controls)
+
+        # Aufnahmeprofil der ausgewählten Kamera (wirkt beim nächsten Start der Kamera)
+        self.profile_combo = QComboBox()
+        self.profile_combo.setMinimumWidth(200)
+        self.profile_combo.setToolTip("Aufnahmeformat der Kamera, wird beim nächsten Start übernommen")
+        self.profile_combo.currentIndexChanged.connect(self.on_profile_selected)
+
+        self.profile_button = QPushButton("Profile messen")
+        self.profile_button.clicked.connect(self.measure_profiles)
 
         # Datei-Taste
         self.file_button = QPushButton("Aus Datei scannen")
@@ -55,81 +89,113 @@ class ScannerWidget(QWidget):
         self.controls_layout.addWidget(QLabel("Kamera:"))
         self.controls_layout.addWidget(self.camera_combo)
         self.controls_layout.addWidget(self.camera_button)
+        self.controls_layout.addWidget(QLabel("Profil:"))
+        self.controls_layout.addWidget(self.profile_combo)
+        self.controls_layout.addWidget(self.profile_button)
         self.controls_layout.addWidget(self.file_button)
 
         # Layouts zusammenfügen
         self.layout.addWidget(self.camera_view)
         self.layout.addLayout(self.controls_layout)
 
-        # Kamera und Decoder initialisieren
-        self.camera = None
-        self.decoder = QRDecoder()
+        # Decoder-Einstellungen der Station (aktivierte Symbologien, Backend, Bildpyramide)
+        settings = QSettings()
+        symbologies = [name.strip().upper()
+                       for name in str(settings.value("scanner/symbologies", "QRCODE,CODE128")).split(",")
+                       if name.strip()]
+        decoder_options = {
+            "symbologies": symbologies,
+            "scales": [float(scale) for scale in str(settings.value("decoder/scales", "1.0")).split(",")],
+            "backend": str(settings.value("decoder/backend", "pyzbar"))
+        }
+
+        # Decoder für das Scannen aus Dateien
+        self.decoder = QRDecoder(**decoder_options)
+
+        # Mehrere Kameras gleichzeitig: jede Kamera übergibt ihre Frames in einem eigenen Thread
+        # an den gemeinsamen Decodier-Pool, die Ergebnisse kommen per Signal zurück
+        decoder_factory = partial(
+            QRDecoder,
+            tracking=str(settings.value("decoder/tracking", "true")).lower() == "true",
+            full_scan_interval=int(settings.value("decoder/full_scan_interval", 10)),
+            **decoder_options
+        )
+
+        # Vorfilter pro Kamera: unveränderte oder verwackelte Frames nicht decodieren
+        gate_factory = None
+        if str(settings.value("gate/enabled", "true")).lower() == "true":
+            gate_factory = partial(
+                FrameGate,
+                motion_threshold=float(settings.value("gate/motion_threshold", 2.0)),
+                sharpness_threshold=float(settings.value("gate/sharpness_threshold", 30.0))
+            )
+
+        # Zuletzt erkannte Codes werden kameraübergreifend pro Paketnummer bzw. Inhalt gemerkt
+        self.scanner = MultiCameraScanner(
+            callback=self.decode_finished.emit,
+            workers=int(settings.value("decoder/workers", 2)),
+            use_processes=str(settings.value("decoder/use_processes", "false")).lower() == "true",
+            decoder_factory=decoder_factory,
+            gate_factory=gate_factory,
+            dedup_ttl=float(settings.value("scanner/dedup_ttl", 10.0)),
+            on_camera_lost=self.camera_lost.emit
+        )
+        self.decode_finished.connect(self.on_decode_finished)
+        self.camera_lost.connect(self.on_camera_lost)
+        self.camera_started.connect(self.on_camera_started)
+
+        # Kameras, die gerade im Hintergrund geöffnet werden
+        self.starting_cameras = set()
 
-        # Timer für Kamera-Updates
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_frame)
+        # Vorschau mit eigener, begrenzter Bildrate (Decodierung läuft in voller Auflösung)
+        self.preview = PreviewRenderer(self.camera_view, max_fps=int(settings.value("preview/max_fps", 15)),
+                                       parent=self)
 
-        # Liste der zuletzt erkannten QR-Codes (um Duplikate zu vermeiden)
-        self.last_detected_codes = set()
+        # Kamera, deren Bild in der Vorschau angezeigt wird
+        self.preview_camera_id = None
 
-        # QR-Code wurde kürzlich erkannt (um flackern zu vermeiden)
-        self.recently_detected = False
-        self.detection_cooldown = QTimer()
-        self.detection_cooldown.timeout.connect(self.reset_detection_state)
-        self.detection_cooldown.setSingleShot(True)
+        # Gemessene und gewählte Aufnahmeprofile pro Kamera
+        self.profile_cache = ProfileCache()
+        self.profiles_measured.connect(self.on_profiles_measured)
 
         # WICHTIG: Kameras erst nach Initialisierung der UI-Elemente aktualisieren
+        self.camera_cache = CameraCache()
+        self.cameras_discovered.connect(self.on_cameras_discovered)
         self.refresh_cameras()
 
     def refresh_cameras(self):
-        """Aktualisiert die Liste der verfügbaren Kameras mit Timeout und Optimierungen"""
-        self.camera_combo.clear()
-        available_cameras = []
-
-        # Timeout-Definition für Kameraprüfung (in Sekunden)
-        timeout_seconds = 1.0
-
-        # Verfügbare Kameras suchen (maximal 5 Geräte prüfen)
-        for i in range(5):
-            try:
-                print(f"Prüfe Kamera {i}...")
+        """Füllt die Kameraliste aus dem Cache und startet die Kamerasuche im Hintergrund"""
+        # Zuletzt funktionierende Kameras sofort anzeigen
+        self.populate_cameras(self.camera_cache.load())
 
-                # Verwende QTimer für einen Timeout
-                timer = QTimer()
-                timer.setSingleShot(True)
-                timer.start(int(timeout_seconds * 1000))  # Millisekunden
+        # Kameras parallel im Hintergrund prüfen, das Ergebnis kommt per Signal zurück
+        thread = threading.Thread(target=self._discover_cameras, name="CameraDiscovery", daemon=True)
+        thread.start()
 
-                # Versuche, die Kamera zu öffnen
-                cam = cv2.VideoCapture(i)
+    def _discover_cameras(self):
+        """Sucht verfügbare Kameras (läuft im Hintergrund-Thread)"""
+        available_cameras, timed_out = discover_cameras(range(5), timeout=2.0, with_timeouts=True)
 
-                # Schnelle Überprüfung, ob die Kamera geöffnet werden kann
-                if not cam.isOpened():
-                    print(f"Kamera {i} kann nicht geöffnet werden")
-                    continue
+        # Langsame Kameras, die zuletzt funktioniert haben, nicht aus dem Cache entfernen
+        self.cameras_discovered.emit(self.camera_cache.merge(available_cameras, timed_out))
 
-                # Versuche, einen Frame zu lesen (mit Timeout)
-                ret, frame = None, None
+    def on_cameras_discovered(self, available_cameras):
+        """Übernimmt das Ergebnis der Kamerasuche in die Combobox und den Cache"""
+        # Laufende Kameras sind belegt und werden bei der Suche nicht gefunden
+        running = [camera_id for camera_id in self.scanner.camera_ids() if camera_id not in available_cameras]
+        if running:
+            available_cameras = sorted(available_cameras + running)
 
-                # Frame lesen, aber nur wenn der Timer noch läuft
-                if timer.isActive():
-                    ret, frame = cam.read()
-                else:
-                    print(f"Timeout beim Prüfen von Kamera {i}")
-                    cam.release()
-                    continue
+        print(f"Gefundene Kameras: {available_cameras}")
+        self.camera_cache.save(available_cameras)
+        self.populate_cameras(available_cameras)
 
-                # Überprüfe das Ergebnis
-                if ret and frame is not None and frame.size > 0:
-                    available_cameras.append(i)
-                    print(f"Kamera {i} erkannt und funktionsfähig")
-                else:
-                    print(f"Kamera {i} kann geöffnet werden, liefert aber keine Bilder")
+    def populate_cameras(self, available_cameras):
+        """Füllt die Combobox mit den angegebenen Kameras"""
+        current_text = self.camera_combo.currentText()
 
-                # Kamera freigeben
-                cam.release()
-
-            except Exception as e:
-                print(f"Fehler beim Prüfen von Kamera {i}: {e}")
+        self.camera_combo.blockSignals(True)
+        self.camera_combo.clear()
 
         # Gefundene Kameras zur Combobox hinzufügen
         for cam_idx in available_cameras:
@@ -138,139 +204,277 @@ class ScannerWidget(QWidget):
         # Wenn keine Kamera gefunden wurde
         if self.camera_combo.count() == 0:
             self.camera_combo.addItem("Keine Kamera gefunden")
-            self.camera_button.setEnabled(False)
+            self.camera_button.setEnabled(bool(self.scanner.camera_ids()))
         else:
             self.camera_button.setEnabled(True)
-            # Wähle die erste funktionierende Kamera aus (nicht Kamera 0, falls diese Probleme macht)
-            if available_cameras and available_cameras[0] != 0:
-                self.camera_combo.setCurrentIndex(0)
+            # Bisherige Auswahl beibehalten, sonst die erste funktionierende Kamera auswählen
+            index = self.camera_combo.findText(current_text)
+            self.camera_combo.setCurrentIndex(index if index >= 0 else 0)
+        self.camera_combo.blockSignals(False)
+
+        self.update_controls()
+
+    def selected_camera_id(self):
+        """Gibt die ID der in der Combobox ausgewählten Kamera zurück (oder None)"""
+        camera_text = self.camera_combo.currentText()
+        if not camera_text.startswith("Kamera "):
+            return None
+        try:
+            return int(camera_text.split(" ")[1])
+        except ValueError:
+            return None
+
+    def update_controls(self):
+        """Passt Button und Vorschau an die ausgewählte Kamera an"""
+        camera_id = self.selected_camera_id()
+        running = camera_id is not None and camera_id in self.scanner.camera_ids()
+
+        starting = camera_id in self.starting_cameras
+        self.camera_button.setText("Kamera wird gestartet..." if starting
+                                   else "Kamera stoppen" if running else "Kamera starten")
+        self.camera_button.setEnabled(not starting)
+        self.populate_profiles(camera_id)
+
+        # Laufende Kamera bei Auswahl in der Vorschau anzeigen
+        if running and camera_id != self.preview_camera_id:
+            self.show_preview(camera_id)
+
+    def populate_profiles(self, camera_id):
+        """Füllt die Profilauswahl mit den gemessenen Profilen einer Kamera"""
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+
+        # Eintragsdaten sind die Textform des Profils, "" steht für das beste gemessene Profil
+        self.profile_combo.addItem("Automatisch (bestes Profil)", "")
+        self.profile_combo.addItem(f"Standard ({profile_to_string(DEFAULT_PROFILE)})",
+                                   profile_to_string(DEFAULT_PROFILE))
+
+        if camera_id is not None:
+            for result in self.profile_cache.load(camera_id):
+                self.profile_combo.addItem(
+                    f"{profile_to_string(result['profile'])} "
+                    f"({result['fps']:.0f} FPS, {result['latency_ms']:.0f} ms)",
+                    profile_to_string(result["profile"])
+                )
+
+            selected = self.profile_cache.get_selected(camera_id, fallback_to_best=False)
+            index = self.profile_combo.findData(profile_to_string(selected)) if selected is not None else 0
+            self.profile_combo.setCurrentIndex(max(index, 0))
+
+        self.profile_combo.setEnabled(camera_id is not None)
+        self.profile_button.setEnabled(camera_id is not None)
+        self.profile_combo.blockSignals(False)
+
+    def on_profile_selected(self):
+        """Speichert das gewählte Profil der ausgewählten Kamera"""
+        camera_id = self.selected_camera_id()
+        if camera_id is None:
+            return
+
+        data = self.profile_combo.currentData()
+        self.profile_cache.set_selected(camera_id, profile_from_string(data) if data else None)
+
+    def measure_profiles(self):
+        """Misst die Aufnahmeprofile der ausgewählten Kamera im Hintergrund"""
+        camera_id = self.selected_camera_id()
+        if camera_id is None:
+            return
+
+        # Eine laufende Kamera ist belegt und kann nicht gemessen werden
+        if camera_id in self.scanner.camera_ids():
+            print(f"Kamera {camera_id} läuft, bitte zum Messen der Profile zuerst stoppen")
+            return
+
+        self.profile_button.setEnabled(False)
+        self.profile_button.setText("Messe...")
+
+        thread = threading.Thread(target=self._measure_profiles, args=(camera_id,),
+                                  name=f"ProfileNegotiation-{camera_id}", daemon=True)
+        thread.start()
+
+    def _measure_profiles(self, camera_id):
+        """Probiert die Aufnahmeprofile einer Kamera durch (läuft im Hintergrund-Thread)"""
+        results = negotiate_profile(camera_id)
+        self.profiles_measured.emit(camera_id, results)
+
+    def on_profiles_measured(self, camera_id, results):
+        """Übernimmt die gemessenen Profile in den Cache und die Auswahl"""
+        self.profile_button.setText("Profile messen")
+        self.profile_button.setEnabled(True)
+
+        if not results:
+            print(f"Kamera {camera_id}: kein Profil konnte gemessen werden")
+            return
+
+        best = results[0]
+        print(f"Kamera {camera_id}: bestes Profil {profile_to_string(best['profile'])} "
+              f"({best['fps']:.1f} FPS, {best['latency_ms']:.1f} ms)")
+
+        self.profile_cache.save(camera_id, results)
+        if camera_id == self.selected_camera_id():
+            self.populate_profiles(camera_id)
+
+    def show_preview(self, camera_id):
+        """Zeigt das Bild einer laufenden Kamera in der Vorschau an (None = keine Vorschau)"""
+        camera = self.scanner.get_camera(camera_id) if camera_id is not None else None
+
+        self.preview.stop()
+        self.preview_camera_id = camera_id if camera is not None else None
+
+        if camera is not None:
+            self.preview.start(camera)
+        else:
+            self.camera_view.setText("Kamera nicht aktiv")
 
     def toggle_camera(self):
-        """Startet oder stoppt die Kamera"""
-        if self.timer.isActive():
-            self.stop_camera()
+        """Startet oder stoppt die ausgewählte Kamera"""
+        camera_id = self.selected_camera_id()
+        if camera_id is not None and camera_id in self.scanner.camera_ids():
+            self.stop_camera(camera_id)
         else:
             self.start_camera()
 
     def start_camera(self):
-        """Startet die Kamera mit verbesserter Fehlerbehandlung"""
-        if self.camera_combo.count() == 0 or self.camera_combo.currentText() == "Keine Kamera gefunden":
+        """
+        Startet die ausgewählte Kamera zusätzlich zu den bereits laufenden
+
+        Das Öffnen der Kamera und das Warten auf das erste Bild dauern je nach Treiber
+        mehrere Sekunden und laufen deshalb im Hintergrund; das Ergebnis kommt per
+        Signal zurück (on_camera_started).
+        """
+        camera_index = self.selected_camera_id()
+        if camera_index is None or camera_index in self.starting_cameras:
             return
 
-        try:
-            # Kamera-Index aus Combobox abrufen
-            camera_text = self.camera_combo.currentText()
-            if not "Kamera " in camera_text:
-                return
+        print(f"Versuche Kamera {camera_index} zu starten...")
+        self.starting_cameras.add(camera_index)
+        self.camera_view.setText(f"Kamera {camera_index} wird gestartet...")
+        self.update_controls()
 
-            camera_index = int(camera_text.split(" ")[1])
-            print(f"Versuche Kamera {camera_index} zu starten...")
+        # Kamera mit dem gewählten bzw. besten gemessenen Profil initialisieren
+        profile = self.profile_cache.get_selected(camera_index)
+        thread = threading.Thread(target=self._start_camera, args=(camera_index, profile),
+                                  name=f"CameraStart-{camera_index}", daemon=True)
+        thread.start()
 
-            # Kamera initialisieren
-            self.camera = Camera(camera_index)
-            if not self.camera.is_opened():
-                self.camera_view.setText(f"Fehler: Kamera {camera_index} konnte nicht geöffnet werden")
-                print(f"Fehler: Kamera {camera_index} konnte nicht initialisiert werden")
-                self.camera = None
+    def _start_camera(self, camera_index, profile):
+        """Öffnet eine Kamera und wartet auf ihr erstes Bild (im Hintergrund-Thread)"""
+        try:
+            # Frames werden in einem eigenen Thread gelesen und decodiert
+            if not self.scanner.add_camera(camera_index, profile=profile):
+                self.camera_started.emit(camera_index, "konnte nicht geöffnet werden")
                 return
 
-            # Ein Testbild lesen um sicherzustellen, dass die Kamera funktioniert
-            success, test_frame = self.camera.read_frame()
-            if not success or test_frame is None:
-                self.camera_view.setText(f"Fehler: Kamera {camera_index} liefert keine Bilder")
-                print(f"Fehler: Kamera {camera_index} liefert keine Bilder")
-                self.camera.release()
-                self.camera = None
+            # Auf ein erstes Bild warten um sicherzustellen, dass die Kamera funktioniert
+            camera = self.scanner.get_camera(camera_index)
+            if camera is None or camera.latest_frame(timeout=2.0) is None:
+                self.scanner.remove_camera(camera_index)
+                self.camera_started.emit(camera_index, "liefert keine Bilder")
                 return
 
-            # Timer starten
-            self.timer.start(30)  # ~30 FPS
+            self.camera_started.emit(camera_index, None)
+        except Exception as e:
+            traceback.print_exc()
+            self.scanner.remove_camera(camera_index)
+            self.camera_started.emit(camera_index, f"konnte nicht gestartet werden: {str(e)}")
+
+    def on_camera_started(self, camera_index, error):
+        """Übernimmt eine im Hintergrund gestartete Kamera (im GUI-Thread)"""
+        self.starting_cameras.discard(camera_index)
+
+        if error is not None:
+            self.camera_view.setText(f"Fehler: Kamera {camera_index} {error}")
+            print(f"Fehler: Kamera {camera_index} {error}")
+            self.update_controls()
+            return
+
+        # Die Kamera kann inzwischen wieder gestoppt worden sein
+        camera = self.scanner.get_camera(camera_index)
+        if camera is None:
+            self.update_controls()
+            return
+
+        try:
+            # Optional alle Frames der Kamera für die spätere Wiedergabe aufzeichnen
+            self.start_recording(camera_index, camera)
 
-            # Button-Text ändern
-            self.camera_button.setText("Kamera stoppen")
+            self.show_preview(camera_index)
+            self.update_controls()
             print(f"Kamera {camera_index} erfolgreich gestartet")
         except Exception as e:
             self.camera_view.setText(f"Fehler beim Starten der Kamera: {str(e)}")
             print(f"Fehler beim Starten der Kamera: {str(e)}")
             traceback.print_exc()
-            if self.camera:
-                self.camera.release()
-                self.camera = None
+            self.scanner.remove_camera(camera_index)
+            self.update_controls()
 
-    def stop_camera(self):
-        """Stoppt die Kamera"""
-        self.timer.stop()
-
-        if self.camera:
-            self.camera.release()
-            self.camera = None
+    def start_recording(self, camera_id, camera):
+        """Startet die Aufzeichnung einer Kamera, falls sie in den Einstellungen aktiviert ist"""
+        settings = QSettings()
+        if str(settings.value("recorder/enabled", "false")).lower() != "true":
+            return
 
-        self.camera_view.setText("Kamera nicht aktiv")
-        self.camera_button.setText("Kamera starten")
+        directory = str(settings.value("recorder/directory",
+                                       os.path.join(os.path.expanduser("~"), "qr_scanner_data", "sessions")))
+        date_str = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
 
-    def update_frame(self):
-        """Aktualisiert das Kamerabild und scannt nach QR-Codes"""
-        if not self.camera or not self.camera.is_opened():
-            print("Kamera nicht mehr verfügbar, stoppe Kamera")
-            self.stop_camera()
+        try:
+            recorder = SessionRecorder(
+                os.path.join(directory, f"session_{date_str}_kamera{camera_id}"),
+                format=str(settings.value("recorder/format", "mjpeg")),
+                metadata={"camera_id": camera_id}
+            )
+        except Exception as e:
+            print(f"Fehler beim Starten der Aufzeichnung: {str(e)}")
             return
 
-        # Frame abrufen
-        try:
-            success, frame = self.camera.read_frame()
-            if not success or frame is None:
-                print("Fehler beim Lesen des Kamerabilds, stoppe Kamera")
-                self.stop_camera()
-                return
+        camera.set_recorder(recorder)
+        print(f"Aufzeichnung von Kamera {camera_id} nach {recorder.directory}")
 
-            # Nach QR-Codes suchen
-            if not self.recently_detected:
-                qr_codes = self.decoder.decode_image(frame)
-
-                for qr_code in qr_codes:
-                    # Prüfen, ob der QR-Code bereits erkannt wurde
-                    if qr_code["raw_data"] not in self.last_detected_codes:
-                        # QR-Code zur Liste der erkannten Codes hinzufügen
-                        self.last_detected_codes.add(qr_code["raw_data"])
-
-                        # Falls die Liste zu groß wird, älteste Einträge entfernen
-                        if len(self.last_detected_codes) > 10:
-                            self.last_detected_codes.pop()
-
-                        # Signal emittieren
-                        self.qr_code_detected.emit(qr_code)
-
-                        # Erkennungs-Cooldown setzen
-                        self.recently_detected = True
-                        self.detection_cooldown.start(2000)  # 2 Sekunden Cooldown
-
-            # QR-Code-Positionen markieren
-            for qr_code in self.decoder.get_last_positions():
-                # Rechteck um den QR-Code zeichnen
-                cv2.polylines(
-                    frame,
-                    [qr_code],
-                    True,
-                    (0, 255, 0),
-                    2
-                )
+    def stop_camera(self, camera_id=None):
+        """
+        Stoppt eine Kamera
 
-            # Bild in QImage konvertieren
-            height, width, channel = frame.shape
-            bytes_per_line = 3 * width
-            q_img = QImage(frame.data, width, height, bytes_per_line, QImage.Format.Format_RGB888).rgbSwapped()
+        Args:
+            camera_id: ID der Kamera (Standard: alle laufenden Kameras)
+        """
+        camera_ids = [camera_id] if camera_id is not None else self.scanner.camera_ids()
 
-            # Bild an die Größe des Labels anpassen
-            pixmap = QPixmap.fromImage(q_img)
-            self.camera_view.setPixmap(pixmap.scaled(
-                self.camera_view.width(),
-                self.camera_view.height(),
-                Qt.AspectRatioMode.KeepAspectRatio
-            ))
-        except Exception as e:
-            print(f"Fehler in update_frame: {str(e)}")
-            traceback.print_exc()
-            self.stop_camera()
+        for stop_id in camera_ids:
+            if stop_id == self.preview_camera_id:
+                self.show_preview(None)
+
+            stats = self.scanner.remove_camera(stop_id)
+            if stats is not None:
+                print(f"Statistik Kamera {stop_id}: {stats}")
+
+        # Vorschau auf eine weiterhin laufende Kamera umschalten
+        if self.preview_camera_id is None:
+            remaining = self.scanner.camera_ids()
+            if remaining:
+                self.show_preview(remaining[0])
+
+        self.update_controls()
+
+    def shutdown(self):
+        """Stoppt alle Kameras und fährt den Decodier-Pool herunter"""
+        self.stop_camera()
+        self.scanner.shutdown(wait=False)
+        self.decoder.close()
+
+    def on_camera_lost(self, camera_id):
+        """Stoppt eine Kamera, die keine Bilder mehr liefert (im GUI-Thread)"""
+        print(f"Kamera {camera_id} nicht mehr verfügbar, stoppe Kamera")
+        self.stop_camera(camera_id)
+
+    def on_decode_finished(self, camera_id, qr_codes, positions):
+        """Verarbeitet die Ergebnisse eines decodierten Frames im GUI-Thread"""
+        if camera_id == self.preview_camera_id:
+            self.preview.set_positions(positions)
+
+        # Alle neuen Etiketten des Frames melden (bereits verfolgt und kameraübergreifend gefiltert)
+        for qr_code in qr_codes:
+            self.qr_code_detected.emit(qr_code)
 
     def scan_from_file(self):
         """Scannt einen QR-Code aus einer Bilddatei"""
@@ -294,29 +498,8 @@ class ScannerWidget(QWidget):
             # Nach QR-Codes suchen
             qr_codes = self.decoder.decode_image(image)
 
-            # Bild mit markierten QR-Codes anzeigen
-            for qr_code in self.decoder.get_last_positions():
-                # Rechteck um den QR-Code zeichnen
-                cv2.polylines(
-                    image,
-                    [qr_code],
-                    True,
-                    (0, 255, 0),
-                    2
-                )
-
-            # Bild in QImage konvertieren
-            height, width, channel = image.shape
-            bytes_per_line = 3 * width
-            q_img = QImage(image.data, width, height, bytes_per_line, QImage.Format.Format_RGB888).rgbSwapped()
-
-            # Bild an die Größe des Labels anpassen
-            pixmap = QPixmap.fromImage(q_img)
-            self.camera_view.setPixmap(pixmap.scaled(
-                self.camera_view.width(),
-                self.camera_view.height(),
-                Qt.AspectRatioMode.KeepAspectRatio
-            ))
+            # Bild mit markierten QR-Codes in Label-Größe anzeigen
+            self.preview.render(image, self.decoder.get_last_positions())
 
             # Erkannte QR-Codes verarbeiten
             for qr_code in qr_codes:
@@ -331,10 +514,6 @@ class ScannerWidget(QWidget):
             print(f"Fehler beim Verarbeiten der Bilddatei: {str(e)}")
             traceback.print_exc()
 
-    def reset_detection_state(self):
-        """Setzt den Erkennungsstatus zurück"""
-        self.recently_detected = False
-
     def resizeEvent(self, event):
         """Wird aufgerufen, wenn die Größe des Widgets geändert wird"""
         super().resizeEvent(event)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Wiederverwendbare Bildpuffer für eine allokationsfreie Frame-Verarbeitung
+"""
+
+import threading
+
+import numpy as np
+
+
+class BufferPool:
+    """Verwaltet vorab angelegte Bildpuffer mit Referenzzählung"""
+
+    def __init__(self, shape, dtype=np.uint8, size=4):
+        """
+        Initialisiert den Puffer-Pool
+
+        Args:
+            shape: Form der Puffer, z.B. (480, 640, 3)
+            dtype: Datentyp der Puffer
+            size: Anzahl der vorab angelegten Puffer
+        """
+        self.shape = tuple(shape)
+        self.dtype = dtype
+
+        self._lock = threading.Lock()
+        self._free = [np.empty(self.shape, dtype=self.dtype) for _ in range(size)]
+        # id(Puffer) -> [Puffer, Referenzzähler]
+        self._in_use = {}
+
+        # Anzahl aller jemals angelegten Puffer (bleibt im Dauerbetrieb konstant)
+        self.allocations = size
+
+    def acquire(self):
+        """
+        Entnimmt einen freien Puffer (legt nur bei Bedarf einen neuen an)
+
+        Returns:
+            numpy.ndarray: Puffer mit Referenzzähler 1
+        """
+        with self._lock:
+            if self._free:
+                buffer = self._free.pop()
+            else:
+                buffer = np.empty(self.shape, dtype=self.dtype)
+                self.allocations += 1
+            self._in_use[id(buffer)] = [buffer, 1]
+            return buffer
+
+    def retain(self, buffer):
+        """Erhöht den Referenzzähler eines entnommenen Puffers"""
+        with self._lock:
+            entry = self._in_use.get(id(buffer))
+            if entry is not None:
+                entry[1] += 1
+
+    def release(self, buffer):
+        """
+        Gibt eine Referenz auf einen Puffer zurück
+
+        Der Puffer wird wiederverwendet, sobald keine Referenz mehr besteht.
+        Puffer, die nicht aus diesem Pool stammen, werden ignoriert.
+        """
+        with self._lock:
+            entry = self._in_use.get(id(buffer))
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] <= 0:
+                del self._in_use[id(buffer)]
+                self._free.append(buffer)
+
+    def owns(self, buffer):
+        """Überprüft, ob ein Puffer aktuell aus diesem Pool entnommen ist"""
+        with self._lock:
+            return id(buffer) in self._in_use
+
+    def get_stats(self):
+        """
+        Gibt die Statistik des Pools zurück
+
+        Returns:
+            dict: Anzahl angelegter, freier und belegter Puffer
+        """
+        with self._lock:
+            return {
+                "allocations": self.allocations,
+                "free": len(self._free),
+                "in_use": len(self._in_use)
+            }
@@ -8,26 +8,64 @@ Kamera-Handling für den QR-Code Scanner mit verbesserter Fehlerbehandlung
 import cv2
 import traceback
 import logging
+import threading
+import time
+from collections import deque, namedtuple
+
+from src.scanner.buffers import BufferPool
+from src.scanner.profiles import DEFAULT_PROFILE, apply_profile, profile_to_string
 
 # Logger konfigurieren
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('QRScanner')
 
+# Ein aufgenommener Frame mit fortlaufender Nummer und Aufnahmezeitpunkt (time.monotonic())
+Frame = namedtuple("Frame", ["seq", "timestamp", "image"])
+
 
 class Camera:
     """Klasse zur Verwaltung einer Kamera"""
 
-    def __init__(self, camera_id=0):
+    # Anzahl aufeinanderfolgender Lesefehler, nach der der Aufnahme-Thread aufgibt
+    MAX_READ_FAILURES = 30
+
+    def __init__(self, camera_id=0, threaded=False, buffer_size=2, reuse_buffers=False, profile=None):
         """
         Initialisiert die Kamera
 
         Args:
             camera_id: ID der zu verwendenden Kamera (Standard: 0)
+            threaded: Frames in einem eigenen Aufnahme-Thread lesen (Standard: False)
+            buffer_size: Größe des Ringpuffers im Thread-Modus, ältere Frames werden verworfen
+            reuse_buffers: Im Thread-Modus in wiederverwendete Puffer lesen statt pro Frame
+                           ein neues Array anzulegen (Frames mit retain_frame/release_frame halten)
+            profile: Aufnahmeformat (CameraProfile), Standard: 640x480 mit Treiber-Vorgaben
         """
         self.camera_id = camera_id
+        self.profile = profile if profile is not None else DEFAULT_PROFILE
+        self.active_profile = None
         self.cap = None
-        self.open()
+        self.threaded = threaded
+        self.reuse_buffers = reuse_buffers
+        self.buffer_pool = None
+        self.frame_shape = None
+
+        # Ringpuffer für den Thread-Modus (deque verwirft automatisch den ältesten Frame)
+        self._frames = deque(maxlen=max(1, buffer_size))
+        self._frame_condition = threading.Condition()
+        self._capture_thread = None
+        self._running = False
+        self._capture_failed = False
+        self._seq = 0
+        self._last_read_seq = 0
+        self.dropped_frames = 0
+
+        # Optionale Aufzeichnung aller gelesenen Frames (SessionRecorder)
+        self.recorder = None
+
+        if self.open() and self.threaded:
+            self.start_capture()
 
     def open(self):
         """Öffnet die Kamera mit Fehlerbehandlung"""
@@ -39,9 +77,10 @@ class Camera:
                 logger.error(f"Kamera {self.camera_id} konnte nicht geöffnet werden")
                 return False
 
-            # Auflösung auf 640x480 setzen (falls unterstützt)
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+            # Format, Auflösung und Bildrate des Profils einstellen (falls unterstützt)
+            self.active_profile = apply_profile(self.cap, self.profile)
+            logger.info(f"Kamera {self.camera_id}: Profil {profile_to_string(self.profile)}, "
+                        f"aktiv {profile_to_string(self.active_profile)}")
 
             # Prüfen, ob die Kamera tatsächlich funktioniert
             ret, test_frame = self.cap.read()
@@ -51,6 +90,8 @@ class Camera:
                 self.cap = None
                 return False
 
+            self.frame_shape = test_frame.shape
+
             logger.info(f"Kamera {self.camera_id} erfolgreich geöffnet")
             return True
 
@@ -67,26 +108,204 @@ class Camera:
 
     def is_opened(self):
         """Überprüft, ob die Kamera geöffnet ist"""
+        if self._capture_failed:
+            return False
         return self.cap is not None and self.cap.isOpened()
 
+    def start_capture(self):
+        """
+        Startet den Aufnahme-Thread, der fortlaufend Frames in den Ringpuffer schreibt
+
+        Returns:
+            bool: True, wenn der Thread läuft
+        """
+        if self._capture_thread is not None and self._capture_thread.is_alive():
+            return True
+        if self.cap is None or not self.cap.isOpened():
+            return False
+
+        self.threaded = True
+        self._running = True
+        self._capture_failed = False
+
+        # Puffer für Ringpuffer, laufende Aufnahme und Verbraucher (GUI, Decoder) vorab anlegen
+        if self.reuse_buffers and self.buffer_pool is None and self.frame_shape is not None:
+            self.buffer_pool = BufferPool(self.frame_shape, size=self._frames.maxlen + 4)
+
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop,
+            name=f"CameraCapture-{self.camera_id}",
+            daemon=True
+        )
+        self._capture_thread.start()
+        logger.info(f"Aufnahme-Thread für Kamera {self.camera_id} gestartet")
+        return True
+
+    def stop_capture(self, timeout=2.0):
+        """Beendet den Aufnahme-Thread und wartet auf dessen Ende"""
+        self._running = False
+        with self._frame_condition:
+            self._frame_condition.notify_all()
+
+        if self._capture_thread is not None:
+            self._capture_thread.join(timeout)
+            if self._capture_thread.is_alive():
+                logger.warning(f"Aufnahme-Thread für Kamera {self.camera_id} reagiert nicht")
+            self._capture_thread = None
+
+    def _capture_loop(self):
+        """Liest im Hintergrund Frames und legt sie im Ringpuffer ab"""
+        failures = 0
+
+        while self._running:
+            buffer = self.buffer_pool.acquire() if self.buffer_pool is not None else None
+            try:
+                if buffer is not None:
+                    ret, image = self.cap.read(image=buffer)
+                else:
+                    ret, image = self.cap.read()
+            except Exception as e:
+                logger.error(f"Fehler beim Lesen eines Frames: {str(e)}")
+                ret, image = False, None
+
+            timestamp = time.monotonic()
+
+            # Liefert die Kamera ein anderes Format, legt OpenCV ein neues Array an; bei einem
+            # Lesefehler wird der Puffer nicht veröffentlicht. In beiden Fällen zurück in den Pool
+            if buffer is not None and (image is not buffer or not ret):
+                self.buffer_pool.release(buffer)
+
+            if not ret or image is None:
+                failures += 1
+                if failures >= self.MAX_READ_FAILURES:
+                    logger.error(f"Kamera {self.camera_id} liefert keine Frames mehr, beende Aufnahme-Thread")
+                    self._capture_failed = True
+                    break
+                time.sleep(0.01)
+                continue
+
+            failures = 0
+
+            # Die Aufzeichnung kopiert das Bild, der Puffer bleibt im Pool
+            recorder = self.recorder
+            if recorder is not None:
+                recorder.write(timestamp, image)
+
+            evicted = None
+            with self._frame_condition:
+                self._seq += 1
+                if len(self._frames) == self._frames.maxlen:
+                    self.dropped_frames += 1
+                    evicted = self._frames[0]
+                self._frames.append(Frame(self._seq, timestamp, image))
+                self._frame_condition.notify_all()
+
+            # Verdrängter Frame: Referenz des Ringpuffers zurückgeben
+            if evicted is not None:
+                self.release_frame(evicted)
+
+        self._running = False
+        with self._frame_condition:
+            self._frame_condition.notify_all()
+
+    def latest_frame(self, newer_than=None, timeout=None, retain=False):
+        """
+        Gibt den neuesten Frame aus dem Ringpuffer zurück
+
+        Args:
+            newer_than: Nur einen Frame mit höherer Sequenznummer zurückgeben
+            timeout: Maximale Wartezeit in Sekunden auf einen passenden Frame (None = nicht warten)
+            retain: Frame für den Aufrufer reservieren, bis dieser release_frame() aufruft;
+                    nötig bei reuse_buffers, damit der Puffer nicht überschrieben wird
+
+        Returns:
+            Frame: (seq, timestamp, image) oder None, falls kein passender Frame vorliegt
+        """
+        min_seq = newer_than if newer_than is not None else 0
+
+        with self._frame_condition:
+            if timeout:
+                deadline = time.monotonic() + timeout
+                while self._running and (not self._frames or self._frames[-1].seq <= min_seq):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._frame_condition.wait(remaining)
+
+            if not self._frames or self._frames[-1].seq <= min_seq:
+                return None
+
+            frame = self._frames[-1]
+            if retain:
+                self.retain_frame(frame)
+            return frame
+
+    def retain_frame(self, frame):
+        """Reserviert den Puffer eines Frames (nur bei reuse_buffers wirksam)"""
+        if self.buffer_pool is not None:
+            self.buffer_pool.retain(frame.image)
+
+    def release_frame(self, frame):
+        """Gibt einen mit retain_frame reservierten Frame wieder frei"""
+        if self.buffer_pool is not None:
+            self.buffer_pool.release(frame.image)
+
     def read_frame(self):
         """
         Liest einen Frame von der Kamera
 
+        Im Thread-Modus wird der neueste, noch nicht gelesene Frame aus dem Ringpuffer geliefert.
+
         Returns:
             tuple: (success, frame)
         """
         if not self.is_opened():
             return False, None
 
+        if self.threaded and self._capture_thread is not None:
+            frame = self.latest_frame(newer_than=self._last_read_seq, timeout=1.0, retain=True)
+            if frame is None:
+                return False, None
+            self._last_read_seq = frame.seq
+
+            if self.buffer_pool is None:
+                return True, frame.image
+
+            # Wiederverwendete Puffer verlassen den Pool nicht, der Aufrufer erhält eine Kopie
+            image = frame.image.copy()
+            self.release_frame(frame)
+            return True, image
+
         try:
-            return self.cap.read()
+            ret, frame = self.cap.read()
         except Exception as e:
             logger.error(f"Fehler beim Lesen eines Frames: {str(e)}")
             return False, None
 
+        recorder = self.recorder
+        if recorder is not None and ret and frame is not None:
+            recorder.write(time.monotonic(), frame)
+        return ret, frame
+
+    def set_recorder(self, recorder):
+        """
+        Zeichnet ab sofort alle gelesenen Frames auf (None beendet die Aufzeichnung)
+
+        Im Thread-Modus wird jeder aufgenommene Frame aufgezeichnet, auch wenn er
+        nie gelesen wird. Die Kamera schließt den Recorder bei release().
+
+        Args:
+            recorder: SessionRecorder oder None
+        """
+        previous = self.recorder
+        self.recorder = recorder
+        if previous is not None and previous is not recorder:
+            previous.close()
+
     def release(self):
         """Gibt die Kamera frei"""
+        self.stop_capture()
+
         if self.cap is not None:
             try:
                 self.cap.release()
@@ -94,4 +313,13 @@ class Camera:
             except Exception as e:
                 logger.error(f"Fehler bei der Kamera-Freigabe: {str(e)}")
             finally:
-                self.cap = None
\ No newline at end of file
+                self.cap = None
+
+        with self._frame_condition:
+            frames = list(self._frames)
+            self._frames.clear()
+
+        for frame in frames:
+            self.release_frame(frame)
+
+        self.set_recorder(None)
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Asynchrone QR-Code-Decodierung in einem Thread- oder Prozess-Pool
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from src.scanner.decoder import QRDecoder
+
+logger = logging.getLogger('QRScanner')
+
+# Decoder-Instanzen eines Worker-Prozesses pro Quelle (Factory wird im Initializer gesetzt)
+_process_decoder_factory = None
+_process_decoders = {}
+
+
+def init_process_worker(decoder_factory):
+    """Initialisiert den Decoder in einem Worker-Prozess"""
+    global _process_decoder_factory
+    _process_decoder_factory = decoder_factory
+    _process_decoders.clear()
+
+
+def decode_in_process(image, source=None):
+    """Decodiert ein Bild im Worker-Prozess und liefert Ergebnisse und Positionen"""
+    decoder = _process_decoders.get(source)
+    if decoder is None:
+        decoder = _process_decoder_factory()
+        _process_decoders[source] = decoder
+
+    codes = decoder.decode_image(image)
+    return codes, decoder.get_last_positions()
+
+
+class DecodeWorkers:
+    """Thread- oder Prozess-Pool, in dem jeder Worker pro Bildquelle einen eigenen Decoder hält"""
+
+    def __init__(self, workers=2, use_processes=False, decoder_factory=QRDecoder, thread_name_prefix="QRDecode"):
+        """
+        Startet den Pool
+
+        Args:
+            workers: Anzahl der Worker-Threads bzw. -Prozesse
+            use_processes: Prozess-Pool statt Thread-Pool verwenden
+            decoder_factory: Erzeugt die Decoder der Worker
+            thread_name_prefix: Namenspräfix der Worker-Threads
+        """
+        self.use_processes = use_processes
+        self.decoder_factory = decoder_factory
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        # Alle Decoder der Worker-Threads (werden beim Herunterfahren geschlossen)
+        self._decoders = []
+
+        if use_processes:
+            self._executor = ProcessPoolExecutor(
+                max_workers=max(1, workers),
+                initializer=init_process_worker,
+                initargs=(decoder_factory,)
+            )
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max(1, workers),
+                thread_name_prefix=thread_name_prefix
+            )
+
+    def submit(self, image, source=None):
+        """
+        Übergibt ein Bild zur Decodierung
+
+        Args:
+            image: Das zu decodierende Bild
+            source: Kennung der Bildquelle (getrenntes Tracking pro Quelle)
+
+        Returns:
+            Future: Liefert (codes, positions)
+
+        Raises:
+            RuntimeError: Wenn der Pool bereits heruntergefahren ist
+        """
+        if self.use_processes:
+            return self._executor.submit(decode_in_process, image, source)
+        return self._executor.submit(self.decode, image, source)
+
+    def decode(self, image, source=None):
+        """Decodiert ein Bild mit dem Decoder des aktuellen Threads für die Quelle"""
+        decoders = getattr(self._local, "decoders", None)
+        if decoders is None:
+            decoders = {}
+            self._local.decoders = decoders
+
+        decoder = decoders.get(source)
+        if decoder is None:
+            decoder = self.decoder_factory()
+            decoders[source] = decoder
+            with self._lock:
+                self._decoders.append(decoder)
+
+        codes = decoder.decode_image(image)
+        return codes, decoder.get_last_positions()
+
+    def shutdown(self, wait=True):
+        """Fährt den Pool herunter, verwirft wartende Bilder und schließt die Decoder"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+        with self._lock:
+            decoders, self._decoders = self._decoders, []
+        for decoder in decoders:
+            decoder.close()
+
+
+class DecodePool:
+    """Verteilt Frames auf einen Worker-Pool und verwirft Frames, wenn alle Worker belegt sind"""
+
+    def __init__(self, callback, workers=2, use_processes=False, max_pending=None,
+                 decoder_factory=QRDecoder):
+        """
+        Initialisiert den Decodier-Pool
+
+        Args:
+            callback: Funktion callback(frame_id, codes, positions), wird im Worker-Kontext aufgerufen
+            workers: Anzahl der Worker-Threads bzw. -Prozesse
+            use_processes: Prozess-Pool statt Thread-Pool verwenden
+            max_pending: Maximale Anzahl gleichzeitig offener Frames (Standard: workers)
+            decoder_factory: Erzeugt pro Worker eine eigene Decoder-Instanz
+        """
+        self.callback = callback
+        self.workers = max(1, workers)
+        self.use_processes = use_processes
+        self.max_pending = max_pending if max_pending is not None else self.workers
+        self.decoder_factory = decoder_factory
+
+        self._lock = threading.Lock()
+        self._pending = 0
+
+        # Statistik
+        self.submitted = 0
+        self.skipped = 0
+        self.completed = 0
+        self.failed = 0
+
+        self._executor = DecodeWorkers(self.workers, use_processes, decoder_factory)
+
+    def submit(self, frame_id, image, on_release=None, source=None):
+        """
+        Übergibt einen Frame zur Decodierung
+
+        Args:
+            frame_id: Kennung des Frames (z.B. Sequenznummer der Kamera)
+            image: Das zu decodierende Bild (darf bis zum Callback nicht verändert werden)
+            on_release: Wird aufgerufen, sobald der Pool das Bild nicht mehr benötigt
+                        (nur bei angenommenen Frames, z.B. um einen Puffer freizugeben)
+            source: Kennung der Bildquelle (z.B. Kamera-ID); jeder Worker hält pro Quelle
+                    einen eigenen Decoder, damit sich das Tracking mehrerer Kameras nicht mischt
+
+        Returns:
+            bool: True, wenn der Frame angenommen wurde, False wenn er verworfen wurde
+        """
+        with self._lock:
+            executor = self._executor
+            if executor is None or self._pending >= self.max_pending:
+                self.skipped += 1
+                return False
+            self._pending += 1
+            self.submitted += 1
+
+        try:
+            future = executor.submit(image, source)
+        except RuntimeError as e:
+            # Pool wurde bereits heruntergefahren
+            logger.debug(f"Frame {frame_id} konnte nicht übergeben werden: {e}")
+            with self._lock:
+                self._pending -= 1
+                self.submitted -= 1
+                self.skipped += 1
+            return False
+
+        future.add_done_callback(lambda f: self._on_done(frame_id, f, on_release))
+        return True
+
+    def _on_done(self, frame_id, future, on_release=None):
+        """Verarbeitet ein fertiges Decodier-Ergebnis"""
+        with self._lock:
+            self._pending -= 1
+
+        if on_release is not None:
+            try:
+                on_release()
+            except Exception as e:
+                logger.error(f"Fehler beim Freigeben von Frame {frame_id}: {e}")
+
+        if future.cancelled():
+            return
+
+        try:
+            codes, positions = future.result()
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+            logger.error(f"Fehler bei der Decodierung von Frame {frame_id}: {e}")
+            return
+
+        with self._lock:
+            self.completed += 1
+
+        try:
+            self.callback(frame_id, codes, positions)
+        except Exception as e:
+            logger.error(f"Fehler im Decodier-Callback für Frame {frame_id}: {e}")
+
+    def is_busy(self):
+        """Überprüft, ob alle Worker belegt sind"""
+        with self._lock:
+            return self._pending >= self.max_pending
+
+    def get_stats(self):
+        """
+        Gibt die Statistik des Pools zurück
+
+        Returns:
+            dict: Anzahl angenommener, verworfener, fertiger und fehlgeschlagener Frames
+        """
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "skipped": self.skipped,
+                "completed": self.completed,
+                "failed": self.failed,
+                "pending": self._pending
+            }
+
+    def shutdown(self, wait=True):
+        """Fährt den Pool herunter"""
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+
+        if executor is not None:
+            executor.shutdown(wait=wait)
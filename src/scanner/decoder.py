@@ -7,52 +7,413 @@ QR-Code Decoder für den QR-Code Scanner
 
 import cv2
 import numpy as np
-from pyzbar.pyzbar import decode
-import re
+from pyzbar.pyzbar import decode, ZBarSymbol
+import time
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from src.data.parser import parse_label
+
+# Ergebnis eines Decoder-Backends (gleiche Felder wie bei pyzbar)
+Symbol = namedtuple("Symbol", ["data", "polygon", "type"])
+
+
+class DecoderBackend:
+    """Basisklasse für Decoder-Backends"""
+
+    name = "base"
+
+    def decode(self, gray):
+        """
+        Sucht Codes in einem Graustufenbild
+
+        Das Bild gehört dem Backend nur für die Dauer des Aufrufs: der QRDecoder
+        verwendet den Puffer für das nächste Bild wieder. Backends, die es nach der
+        Rückkehr weiter lesen (z.B. in einem Worker-Thread), müssen eine Kopie anlegen.
+
+        Args:
+            gray: Graustufenbild
+
+        Returns:
+            list: Gefundene Symbole mit data (bytes), polygon und type
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Gibt die Ressourcen des Backends frei (z.B. Worker-Threads)"""
+
+
+def normalize_symbologies(symbologies):
+    """
+    Prüft und vereinheitlicht eine Liste von Symbologien
+
+    Leerzeichen und Bindestriche werden entfernt ("EAN-13" -> "EAN13"), Unterstriche
+    gehören zum Namen (z.B. "DATABAR_EXP"). Schreibweisen wie "CODE_128" werden nur
+    angenommen, wenn es den Namen mit Unterstrich nicht gibt.
+
+    Args:
+        symbologies: Namen wie "QRCODE", "CODE128", "EAN13" oder None für alle
+
+    Returns:
+        list: Namen der ZBarSymbol-Typen oder None für alle Symbologien
+
+    Raises:
+        ValueError: Bei einer unbekannten Symbologie
+    """
+    if symbologies is None:
+        return None
+
+    names = []
+    for symbology in symbologies:
+        name = symbology.strip().upper().replace(" ", "").replace("-", "")
+        if not name:
+            continue
+        if name not in ZBarSymbol.__members__:
+            name = name.replace("_", "")
+            if name not in ZBarSymbol.__members__:
+                raise ValueError(f"Unbekannte Symbologie: {symbology.strip()}")
+        names.append(name)
+    return names or None
+
+
+class PyzbarBackend(DecoderBackend):
+    """Decodierung mit pyzbar (ZBar)"""
+
+    name = "pyzbar"
+
+    def __init__(self, symbologies=None):
+        symbologies = normalize_symbologies(symbologies)
+        self.symbols = [ZBarSymbol[name] for name in symbologies] if symbologies else None
+
+    def decode(self, gray):
+        if self.symbols is None:
+            return decode(gray)
+        return decode(gray, symbols=self.symbols)
+
+
+class OpenCVBackend(DecoderBackend):
+    """Decodierung mit den QR-Code- und Barcode-Detektoren von OpenCV"""
+
+    name = "opencv"
+
+    def __init__(self, symbologies=None):
+        symbologies = normalize_symbologies(symbologies)
+
+        # QR-Codes
+        self.detector = None
+        if symbologies is None or "QRCODE" in symbologies:
+            self.detector = cv2.QRCodeDetector()
+
+        # 1D-Barcodes (nur Typen, die OpenCV unterstützt)
+        self.barcode_types = None if symbologies is None else set(symbologies) - {"QRCODE"}
+        self.barcode_detector = None
+        if (self.barcode_types is None or self.barcode_types) and hasattr(cv2, "barcode"):
+            self.barcode_detector = cv2.barcode.BarcodeDetector()
+
+    def decode(self, gray):
+        symbols = []
+
+        if self.detector is not None:
+            found, texts, points, _ = self.detector.detectAndDecodeMulti(gray)
+            if found and points is not None:
+                symbols.extend(
+                    Symbol(text.encode('utf-8'), [tuple(point) for point in corners], "QRCODE")
+                    for text, corners in zip(texts, points)
+                    if text
+                )
+
+        if self.barcode_detector is not None:
+            found, texts, types, points = self.barcode_detector.detectAndDecodeWithType(gray)
+            if found and points is not None:
+                for text, symbology, corners in zip(texts, types, points):
+                    # OpenCV liefert z.B. "EAN_13", pyzbar "EAN13"
+                    symbology = symbology.replace("_", "")
+                    if text and (self.barcode_types is None or symbology in self.barcode_types):
+                        symbols.append(Symbol(text.encode('utf-8'), [tuple(point) for point in corners],
+                                              symbology))
+
+        return symbols
+
+
+class FallbackBackend(DecoderBackend):
+    """Versucht mehrere Backends nacheinander, bis eines Codes findet"""
+
+    name = "fallback"
+
+    def __init__(self, backends):
+        self.backends = list(backends)
+
+    def decode(self, gray):
+        for backend in self.backends:
+            symbols = backend.decode(gray)
+            if symbols:
+                return symbols
+        return []
+
+    def close(self):
+        for backend in self.backends:
+            backend.close()
+
+
+class RaceBackend(DecoderBackend):
+    """
+    Startet mehrere Backends gleichzeitig und übernimmt das erste Ergebnis mit Codes
+
+    Jedes Backend hat einen eigenen Worker. Ist ein langsames Backend noch mit einem
+    früheren Bild beschäftigt, wird es für das aktuelle Bild übersprungen, statt den
+    Aufruf hinter die veraltete Arbeit einzureihen.
+
+    Unterlegene Backends lesen ihr Bild nach der Rückkehr von decode() weiter. Sie
+    erhalten deshalb eine eigene Kopie, der Aufrufer darf seinen Puffer (z.B. das
+    wiederverwendete Graustufenbild des QRDecoder) sofort überschreiben.
+    """
+
+    name = "race"
+
+    def __init__(self, backends):
+        self.backends = list(backends)
+        self._lock = threading.Lock()
+        self._executors = [ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"QRDecodeRace-{backend.name}")
+                           for backend in self.backends]
+        self._running = [None] * len(self.backends)
+
+        # Anzahl der übersprungenen Backend-Aufrufe (Backend noch beschäftigt)
+        self.skipped = 0
+
+    def _submit(self, gray):
+        """Übergibt das Bild an alle freien Backends und wartet, falls alle beschäftigt sind"""
+        while True:
+            with self._lock:
+                if self._executors is None:
+                    return set()
+
+                free = [i for i, future in enumerate(self._running) if future is None or future.done()]
+                if free:
+                    # Eine Kopie für alle Backends dieses Aufrufs, unabhängig vom Puffer des Aufrufers
+                    gray = gray.copy() if gray is not None else None
+                    for i in free:
+                        self._running[i] = self._executors[i].submit(self.backends[i].decode, gray)
+                    self.skipped += len(self.backends) - len(free)
+                    return {self._running[i] for i in free}
+
+                busy = set(self._running)
+
+            wait(busy, return_when=FIRST_COMPLETED)
+
+    def decode(self, gray):
+        pending = self._submit(gray)
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    symbols = future.result()
+                except Exception:
+                    continue
+                if symbols:
+                    # Noch nicht gestartete Aufrufe verwerfen, laufende nicht abwarten
+                    for other in pending:
+                        other.cancel()
+                    return symbols
+        return []
+
+    def close(self):
+        with self._lock:
+            executors, self._executors = self._executors, None
+
+        if executors is not None:
+            for executor in executors:
+                executor.shutdown(wait=False, cancel_futures=True)
+        for backend in self.backends:
+            backend.close()
+
+
+# Verfügbare Einzel-Backends
+BACKENDS = {
+    "pyzbar": PyzbarBackend,
+    "opencv": OpenCVBackend,
+}
+
+
+def create_backend(name="pyzbar", symbologies=None):
+    """
+    Erzeugt ein Decoder-Backend
+
+    Args:
+        name: "pyzbar", "opencv", "fallback" oder "race"; für "fallback" und "race"
+              kann die Reihenfolge angegeben werden, z.B. "fallback:opencv,pyzbar"
+        symbologies: Aktivierte Symbologien, z.B. ["QRCODE", "CODE128"] (Standard: alle)
+
+    Returns:
+        DecoderBackend: Das erzeugte Backend
+    """
+    if isinstance(name, DecoderBackend):
+        return name
+
+    mode, _, order = name.partition(":")
+    if mode in BACKENDS:
+        return BACKENDS[mode](symbologies)
+
+    names = [n.strip() for n in order.split(",") if n.strip()] if order else list(BACKENDS)
+    backends = [BACKENDS[n](symbologies) for n in names]
+    if mode == "fallback":
+        return FallbackBackend(backends)
+    if mode == "race":
+        return RaceBackend(backends)
+
+    raise ValueError(f"Unbekanntes Decoder-Backend: {name}")
+
+
+def calibrate_backends(images, backend_names=None, repeat=1):
+    """
+    Misst Latenz und Trefferquote der Backends auf einer Sammlung von Etiketten-Bildern
+
+    Args:
+        images: Liste von BGR- oder Graustufenbildern
+        backend_names: Zu messende Backends als Namen oder Instanzen (Standard: alle Einzel-Backends)
+        repeat: Anzahl der Durchläufe pro Bild
+
+    Returns:
+        list: Ein Eintrag pro Backend mit name, mean_ms und hit_rate,
+              sortiert nach Trefferquote (absteigend) und Latenz (aufsteigend)
+    """
+    grays = [cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+             for image in images]
+
+    results = []
+    for name in backend_names or list(BACKENDS):
+        backend = create_backend(name)
+        if isinstance(name, DecoderBackend):
+            name = backend.name
+        hits = 0
+        elapsed = 0.0
+
+        for gray in grays:
+            found = False
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                symbols = backend.decode(gray)
+                elapsed += time.perf_counter() - start
+                found = found or bool(symbols)
+            hits += int(found)
+
+        runs = max(1, len(grays) * max(1, repeat))
+        results.append({
+            "name": name,
+            "mean_ms": elapsed / runs * 1000.0,
+            "hit_rate": hits / len(grays) if grays else 0.0
+        })
+
+    results.sort(key=lambda entry: (-entry["hit_rate"], entry["mean_ms"]))
+    return results
+
+
+def select_backend(images, backend_names=None, repeat=1):
+    """
+    Wählt anhand einer Kalibrierung das beste Backend aus
+
+    Args:
+        images: Liste von BGR- oder Graustufenbildern
+        backend_names: Zu messende Backends (Standard: alle Einzel-Backends)
+        repeat: Anzahl der Durchläufe pro Bild
+
+    Returns:
+        str: Name des Backends mit der höchsten Trefferquote und geringsten Latenz
+    """
+    results = calibrate_backends(images, backend_names, repeat)
+    return results[0]["name"] if results else "pyzbar"
 
 
 class QRDecoder:
     """Klasse zum Decodieren von QR-Codes"""
 
-    def __init__(self):
-        """Initialisiert den QR-Code Decoder"""
+    def __init__(self, tracking=False, full_scan_interval=10, roi_padding=0.25, scales=(1.0,),
+                 backend="pyzbar", symbologies=None):
+        """
+        Initialisiert den QR-Code Decoder
+
+        Args:
+            tracking: Nur den Bereich um die zuletzt erkannten Codes decodieren (Standard: False)
+            full_scan_interval: Im Tracking-Modus jeden N-ten Frame vollständig scannen
+            roi_padding: Rand um die zuletzt erkannten Codes, relativ zu deren Größe
+            scales: Skalierungsstufen in Versuchsreihenfolge, z.B. (0.5, 1.0, 2.0);
+                    die nächste Stufe wird nur versucht, wenn die vorherige nichts findet
+            backend: Name des Decoder-Backends (siehe create_backend) oder DecoderBackend-Instanz
+            symbologies: Aktivierte Symbologien, z.B. ["QRCODE", "CODE128"] (Standard: alle);
+                         alle aktivierten Codes werden in einem Durchlauf gefunden
+        """
         self.last_positions = []
+        self.symbologies = normalize_symbologies(symbologies)
+        self.backend = create_backend(backend, self.symbologies)
+
+        # Wiederverwendete Puffer für Graustufen- und skalierte Bilder (die Backends
+        # lesen sie nur während decode(), siehe DecoderBackend.decode)
+        self._gray = None
+        self._scaled = {}
+
+        # Bildpyramide: Skalierungsstufen mit Treffer-Statistik
+        self.scales = tuple(float(scale) for scale in scales) or (1.0,)
+        self.scale_stats = {scale: {"attempts": 0, "hits": 0} for scale in self.scales}
+
+        # Tracking-Modus (Region of Interest um die zuletzt erkannten Codes)
+        self.tracking = tracking
+        self.full_scan_interval = max(1, full_scan_interval)
+        self.roi_padding = roi_padding
+        self._frames_since_full_scan = 0
+
+        # Statistik für den Tracking-Modus
+        self.stats = {"full_scans": 0, "roi_scans": 0, "roi_misses": 0}
+
+    def close(self):
+        """Gibt die Ressourcen des Backends frei"""
+        self.backend.close()
 
     def decode_image(self, image):
         """
-        Decodiert QR-Codes in einem Bild
+        Decodiert QR-Codes und Barcodes der aktivierten Symbologien in einem Bild
 
         Args:
             image: Das zu decodierende Bild
 
         Returns:
-            list: Liste der decodierten QR-Codes mit Positionsdaten
+            list: Liste der decodierten Codes mit Symbologie und Positionsdaten
         """
+        previous_positions = self.last_positions
         self.last_positions = []
         decoded_objects = []
 
         try:
-            # Bild in Graustufen konvertieren (bessere Erkennungsrate)
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            # Bild in Graustufen konvertieren (bessere Erkennungsrate), Puffer wiederverwenden
+            if self._gray is None or self._gray.shape != image.shape[:2]:
+                self._gray = np.empty(image.shape[:2], dtype=np.uint8)
+            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY, dst=self._gray)
 
-            # QR-Codes decodieren
-            qr_codes = decode(gray)
+            # QR-Codes decodieren (im Tracking-Modus bevorzugt nur im Bereich der letzten Codes)
+            qr_codes = None
+            if self.tracking and previous_positions and \
+                    self._frames_since_full_scan < self.full_scan_interval - 1:
+                qr_codes = self._scan_tracked(gray, previous_positions)
 
-            for qr in qr_codes:
+            if qr_codes is None:
+                qr_codes = self._scan(gray)
+                self._frames_since_full_scan = 0
+                self.stats["full_scans"] += 1
+            else:
+                self._frames_since_full_scan += 1
+
+            for qr, hull in qr_codes:
                 # Polygon um den QR-Code ermitteln
-                points = qr.polygon
-                if points and len(points) > 0:
-                    # In numpy-Array konvertieren
-                    hull = np.array([point for point in points], dtype=np.int32)
-                    hull = hull.reshape((-1, 1, 2))
+                if hull is not None:
                     self.last_positions.append(hull)
 
                 # Daten aus dem QR-Code extrahieren
                 raw_data = qr.data.decode('utf-8', errors='ignore')
                 qr_data = self._parse_qr_data(raw_data)
 
-                # Rohdaten hinzufügen
+                # Rohdaten und Symbologie (z.B. QRCODE, CODE128) hinzufügen
                 qr_data["raw_data"] = raw_data
+                qr_data["symbology"] = str(getattr(qr, "type", "QRCODE"))
 
                 decoded_objects.append(qr_data)
         except Exception as e:
@@ -61,6 +422,122 @@ class QRDecoder:
 
         return decoded_objects
 
+    def _scan(self, gray, offset_x=0, offset_y=0):
+        """
+        Sucht Codes in einem Graustufenbild
+
+        Args:
+            gray: Graustufenbild (oder Ausschnitt davon)
+            offset_x: Horizontale Verschiebung des Ausschnitts im Gesamtbild
+            offset_y: Vertikale Verschiebung des Ausschnitts im Gesamtbild
+
+        Returns:
+            list: Liste von (Symbol, Polygon) mit Polygonen in Bildkoordinaten
+        """
+        qr_codes = []
+        used_scale = 1.0
+
+        # Skalierungsstufen nacheinander versuchen, bis eine Stufe Codes liefert
+        for scale in self.scales:
+            if scale == 1.0:
+                scaled = gray
+            else:
+                height, width = gray.shape[:2]
+                size = (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
+                buffer = self._scaled.get(scale)
+                if buffer is None or buffer.shape != (size[1], size[0]):
+                    buffer = np.empty((size[1], size[0]), dtype=np.uint8)
+                    self._scaled[scale] = buffer
+                interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+                scaled = cv2.resize(gray, size, dst=buffer, interpolation=interpolation)
+
+            stats = self.scale_stats[scale]
+            stats["attempts"] += 1
+            qr_codes = self.backend.decode(scaled)
+            if qr_codes:
+                stats["hits"] += 1
+                used_scale = scale
+                break
+
+        results = []
+        for qr in qr_codes:
+            hull = None
+            points = qr.polygon
+            if points and len(points) > 0:
+                # In numpy-Array konvertieren und auf Originalgröße zurückrechnen
+                hull = np.array([(point[0] / used_scale + offset_x, point[1] / used_scale + offset_y)
+                                 for point in points], dtype=np.int32)
+                hull = hull.reshape((-1, 1, 2))
+            results.append((qr, hull))
+        return results
+
+    def get_scale_stats(self):
+        """
+        Gibt die Treffer-Statistik der Skalierungsstufen zurück
+
+        Returns:
+            list: Ein Eintrag pro Stufe mit scale, attempts, hits und hit_rate
+        """
+        return [
+            {
+                "scale": scale,
+                "attempts": self.scale_stats[scale]["attempts"],
+                "hits": self.scale_stats[scale]["hits"],
+                "hit_rate": (self.scale_stats[scale]["hits"] / self.scale_stats[scale]["attempts"]
+                             if self.scale_stats[scale]["attempts"] else 0.0)
+            }
+            for scale in self.scales
+        ]
+
+    def suggest_scale_order(self):
+        """
+        Schlägt anhand der Statistik eine Reihenfolge der Skalierungsstufen vor
+
+        Stufen mit höherem Anteil an allen Treffern kommen zuerst, bei Gleichstand
+        die kleinere (günstigere) Stufe.
+
+        Returns:
+            tuple: Skalierungsstufen in vorgeschlagener Reihenfolge
+        """
+        return tuple(sorted(self.scales, key=lambda scale: (-self.scale_stats[scale]["hits"], scale)))
+
+    def _scan_tracked(self, gray, previous_positions):
+        """
+        Decodiert nur den erweiterten Bereich um die zuletzt erkannten Codes
+
+        Args:
+            gray: Graustufenbild
+            previous_positions: Polygone der zuletzt erkannten Codes
+
+        Returns:
+            list: Liste von (Symbol, Polygon) oder None, wenn ein vollständiger Scan nötig ist
+        """
+        points = np.concatenate(previous_positions).reshape(-1, 2)
+        x_min, y_min = points.min(axis=0)
+        x_max, y_max = points.max(axis=0)
+
+        pad_x = int((x_max - x_min) * self.roi_padding) + 1
+        pad_y = int((y_max - y_min) * self.roi_padding) + 1
+
+        height, width = gray.shape[:2]
+        x0 = max(0, int(x_min) - pad_x)
+        y0 = max(0, int(y_min) - pad_y)
+        x1 = min(width, int(x_max) + pad_x)
+        y1 = min(height, int(y_max) + pad_y)
+
+        if x1 <= x0 or y1 <= y0:
+            return None
+
+        self.stats["roi_scans"] += 1
+        qr_codes = self._scan(gray[y0:y1, x0:x1], x0, y0)
+
+        # Verfolgter Code verschwunden: vollständigen Scan durchführen
+        if len(qr_codes) < len(previous_positions):
+            self.stats["roi_misses"] += 1
+            return None
+
+        return qr_codes
+
     def get_last_positions(self):
         """
         Gibt die Positionen der zuletzt erkannten QR-Codes zurück
@@ -72,7 +549,7 @@ class QRDecoder:
 
     def _parse_qr_data(self, data):
         """
-        Extrahiert Informationen aus den QR-Code-Daten
+        Extrahiert Informationen aus den QR-Code-Daten (mit dem gemeinsamen Etiketten-Parser)
 
         Args:
             data: Die zu parsenden Daten
@@ -80,68 +557,4 @@ class QRDecoder:
         Returns:
             dict: Extrahierte Informationen
         """
-        result = {
-            "auftrags_nr": "",
-            "paket_nr": "",
-            "kunden_name": ""
-        }
-
-        # Spezielles durch ^ getrenntes Format (hat höchste Priorität)
-        if '^' in data:
-            parts = data.split('^')
-
-            # Wir benötigen mindestens 4 Teile für Auftragsnummer und Paketnummer
-            if len(parts) >= 4:
-                # Auftragsnummer ist im zweiten Feld (Index 1)
-                result["auftrags_nr"] = parts[1]
-
-                # Paketnummer ist im vierten Feld (Index 3)
-                result["paket_nr"] = parts[3]
-
-                # Falls verfügbar, Kundennummer oder ID im dritten Feld (Index 2)
-                if len(parts) > 2:
-                    result["kunden_name"] = f"Kunden-ID: {parts[2]}"
-
-                # Bei diesem Format die weiteren Prüfungen überspringen
-                return result
-
-        # Versuch, die Auftragsnummer zu extrahieren
-        # Basierend auf den Beispielbildern, Muster "NL-XXXXXXX" oder ähnlich
-        auftrags_nr_match = re.search(r'[A-Z]{2}-\d+', data)
-        if auftrags_nr_match:
-            result["auftrags_nr"] = auftrags_nr_match.group(0)
-
-        # Versuch, die Paketnummer zu extrahieren
-        # Langer numerischer Code, wie in den Beispielbildern
-        paket_nr_match = re.search(r'\d{10,}', data)
-        if paket_nr_match:
-            result["paket_nr"] = paket_nr_match.group(0)
-
-        # Versuch, den Kundennamen zu extrahieren
-        # Dies ist schwieriger und hängt vom Format der QR-Code-Daten ab
-        # Hier ein einfacher Ansatz basierend auf den Beispielbildern
-        if "KUNDENNAME:" in data:
-            parts = data.split("KUNDENNAME:")
-            if len(parts) > 1:
-                kunden_name = parts[1].strip()
-                # Bis zum nächsten Schlüsselwort oder Ende nehmen
-                end_markers = ["PAKET-NR", "AUFTRAG", "\n"]
-                for marker in end_markers:
-                    if marker in kunden_name:
-                        kunden_name = kunden_name.split(marker)[0].strip()
-                result["kunden_name"] = kunden_name
-
-        # Zusätzliche Suche für andere Formate
-        # Nach "Referenz: XXX" oder ähnlichen Patterns suchen
-        if not result["auftrags_nr"]:
-            referenz_match = re.search(r'Referenz:\s+([A-Z0-9-]+)', data)
-            if referenz_match:
-                result["auftrags_nr"] = referenz_match.group(1)
-
-        # Nach "Tracking: XXX" oder ähnlichen Patterns suchen
-        if not result["paket_nr"]:
-            tracking_match = re.search(r'Tracking:\s+(\d+)', data)
-            if tracking_match:
-                result["paket_nr"] = tracking_match.group(1)
-
-        return result
\ No newline at end of file
+        return parse_label(data)
\ No newline at end of file
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Zeitfenster-basierte Duplikaterkennung für gescannte Codes
+"""
+
+import time
+from collections import OrderedDict
+
+
+def dedup_key(qr_code):
+    """
+    Ermittelt den Schlüssel, unter dem ein Scan-Ergebnis als Duplikat erkannt wird
+
+    Args:
+        qr_code: Decodiertes Scan-Ergebnis
+
+    Returns:
+        str: Paketnummer (falls vorhanden), sonst die Rohdaten
+    """
+    paket_nr = qr_code.get("paket_nr")
+    if paket_nr:
+        return f"paket_nr:{paket_nr}"
+    return f"raw_data:{qr_code.get('raw_data', '')}"
+
+
+class DedupCache:
+    """Merkt sich gescannte Codes für ein Zeitfenster und verdrängt in LRU-Reihenfolge"""
+
+    def __init__(self, ttl=10.0, max_size=1000, clock=time.monotonic):
+        """
+        Initialisiert den Cache
+
+        Args:
+            ttl: Zeitfenster in Sekunden; ein Code gilt so lange nach seiner letzten
+                 Erkennung als Duplikat (erneutes Erkennen verlängert das Fenster)
+            max_size: Maximale Anzahl gemerkter Codes, der am längsten nicht gesehene wird verdrängt
+            clock: Zeitquelle (für Tests austauschbar)
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self.clock = clock
+
+        # Schlüssel -> Zeitpunkt der letzten Erkennung, älteste zuerst
+        self._entries = OrderedDict()
+
+    def _expire(self, now):
+        """Entfernt alle abgelaufenen Einträge (vom ältesten Ende her)"""
+        while self._entries:
+            key, last_seen = next(iter(self._entries.items()))
+            if now - last_seen < self.ttl:
+                break
+            del self._entries[key]
+
+    def is_duplicate(self, key, now=None):
+        """
+        Prüft, ob ein Code innerhalb des Zeitfensters bereits erkannt wurde, und merkt ihn sich
+
+        Args:
+            key: Schlüssel des Codes (siehe dedup_key)
+            now: Aktueller Zeitpunkt (Standard: clock())
+
+        Returns:
+            bool: True, wenn der Code ein Duplikat ist
+        """
+        if now is None:
+            now = self.clock()
+
+        self._expire(now)
+
+        duplicate = key in self._entries
+        self._entries[key] = now
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+        return duplicate
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def clear(self):
+        """Vergisst alle gemerkten Codes"""
+        self._entries.clear()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Parallele Kamerasuche mit Timeout und Zwischenspeicherung der gefundenen Geräte
+"""
+
+import os
+import json
+import time
+import datetime
+import logging
+import threading
+
+import cv2
+
+logger = logging.getLogger('QRScanner')
+
+
+def probe_camera(camera_id):
+    """
+    Prüft, ob eine Kamera geöffnet werden kann und Bilder liefert
+
+    Args:
+        camera_id: ID der zu prüfenden Kamera
+
+    Returns:
+        bool: True, wenn die Kamera funktionsfähig ist
+    """
+    cam = None
+    try:
+        cam = cv2.VideoCapture(camera_id)
+        if not cam.isOpened():
+            logger.debug(f"Kamera {camera_id} kann nicht geöffnet werden")
+            return False
+
+        ret, frame = cam.read()
+        if ret and frame is not None and frame.size > 0:
+            return True
+
+        logger.debug(f"Kamera {camera_id} kann geöffnet werden, liefert aber keine Bilder")
+        return False
+    except Exception as e:
+        logger.debug(f"Fehler beim Prüfen von Kamera {camera_id}: {e}")
+        return False
+    finally:
+        if cam is not None:
+            try:
+                cam.release()
+            except Exception:
+                pass
+
+
+def discover_cameras(camera_ids=range(5), timeout=1.0, probe=probe_camera, with_timeouts=False):
+    """
+    Prüft mehrere Kameras gleichzeitig, jede mit eigenem Timeout
+
+    Geräte, die innerhalb des Timeouts nicht antworten, gelten als nicht verfügbar.
+    Die zugehörigen Prüf-Threads laufen als Daemon-Threads aus und blockieren nichts.
+
+    Args:
+        camera_ids: Zu prüfende Kamera-IDs (Standard: 0-4)
+        timeout: Maximale Prüfdauer pro Gerät in Sekunden
+        probe: Prüffunktion probe(camera_id) -> bool
+        with_timeouts: Zusätzlich die Geräte zurückgeben, deren Prüfung nicht fertig wurde
+
+    Returns:
+        list: Sortierte Liste der funktionsfähigen Kamera-IDs
+              (mit with_timeouts: Tupel aus dieser Liste und der Liste der Geräte mit Timeout)
+    """
+    results = {}
+
+    def run(camera_id):
+        results[camera_id] = probe(camera_id)
+
+    threads = []
+    for camera_id in camera_ids:
+        thread = threading.Thread(target=run, args=(camera_id,),
+                                  name=f"CameraProbe-{camera_id}", daemon=True)
+        thread.start()
+        threads.append((camera_id, thread))
+
+    # Alle Geräte werden parallel geprüft, daher gilt der Timeout ab dem gemeinsamen Start
+    deadline = time.monotonic() + timeout
+    available = []
+    timed_out = []
+    for camera_id, thread in threads:
+        thread.join(max(0.0, deadline - time.monotonic()))
+        if thread.is_alive():
+            logger.warning(f"Timeout beim Prüfen von Kamera {camera_id}")
+            timed_out.append(camera_id)
+        elif results.get(camera_id):
+            available.append(camera_id)
+
+    if with_timeouts:
+        return sorted(available), sorted(timed_out)
+    return sorted(available)
+
+
+class CameraCache:
+    """Speichert die zuletzt funktionierenden Kameras auf der Festplatte"""
+
+    def __init__(self, cache_path=None):
+        """
+        Initialisiert den Cache
+
+        Args:
+            cache_path: Pfad zur Cache-Datei (Standard: ~/qr_scanner_data/camera_cache.json)
+        """
+        if cache_path is None:
+            home_dir = os.path.expanduser("~")
+            cache_path = os.path.join(home_dir, "qr_scanner_data", "camera_cache.json")
+        self.cache_path = cache_path
+
+    def load(self):
+        """
+        Lädt die zuletzt gefundenen Kameras
+
+        Returns:
+            list: Liste der Kamera-IDs (leer, falls kein Cache existiert)
+        """
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return [int(camera_id) for camera_id in data.get("cameras", [])]
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            logger.warning(f"Kamera-Cache konnte nicht gelesen werden: {e}")
+            return []
+
+    def merge(self, available, timed_out):
+        """
+        Ergänzt das Ergebnis einer Kamerasuche um zwischengespeicherte Kameras, deren
+        Prüfung nicht rechtzeitig fertig wurde (z.B. langsam öffnende USB-Kameras)
+
+        Args:
+            available: Gefundene Kamera-IDs
+            timed_out: Kamera-IDs, deren Prüfung den Timeout überschritten hat
+
+        Returns:
+            list: Sortierte Liste der Kamera-IDs für Anzeige und Cache
+        """
+        cached = set(self.load())
+        return sorted(set(available) | {camera_id for camera_id in timed_out if camera_id in cached})
+
+    def save(self, camera_ids):
+        """
+        Speichert die gefundenen Kameras
+
+        Args:
+            camera_ids: Liste der funktionsfähigen Kamera-IDs
+
+        Returns:
+            bool: True bei Erfolg, False bei Fehler
+        """
+        data = {
+            "cameras": list(camera_ids),
+            "updated": datetime.datetime.now().isoformat()
+        }
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.cache_path)
+            return True
+        except Exception as e:
+            logger.warning(f"Kamera-Cache konnte nicht gespeichert werden: {e}")
+            return False
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Vorfilter für Kamerabilder: nur veränderte und scharfe Frames werden decodiert
+"""
+
+import cv2
+import numpy as np
+
+
+class FrameGate:
+    """Entscheidet anhand eines verkleinerten Graustufenbilds, ob ein Frame decodiert werden soll"""
+
+    def __init__(self, thumbnail_width=160, motion_threshold=2.0, sharpness_threshold=30.0,
+                 max_skipped_frames=30):
+        """
+        Initialisiert den Vorfilter
+
+        Args:
+            thumbnail_width: Breite des Vorschaubilds für die Messungen in Pixeln
+            motion_threshold: Mindestabweichung (mittlere Grauwertdifferenz) zum zuletzt
+                              durchgelassenen Frame
+            sharpness_threshold: Mindestschärfe (Varianz des Laplace-Filters)
+            max_skipped_frames: Nach so vielen unveränderten Frames wird trotzdem ein Frame
+                                durchgelassen (z.B. für ein ruhendes, noch nicht erkanntes Paket)
+        """
+        self.thumbnail_width = thumbnail_width
+        self.motion_threshold = motion_threshold
+        self.sharpness_threshold = sharpness_threshold
+        self.max_skipped_frames = max_skipped_frames
+
+        # Vorschaubild des zuletzt durchgelassenen Frames
+        self._reference = None
+        self._static_frames = 0
+
+        # Wiederverwendete Puffer (werden bei Änderung der Bildgröße neu angelegt)
+        self._buffers = {}
+
+        # Statistik
+        self.passed = 0
+        self.skipped_static = 0
+        self.skipped_blur = 0
+
+        # Messwerte des zuletzt geprüften Frames
+        self.last_motion = 0.0
+        self.last_sharpness = 0.0
+
+    def _buffer(self, name, shape, dtype=np.uint8):
+        """Gibt einen wiederverwendeten Puffer der angegebenen Form zurück"""
+        buffer = self._buffers.get(name)
+        if buffer is None or buffer.shape != shape or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buffer
+        return buffer
+
+    def _thumbnail(self, image):
+        """Erzeugt ein verkleinertes Graustufenbild"""
+        height, width = image.shape[:2]
+        scale = min(1.0, self.thumbnail_width / float(width))
+        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+
+        # Erst verkleinern, dann konvertieren (deutlich weniger Pixel)
+        small = cv2.resize(image, size, dst=self._buffer("small", (size[1], size[0]) + image.shape[2:]),
+                           interpolation=cv2.INTER_AREA)
+        if small.ndim == 2:
+            return small
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=self._buffer("thumbnail", (size[1], size[0])))
+
+    def check(self, image):
+        """
+        Prüft, ob ein Frame decodiert werden soll
+
+        Args:
+            image: Das Kamerabild (BGR oder Graustufen)
+
+        Returns:
+            bool: True, wenn der Frame an den Decoder weitergegeben werden soll
+        """
+        thumbnail = self._thumbnail(image)
+
+        # Bewegung: Abweichung zum zuletzt durchgelassenen Frame
+        if self._reference is not None and self._reference.shape == thumbnail.shape:
+            diff = cv2.absdiff(thumbnail, self._reference, dst=self._buffer("diff", thumbnail.shape))
+            self.last_motion = float(cv2.mean(diff)[0])
+            if self.last_motion < self.motion_threshold and self._static_frames < self.max_skipped_frames:
+                self._static_frames += 1
+                self.skipped_static += 1
+                return False
+        else:
+            self.last_motion = float("inf")
+
+        # Schärfe: Varianz des Laplace-Filters
+        laplacian = cv2.Laplacian(thumbnail, cv2.CV_64F,
+                                  dst=self._buffer("laplacian", thumbnail.shape, np.float64))
+        _, stddev = cv2.meanStdDev(laplacian)
+        self.last_sharpness = float(stddev[0][0]) ** 2
+        if self.last_sharpness < self.sharpness_threshold:
+            self.skipped_blur += 1
+            return False
+
+        # Vorschaubild als neue Referenz übernehmen (in einen eigenen Puffer kopieren)
+        self._reference = self._buffer("reference", thumbnail.shape)
+        np.copyto(self._reference, thumbnail)
+        self._static_frames = 0
+        self.passed += 1
+        return True
+
+    def reset(self):
+        """Setzt den Referenz-Frame zurück, der nächste scharfe Frame wird durchgelassen"""
+        self._reference = None
+        self._static_frames = 0
+
+    def get_stats(self):
+        """
+        Gibt die Statistik des Vorfilters zurück
+
+        Returns:
+            dict: Anzahl durchgelassener und je Filter verworfener Frames
+        """
+        return {
+            "passed": self.passed,
+            "skipped_static": self.skipped_static,
+            "skipped_blur": self.skipped_blur
+        }
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Gleichzeitiges Scannen mit mehreren Kameras über einen gemeinsamen Decodier-Pool
+"""
+
+import time
+import logging
+import itertools
+import threading
+from functools import partial
+
+from src.scanner.camera import Camera
+from src.scanner.decoder import QRDecoder
+from src.scanner.decode_pool import DecodePool
+from src.scanner.frame_gate import FrameGate
+from src.scanner.dedup import DedupCache, dedup_key
+from src.scanner.tracker import LabelTracker
+
+logger = logging.getLogger('QRScanner')
+
+# So lange nach einer Ablehnung gilt eine Kamera als wartend (in Sekunden)
+FAIRNESS_WINDOW = 0.25
+
+
+class CameraChannel:
+    """Zustand und Statistik einer laufenden Kamera"""
+
+    def __init__(self, camera_id, camera, gate=None, tracker=None):
+        self.camera_id = camera_id
+        self.camera = camera
+        self.gate = gate
+        self.tracker = tracker if tracker is not None else LabelTracker()
+
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.last_seq = 0
+        self.started = time.monotonic()
+
+        # Fairness im gemeinsamen Pool: Zeitpunkt der letzten Übergabe und der letzten Ablehnung
+        self.last_submit = 0.0
+        self.last_refused = None
+
+        # Statistik
+        self.frames = 0
+        self.skipped_gate = 0
+        self.skipped_busy = 0
+        self.submitted = 0
+        self.decoded = 0
+        self.detections = 0
+
+    def get_stats(self):
+        """
+        Gibt die Durchsatz-Statistik der Kamera zurück
+
+        Returns:
+            dict: Zähler sowie gelesene und decodierte Frames pro Sekunde
+        """
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        return {
+            "frames": self.frames,
+            "skipped_gate": self.skipped_gate,
+            "skipped_busy": self.skipped_busy,
+            "submitted": self.submitted,
+            "decoded": self.decoded,
+            "detections": self.detections,
+            "fps": self.frames / elapsed,
+            "decode_fps": self.decoded / elapsed
+        }
+
+
+class MultiCameraScanner:
+    """Betreibt mehrere Kameras gleichzeitig mit gemeinsamem Decodier-Pool und Duplikaterkennung"""
+
+    def __init__(self, callback, workers=2, use_processes=False, decoder_factory=QRDecoder,
+                 gate_factory=FrameGate, dedup_ttl=10.0, camera_factory=None, on_camera_lost=None):
+        """
+        Initialisiert den Scanner
+
+        Args:
+            callback: Funktion callback(camera_id, new_codes, positions), wird nach jedem
+                      decodierten Frame im Worker-Kontext aufgerufen; new_codes enthält nur
+                      neue, nicht doppelte Etiketten
+            workers: Anzahl der Decodier-Worker (gemeinsam für alle Kameras)
+            use_processes: Prozess-Pool statt Thread-Pool verwenden
+            decoder_factory: Erzeugt die Decoder der Worker
+            gate_factory: Erzeugt den Vorfilter pro Kamera (None = ohne Vorfilter)
+            dedup_ttl: Zeitfenster der kameraübergreifenden Duplikaterkennung in Sekunden
+            camera_factory: Erzeugt eine Kamera aus ihrer ID (Standard: Camera mit eigenem Lese-Thread)
+            on_camera_lost: Funktion on_camera_lost(camera_id), wird aufgerufen, wenn eine Kamera
+                            keine Bilder mehr liefert
+        """
+        self.callback = callback
+        self.gate_factory = gate_factory
+        self.camera_factory = camera_factory or partial(Camera, threaded=True, reuse_buffers=True)
+        self.on_camera_lost = on_camera_lost
+
+        self.dedup_cache = DedupCache(ttl=dedup_ttl)
+
+        # Track-IDs sind über alle Kameras eindeutig
+        self._track_ids = itertools.count(1)
+
+        self._lock = threading.Lock()
+        self._channels = {}
+
+        self.decode_pool = DecodePool(
+            callback=self._on_decoded,
+            workers=workers,
+            use_processes=use_processes,
+            decoder_factory=decoder_factory
+        )
+
+    def add_camera(self, camera_id, **camera_options):
+        """
+        Öffnet eine Kamera und startet ihre Verarbeitung
+
+        Args:
+            camera_id: ID der Kamera
+            camera_options: Weitere Argumente für camera_factory (z.B. profile)
+
+        Returns:
+            bool: True, wenn die Kamera läuft
+        """
+        with self._lock:
+            if camera_id in self._channels:
+                return True
+
+        camera = self.camera_factory(camera_id, **camera_options)
+        if not camera.is_opened():
+            camera.release()
+            return False
+
+        gate = self.gate_factory() if self.gate_factory is not None else None
+        channel = CameraChannel(camera_id, camera, gate, LabelTracker(ids=self._track_ids))
+        channel.thread = threading.Thread(target=self._feed, args=(channel,),
+                                          name=f"CameraFeed-{camera_id}", daemon=True)
+
+        with self._lock:
+            self._channels[camera_id] = channel
+        channel.thread.start()
+
+        logger.info(f"Kamera {camera_id} zum Scanner hinzugefügt")
+        return True
+
+    def remove_camera(self, camera_id):
+        """
+        Stoppt eine Kamera und gibt sie frei
+
+        Args:
+            camera_id: ID der Kamera
+
+        Returns:
+            dict: Abschließende Statistik der Kamera oder None, falls sie nicht lief
+        """
+        with self._lock:
+            channel = self._channels.pop(camera_id, None)
+
+        if channel is None:
+            return None
+
+        channel.stop_event.set()
+        if channel.thread is not None and channel.thread is not threading.current_thread():
+            channel.thread.join(timeout=1.0)
+        channel.camera.release()
+
+        stats = channel.get_stats()
+        if channel.gate is not None:
+            stats["gate"] = channel.gate.get_stats()
+        return stats
+
+    def camera_ids(self):
+        """Gibt die IDs der laufenden Kameras zurück"""
+        with self._lock:
+            return list(self._channels)
+
+    def get_camera(self, camera_id):
+        """Gibt die Kamera-Instanz einer laufenden Kamera zurück (oder None)"""
+        with self._lock:
+            channel = self._channels.get(camera_id)
+        return channel.camera if channel is not None else None
+
+    def _feed(self, channel):
+        """Übergibt neue Frames einer Kamera an den Pool (läuft im eigenen Thread pro Kamera)"""
+        camera = channel.camera
+
+        while not channel.stop_event.is_set():
+            if not camera.is_opened():
+                logger.error(f"Kamera {channel.camera_id} liefert keine Bilder mehr")
+                if self.on_camera_lost is not None:
+                    self.on_camera_lost(channel.camera_id)
+                return
+
+            latest = camera.latest_frame(newer_than=channel.last_seq, timeout=0.1, retain=True)
+            if latest is None:
+                continue
+
+            try:
+                channel.last_seq = latest.seq
+                channel.frames += 1
+
+                # Verwerfen, wenn alle Worker belegt sind oder eine andere Kamera schon länger
+                # wartet, bevor der Vorfilter rechnet
+                if self.decode_pool.is_busy() or not self._may_submit(channel):
+                    channel.last_refused = time.monotonic()
+                    channel.skipped_busy += 1
+                    continue
+
+                if channel.gate is not None and not channel.gate.check(latest.image):
+                    channel.skipped_gate += 1
+                    continue
+
+                # Der Pool hält eine eigene Referenz, bis die Decodierung fertig ist
+                camera.retain_frame(latest)
+                if self.decode_pool.submit((channel.camera_id, latest.seq), latest.image,
+                                           on_release=partial(camera.release_frame, latest),
+                                           source=channel.camera_id):
+                    channel.submitted += 1
+                    channel.last_submit = time.monotonic()
+                    channel.last_refused = None
+                else:
+                    camera.release_frame(latest)
+                    channel.last_refused = time.monotonic()
+                    channel.skipped_busy += 1
+            except Exception as e:
+                logger.error(f"Fehler bei der Verarbeitung von Kamera {channel.camera_id}: {e}")
+            finally:
+                camera.release_frame(latest)
+
+    def _may_submit(self, channel):
+        """
+        Überprüft, ob eine Kamera den nächsten freien Worker belegen darf
+
+        Kameras, die gerade abgelehnt wurden, kommen in der Reihenfolge ihrer letzten
+        Übergabe an die Reihe, damit keine Kamera den gemeinsamen Pool für sich allein hat.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for other in self._channels.values():
+                if other is channel or other.last_refused is None:
+                    continue
+                if now - other.last_refused < FAIRNESS_WINDOW and other.last_submit < channel.last_submit:
+                    return False
+        return True
+
+    def _on_decoded(self, frame_id, codes, positions):
+        """Ordnet die Ergebnisse eines Frames zu und meldet neue Etiketten (Worker-Kontext)"""
+        camera_id, _ = frame_id
+
+        with self._lock:
+            channel = self._channels.get(camera_id)
+            if channel is None:
+                # Kamera wurde inzwischen gestoppt
+                return
+
+            channel.decoded += 1
+
+            new_codes = []
+            for qr_code, is_new in channel.tracker.update(codes, positions):
+                qr_code["camera_id"] = camera_id
+
+                # Kameraübergreifend: dasselbe Etikett auf einer zweiten Kamera ist ein Duplikat
+                duplicate = self.dedup_cache.is_duplicate(dedup_key(qr_code))
+                if is_new and not duplicate:
+                    new_codes.append(qr_code)
+
+            channel.detections += len(new_codes)
+
+        self.callback(camera_id, new_codes, positions)
+
+    def get_stats(self):
+        """
+        Gibt die Statistik aller laufenden Kameras zurück
+
+        Returns:
+            dict: Kamera-ID -> Durchsatz-Statistik
+        """
+        with self._lock:
+            channels = list(self._channels.values())
+        return {channel.camera_id: channel.get_stats() for channel in channels}
+
+    def shutdown(self, wait=False):
+        """Stoppt alle Kameras und fährt den Decodier-Pool herunter"""
+        for camera_id in self.camera_ids():
+            self.remove_camera(camera_id)
+        self.decode_pool.shutdown(wait=wait)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Scan-Pipeline ohne GUI: Bildquelle, Decoder, Duplikaterkennung und Speicherung
+"""
+
+import time
+import logging
+from collections import deque
+
+from src.scanner.decoder import QRDecoder
+from src.scanner.decode_pool import DecodeWorkers
+from src.scanner.dedup import DedupCache, dedup_key
+from src.scanner.tracker import LabelTracker
+
+logger = logging.getLogger('QRScanner')
+
+
+class ScanPipeline:
+    """
+    Verarbeitet alle Frames einer Bildquelle und speichert neue Etiketten
+
+    Im Gegensatz zur GUI wird kein Frame verworfen: die Frames werden parallel decodiert,
+    aber in Aufnahmereihenfolge ausgewertet, damit Tracking und Duplikaterkennung
+    (über die Zeitstempel der Quelle) reproduzierbar bleiben.
+    """
+
+    def __init__(self, source, storage=None, workers=2, use_processes=False,
+                 decoder_factory=QRDecoder, gate=None, dedup_ttl=10.0, on_detection=None):
+        """
+        Initialisiert die Pipeline
+
+        Args:
+            source: FrameSource, aus der gelesen wird
+            storage: ScanResultStorage für die erkannten Etiketten (optional)
+            workers: Anzahl der Decodier-Worker
+            use_processes: Prozess-Pool statt Thread-Pool verwenden
+            decoder_factory: Erzeugt die Decoder der Worker
+            gate: FrameGate als Vorfilter (optional)
+            dedup_ttl: Zeitfenster der Duplikaterkennung in Sekunden (Medienzeit der Quelle)
+            on_detection: Funktion on_detection(qr_code) für jedes neue Etikett (optional)
+        """
+        self.source = source
+        self.storage = storage
+        self.workers = max(1, workers)
+        self.use_processes = use_processes
+        self.decoder_factory = decoder_factory
+        self.gate = gate
+        self.on_detection = on_detection
+
+        self.dedup_cache = DedupCache(ttl=dedup_ttl)
+        self.tracker = LabelTracker()
+
+        # Statistik
+        self.frames = 0
+        self.skipped_gate = 0
+        self.decoded = 0
+        self.failed = 0
+        self.detections = 0
+
+    def run(self, max_frames=None):
+        """
+        Verarbeitet die Quelle bis zu ihrem Ende
+
+        Args:
+            max_frames: Höchstens so viele Frames lesen (Standard: alle)
+
+        Returns:
+            dict: Statistik des Durchlaufs
+        """
+        workers = DecodeWorkers(self.workers, self.use_processes, self.decoder_factory,
+                                thread_name_prefix="QRPipeline")
+
+        # Offene Frames in Aufnahmereihenfolge; höchstens zwei pro Worker gleichzeitig
+        pending = deque()
+        max_pending = self.workers * 2
+
+        start = time.perf_counter()
+        try:
+            for frame in self.source:
+                self.frames += 1
+
+                if self.gate is None or self.gate.check(frame.image):
+                    if len(pending) >= max_pending:
+                        self._finish(*pending.popleft())
+                    pending.append((frame, workers.submit(frame.image)))
+                else:
+                    self.skipped_gate += 1
+
+                if max_frames is not None and self.frames >= max_frames:
+                    break
+
+            while pending:
+                self._finish(*pending.popleft())
+        finally:
+            workers.shutdown(wait=True)
+
+        elapsed = time.perf_counter() - start
+        return self.get_stats(elapsed)
+
+    def _finish(self, frame, future):
+        """Wertet das Ergebnis eines Frames aus (in Aufnahmereihenfolge)"""
+        try:
+            codes, positions = future.result()
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Fehler bei der Decodierung von Frame {frame.seq}: {e}")
+            return
+
+        self.decoded += 1
+
+        for qr_code, is_new in self.tracker.update(codes, positions):
+            # Zeitfenster in Medienzeit, damit auch bei maximaler Geschwindigkeit dieselben
+            # Duplikate erkannt werden wie in Echtzeit
+            duplicate = self.dedup_cache.is_duplicate(dedup_key(qr_code), now=frame.timestamp)
+            if not is_new or duplicate:
+                continue
+
+            self.detections += 1
+            if self.storage is not None:
+                self.storage.add_result(qr_code)
+            if self.on_detection is not None:
+                self.on_detection(qr_code)
+
+    def get_stats(self, elapsed=None):
+        """
+        Gibt die Statistik der Pipeline zurück
+
+        Args:
+            elapsed: Laufzeit in Sekunden (für die Bildrate)
+
+        Returns:
+            dict: Zähler und verarbeitete Frames pro Sekunde
+        """
+        stats = {
+            "frames": self.frames,
+            "skipped_gate": self.skipped_gate,
+            "decoded": self.decoded,
+            "failed": self.failed,
+            "detections": self.detections
+        }
+        if elapsed is not None:
+            stats["elapsed"] = elapsed
+            stats["fps"] = self.frames / elapsed if elapsed > 0 else 0.0
+        return stats
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Kameraprofile (FOURCC, Auflösung, Bildrate): Aushandlung, Messung und Zwischenspeicherung
+"""
+
+import os
+import re
+import json
+import time
+import datetime
+import logging
+from collections import namedtuple
+
+import cv2
+
+logger = logging.getLogger('QRScanner')
+
+# Ein Aufnahmeformat; fourcc und fps dürfen None sein (Vorgabe des Treibers)
+CameraProfile = namedtuple("CameraProfile", ["fourcc", "width", "height", "fps"])
+
+# Bisheriges Verhalten: 640x480 ohne FOURCC und Bildrate
+DEFAULT_PROFILE = CameraProfile(None, 640, 480, None)
+
+# Kandidaten für die Aushandlung; MJPEG liefert bei USB-Kameras meist deutlich höhere Bildraten als YUYV
+CANDIDATE_PROFILES = [
+    CameraProfile(fourcc, width, height, fps)
+    for fourcc in ("MJPG", "YUYV")
+    for width, height in ((1920, 1080), (1280, 720), (640, 480))
+    for fps in (30,)
+]
+
+_PROFILE_PATTERN = re.compile(r'^(?:(?P<fourcc>\w{4}) )?(?P<width>\d+)x(?P<height>\d+)(?:@(?P<fps>\d+(?:\.\d+)?))?$')
+
+
+def profile_to_string(profile):
+    """
+    Wandelt ein Profil in die Textform um, z.B. "MJPG 1280x720@30"
+
+    Args:
+        profile: CameraProfile
+
+    Returns:
+        str: Textform des Profils
+    """
+    text = f"{profile.width}x{profile.height}"
+    if profile.fourcc:
+        text = f"{profile.fourcc} {text}"
+    if profile.fps:
+        text = f"{text}@{profile.fps:g}"
+    return text
+
+
+def profile_from_string(text):
+    """
+    Liest ein Profil aus seiner Textform
+
+    Args:
+        text: z.B. "MJPG 1280x720@30" oder "640x480"
+
+    Returns:
+        CameraProfile: Das Profil
+
+    Raises:
+        ValueError: Wenn der Text kein gültiges Profil ist
+    """
+    match = _PROFILE_PATTERN.match(text.strip())
+    if not match:
+        raise ValueError(f"Ungültiges Kameraprofil: {text}")
+
+    fps = match.group("fps")
+    return CameraProfile(match.group("fourcc"), int(match.group("width")), int(match.group("height")),
+                         float(fps) if fps else None)
+
+
+def _fourcc_to_string(value):
+    """Wandelt den FOURCC-Wert von OpenCV in vier Zeichen um (oder None)"""
+    code = int(value)
+    if code <= 0:
+        return None
+    text = "".join(chr((code >> (8 * i)) & 0xFF) for i in range(4))
+    return text if text.isprintable() else None
+
+
+def apply_profile(cap, profile):
+    """
+    Stellt ein Profil an einer geöffneten Kamera ein
+
+    Der FOURCC wird zuerst gesetzt, da manche Treiber (V4L2) die möglichen
+    Auflösungen und Bildraten vom Format abhängig machen.
+
+    Args:
+        cap: Geöffnetes cv2.VideoCapture
+        profile: Einzustellendes CameraProfile
+
+    Returns:
+        CameraProfile: Das tatsächlich von der Kamera gemeldete Profil
+    """
+    if profile.fourcc:
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*profile.fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, profile.width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, profile.height)
+    if profile.fps:
+        cap.set(cv2.CAP_PROP_FPS, profile.fps)
+
+    fps = float(cap.get(cv2.CAP_PROP_FPS))
+    return CameraProfile(
+        _fourcc_to_string(cap.get(cv2.CAP_PROP_FOURCC)),
+        int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        fps if fps > 0 else None
+    )
+
+
+def measure_profile(camera_id, profile, frames=30, warmup=5, capture_factory=cv2.VideoCapture):
+    """
+    Misst die dauerhaft erreichte Bildrate und die Lese-Latenz einer Kamera mit einem Profil
+
+    Args:
+        camera_id: ID der Kamera
+        profile: Zu messendes CameraProfile
+        frames: Anzahl der gemessenen Frames
+        warmup: Anzahl der Frames, die vor der Messung verworfen werden (Belichtung, Puffer)
+        capture_factory: Erzeugt das VideoCapture (für Tests austauschbar)
+
+    Returns:
+        dict: profile, actual (tatsächliches Profil), fps, latency_ms und ok
+    """
+    result = {"profile": profile, "actual": None, "fps": 0.0, "latency_ms": None, "ok": False}
+
+    cap = None
+    try:
+        cap = capture_factory(camera_id)
+        if not cap.isOpened():
+            return result
+
+        actual = apply_profile(cap, profile)
+        result["actual"] = actual
+
+        # Treiber, die das Format ignorieren, liefern eine andere Auflösung
+        if (actual.width, actual.height) != (profile.width, profile.height):
+            logger.debug(f"Kamera {camera_id} unterstützt {profile_to_string(profile)} nicht "
+                         f"(liefert {profile_to_string(actual)})")
+            return result
+
+        for _ in range(warmup):
+            cap.read()
+
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(frames):
+            read_start = time.perf_counter()
+            ret, frame = cap.read()
+            if not ret or frame is None:
+                return result
+            latencies.append(time.perf_counter() - read_start)
+        elapsed = time.perf_counter() - start
+
+        result["fps"] = frames / elapsed if elapsed > 0 else 0.0
+        result["latency_ms"] = 1000.0 * sum(latencies) / len(latencies)
+        result["ok"] = True
+        return result
+    except Exception as e:
+        logger.debug(f"Fehler beim Messen von Kamera {camera_id} mit {profile_to_string(profile)}: {e}")
+        return result
+    finally:
+        if cap is not None:
+            try:
+                cap.release()
+            except Exception:
+                pass
+
+
+def rank_profiles(results, min_fps=20.0):
+    """
+    Sortiert Messergebnisse vom besten zum schlechtesten Profil
+
+    Bevorzugt werden Profile, die mindestens min_fps erreichen, unter diesen die
+    höchste Auflösung, dann die höhere Bildrate und die geringere Latenz.
+
+    Args:
+        results: Ergebnisse von measure_profile
+        min_fps: Mindestbildrate für einen flüssigen Scan
+
+    Returns:
+        list: Die funktionierenden Ergebnisse, bestes zuerst
+    """
+    working = [result for result in results if result["ok"]]
+    return sorted(working, key=lambda result: (
+        result["fps"] >= min_fps,
+        result["profile"].width * result["profile"].height,
+        round(result["fps"]),
+        -result["latency_ms"]
+    ), reverse=True)
+
+
+def negotiate_profile(camera_id, candidates=None, frames=30, min_fps=20.0, measure=measure_profile):
+    """
+    Probiert die Kandidaten nacheinander aus und ermittelt das beste Profil
+
+    Args:
+        camera_id: ID der Kamera
+        candidates: Zu prüfende Profile (Standard: CANDIDATE_PROFILES)
+        frames: Anzahl der gemessenen Frames pro Profil
+        min_fps: Mindestbildrate für einen flüssigen Scan
+        measure: Messfunktion measure(camera_id, profile, frames=...) (für Tests austauschbar)
+
+    Returns:
+        list: Funktionierende Messergebnisse, bestes zuerst (leer, falls keines funktioniert)
+    """
+    results = []
+    for profile in candidates if candidates is not None else CANDIDATE_PROFILES:
+        result = measure(camera_id, profile, frames=frames)
+        if result["ok"]:
+            logger.info(f"Kamera {camera_id}, {profile_to_string(profile)}: "
+                        f"{result['fps']:.1f} FPS, {result['latency_ms']:.1f} ms")
+        results.append(result)
+
+    return rank_profiles(results, min_fps)
+
+
+class ProfileCache:
+    """Speichert die gemessenen Profile und das gewählte Profil pro Kamera auf der Festplatte"""
+
+    def __init__(self, cache_path=None):
+        """
+        Initialisiert den Cache
+
+        Args:
+            cache_path: Pfad zur Cache-Datei (Standard: ~/qr_scanner_data/camera_profiles.json)
+        """
+        if cache_path is None:
+            home_dir = os.path.expanduser("~")
+            cache_path = os.path.join(home_dir, "qr_scanner_data", "camera_profiles.json")
+        self.cache_path = cache_path
+
+    def _load_all(self):
+        """Lädt den gesamten Cache (Kamera-ID als Text -> Eintrag)"""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Profil-Cache konnte nicht gelesen werden: {e}")
+            return {}
+
+    def _save_all(self, data):
+        """Speichert den gesamten Cache atomar"""
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = self.cache_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.cache_path)
+            return True
+        except Exception as e:
+            logger.warning(f"Profil-Cache konnte nicht gespeichert werden: {e}")
+            return False
+
+    def load(self, camera_id):
+        """
+        Lädt die gemessenen Profile einer Kamera
+
+        Args:
+            camera_id: ID der Kamera
+
+        Returns:
+            list: Liste von Dicts (profile, fps, latency_ms), bestes zuerst
+        """
+        entry = self._load_all().get(str(camera_id), {})
+        profiles = []
+        for item in entry.get("profiles", []):
+            try:
+                profiles.append({"profile": profile_from_string(item["profile"]),
+                                 "fps": item["fps"], "latency_ms": item["latency_ms"]})
+            except (KeyError, ValueError) as e:
+                logger.warning(f"Ungültiger Eintrag im Profil-Cache: {e}")
+        return profiles
+
+    def save(self, camera_id, results):
+        """
+        Speichert die Messergebnisse einer Kamera (bestes zuerst)
+
+        Args:
+            camera_id: ID der Kamera
+            results: Ergebnisse von negotiate_profile
+
+        Returns:
+            bool: True bei Erfolg, False bei Fehler
+        """
+        data = self._load_all()
+        entry = data.get(str(camera_id), {})
+        entry["profiles"] = [
+            {"profile": profile_to_string(result["profile"]),
+             "fps": round(result["fps"], 1),
+             "latency_ms": round(result["latency_ms"], 2)}
+            for result in results
+        ]
+        entry["updated"] = datetime.datetime.now().isoformat()
+        data[str(camera_id)] = entry
+        return self._save_all(data)
+
+    def get_selected(self, camera_id, fallback_to_best=True):
+        """
+        Gibt das für eine Kamera gewählte Profil zurück
+
+        Args:
+            camera_id: ID der Kamera
+            fallback_to_best: Ohne eigene Auswahl das beste gemessene Profil liefern
+
+        Returns:
+            CameraProfile: Gewähltes oder bestes Profil, None falls keines bekannt ist
+        """
+        selected = self._load_all().get(str(camera_id), {}).get("selected")
+        if selected:
+            try:
+                return profile_from_string(selected)
+            except ValueError as e:
+                logger.warning(f"Ungültiges Profil im Profil-Cache: {e}")
+
+        if not fallback_to_best:
+            return None
+
+        profiles = self.load(camera_id)
+        return profiles[0]["profile"] if profiles else None
+
+    def set_selected(self, camera_id, profile):
+        """
+        Legt das Profil einer Kamera fest
+
+        Args:
+            camera_id: ID der Kamera
+            profile: CameraProfile oder None (automatisch das beste gemessene Profil)
+
+        Returns:
+            bool: True bei Erfolg, False bei Fehler
+        """
+        data = self._load_all()
+        entry = data.get(str(camera_id), {})
+        if profile is None:
+            entry.pop("selected", None)
+        else:
+            entry["selected"] = profile_to_string(profile)
+        data[str(camera_id)] = entry
+        return self._save_all(data)
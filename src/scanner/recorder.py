@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Aufzeichnung von Kamera-Sitzungen für die spätere Wiedergabe
+
+Eine Sitzung ist ein Verzeichnis mit drei Dateien:
+    session.json  Metadaten (Format, Kamera, Anzahl der Frames)
+    frames.bin    Alle Frames hintereinander, einzeln als JPEG (mjpeg) oder PNG (png, verlustfrei)
+    index.csv     Pro Frame: Sequenznummer, Zeitstempel (Sekunden seit dem ersten Frame),
+                  Position und Länge in frames.bin
+"""
+
+import os
+import csv
+import json
+import queue
+import logging
+import datetime
+import threading
+
+import cv2
+
+logger = logging.getLogger('QRScanner')
+
+# Dateinamen innerhalb eines Sitzungsverzeichnisses
+SESSION_FILE = "session.json"
+FRAMES_FILE = "frames.bin"
+INDEX_FILE = "index.csv"
+
+# Unterstützte Formate: Dateiendung für cv2.imencode
+FORMATS = {
+    "mjpeg": ".jpg",
+    "png": ".png"
+}
+
+
+def is_session(path):
+    """Überprüft, ob ein Verzeichnis eine aufgezeichnete Sitzung enthält"""
+    return os.path.isfile(os.path.join(path, SESSION_FILE))
+
+
+class SessionRecorder:
+    """Schreibt Frames mit Zeitstempeln in einem eigenen Thread in ein Sitzungsverzeichnis"""
+
+    def __init__(self, directory, format="mjpeg", quality=90, queue_size=64, metadata=None):
+        """
+        Initialisiert die Aufzeichnung
+
+        Args:
+            directory: Sitzungsverzeichnis (wird angelegt)
+            format: "mjpeg" (kompakt) oder "png" (verlustfrei)
+            quality: JPEG-Qualität (nur mjpeg)
+            queue_size: Maximale Anzahl noch nicht geschriebener Frames, weitere werden verworfen
+            metadata: Zusätzliche Angaben für session.json (z.B. Kamera-ID)
+
+        Raises:
+            ValueError: Bei einem unbekannten Format
+        """
+        if format not in FORMATS:
+            raise ValueError(f"Unbekanntes Aufzeichnungsformat: {format}")
+
+        self.directory = directory
+        self.format = format
+        self.metadata = dict(metadata or {})
+
+        if format == "mjpeg":
+            self._encode_params = [cv2.IMWRITE_JPEG_QUALITY, quality]
+        else:
+            self._encode_params = [cv2.IMWRITE_PNG_COMPRESSION, 1]
+
+        os.makedirs(directory, exist_ok=True)
+
+        self._frames_file = open(os.path.join(directory, FRAMES_FILE), "wb")
+        self._index_file = open(os.path.join(directory, INDEX_FILE), "w", newline="", encoding="utf-8")
+        self._index = csv.writer(self._index_file)
+        self._index.writerow(["seq", "timestamp", "offset", "length"])
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._first_timestamp = None
+        self._offset = 0
+        self._closed = False
+
+        # Statistik
+        self.frames = 0
+        self.dropped = 0
+        self.frame_shape = None
+
+        self._write_metadata()
+
+        self._thread = threading.Thread(target=self._write_loop, name="SessionRecorder", daemon=True)
+        self._thread.start()
+
+    def write(self, timestamp, image):
+        """
+        Übergibt einen Frame zur Aufzeichnung (kehrt sofort zurück)
+
+        Args:
+            timestamp: Aufnahmezeitpunkt (time.monotonic())
+            image: Das Bild; es wird kopiert, der Aufrufer darf den Puffer weiterverwenden
+
+        Returns:
+            bool: False, wenn der Frame verworfen wurde (Warteschlange voll oder geschlossen)
+        """
+        if self._closed:
+            return False
+
+        try:
+            self._queue.put_nowait((timestamp, image.copy()))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _write_loop(self):
+        """Kodiert und schreibt die Frames der Warteschlange (läuft im eigenen Thread)"""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            timestamp, image = item
+            try:
+                self._write_frame(timestamp, image)
+            except Exception as e:
+                self.dropped += 1
+                logger.error(f"Fehler beim Aufzeichnen eines Frames: {e}")
+
+    def _write_frame(self, timestamp, image):
+        """Kodiert einen Frame und hängt ihn an frames.bin und den Index an"""
+        success, encoded = cv2.imencode(FORMATS[self.format], image, self._encode_params)
+        if not success:
+            raise ValueError("Frame konnte nicht kodiert werden")
+
+        if self._first_timestamp is None:
+            self._first_timestamp = timestamp
+            self.frame_shape = image.shape
+
+        data = encoded.tobytes()
+        self._frames_file.write(data)
+
+        self.frames += 1
+        self._index.writerow([self.frames, f"{timestamp - self._first_timestamp:.6f}", self._offset, len(data)])
+        self._offset += len(data)
+
+    def _write_metadata(self):
+        """Schreibt session.json"""
+        metadata = dict(self.metadata)
+        metadata.update({
+            "format": self.format,
+            "created": metadata.get("created", datetime.datetime.now().isoformat()),
+            "frames": self.frames,
+            "dropped": self.dropped,
+            "frame_shape": list(self.frame_shape) if self.frame_shape is not None else None
+        })
+        self.metadata = metadata
+
+        with open(os.path.join(self.directory, SESSION_FILE), "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=2, ensure_ascii=False)
+
+    def close(self):
+        """Schreibt alle wartenden Frames, schließt die Dateien und aktualisiert die Metadaten"""
+        if self._closed:
+            return
+        self._closed = True
+
+        self._queue.put(None)
+        self._thread.join()
+
+        self._frames_file.close()
+        self._index_file.close()
+        self._write_metadata()
+
+        logger.info(f"Sitzung {self.directory} aufgezeichnet: {self.frames} Frames, {self.dropped} verworfen")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Bildquellen für die Scan-Pipeline: Kameras, Videodateien, Bildverzeichnisse und
+aufgezeichnete Sitzungen
+"""
+
+import os
+import csv
+import json
+import time
+import logging
+
+import cv2
+import numpy as np
+
+from src.scanner.camera import Camera, Frame
+from src.scanner.recorder import SESSION_FILE, FRAMES_FILE, INDEX_FILE, is_session
+
+logger = logging.getLogger('QRScanner')
+
+# Dateiendungen, die als Bilder eingelesen werden
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+
+class FrameSource:
+    """
+    Basisklasse für Bildquellen
+
+    Eine Quelle liefert mit read() nacheinander Frames (seq, timestamp, image) und
+    gibt am Ende None zurück. Der Zeitstempel ist bei Dateien die Medienzeit in Sekunden.
+    Im max_speed-Modus werden Dateien so schnell wie möglich gelesen, sonst in Echtzeit.
+    """
+
+    def __init__(self, max_speed=False):
+        """
+        Initialisiert die Quelle
+
+        Args:
+            max_speed: Frames ohne Echtzeit-Taktung so schnell wie möglich liefern
+        """
+        self.max_speed = max_speed
+        self.seq = 0
+
+        # Bezugspunkte für die Echtzeit-Taktung
+        self._start_wall = None
+        self._start_media = None
+
+    def open(self):
+        """
+        Öffnet die Quelle
+
+        Returns:
+            bool: True bei Erfolg
+        """
+        raise NotImplementedError
+
+    def is_opened(self):
+        """Überprüft, ob die Quelle geöffnet ist"""
+        raise NotImplementedError
+
+    def read(self):
+        """
+        Liest den nächsten Frame
+
+        Returns:
+            Frame: Der nächste Frame oder None am Ende der Quelle bzw. bei einem Fehler
+        """
+        raise NotImplementedError
+
+    def release(self):
+        """Gibt die Quelle frei"""
+
+    def _next_frame(self, timestamp, image):
+        """Erzeugt den nächsten Frame und wartet im Echtzeit-Modus bis zu seinem Zeitpunkt"""
+        if not self.max_speed:
+            self._pace(timestamp)
+
+        self.seq += 1
+        return Frame(self.seq, timestamp, image)
+
+    def _pace(self, media_time):
+        """Wartet, bis die Medienzeit seit dem ersten Frame auch real vergangen ist"""
+        now = time.monotonic()
+        if self._start_wall is None:
+            self._start_wall = now
+            self._start_media = media_time
+            return
+
+        delay = (media_time - self._start_media) - (now - self._start_wall)
+        if delay > 0:
+            time.sleep(delay)
+
+    def __iter__(self):
+        while True:
+            frame = self.read()
+            if frame is None:
+                return
+            yield frame
+
+    def __enter__(self):
+        if not self.is_opened():
+            self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+
+class DeviceSource(FrameSource):
+    """Live-Kamera; sie gibt den Takt selbst vor, max_speed hat daher keine Wirkung"""
+
+    def __init__(self, camera_id=0, max_speed=False):
+        super().__init__(max_speed)
+        self.camera_id = camera_id
+        self.camera = None
+
+    def open(self):
+        self.camera = Camera(self.camera_id)
+        return self.camera.is_opened()
+
+    def is_opened(self):
+        return self.camera is not None and self.camera.is_opened()
+
+    def read(self):
+        if not self.is_opened():
+            return None
+
+        success, image = self.camera.read_frame()
+        if not success or image is None:
+            return None
+
+        self.seq += 1
+        return Frame(self.seq, time.monotonic(), image)
+
+    def release(self):
+        if self.camera is not None:
+            self.camera.release()
+            self.camera = None
+
+
+class VideoFileSource(FrameSource):
+    """Videodatei, im Echtzeit-Modus mit der Bildrate der Datei abgespielt"""
+
+    def __init__(self, path, max_speed=False, fps=None):
+        """
+        Initialisiert die Quelle
+
+        Args:
+            path: Pfad zur Videodatei
+            max_speed: Frames ohne Echtzeit-Taktung so schnell wie möglich liefern
+            fps: Bildrate, falls die Datei keine gültige Angabe enthält (Standard: 30)
+        """
+        super().__init__(max_speed)
+        self.path = path
+        self.fps = fps
+        self.cap = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            logger.error(f"Videodatei {self.path} konnte nicht geöffnet werden")
+            self.cap = None
+            return False
+
+        if self.fps is None:
+            fps = self.cap.get(cv2.CAP_PROP_FPS)
+            self.fps = fps if fps and fps > 0 else 30.0
+        return True
+
+    def is_opened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def read(self):
+        if not self.is_opened():
+            return None
+
+        ret, image = self.cap.read()
+        if not ret or image is None:
+            return None
+
+        # Medienzeit aus der Frame-Nummer, unabhängig von der Lesegeschwindigkeit
+        return self._next_frame(self.seq / self.fps, image)
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+
+
+class ImageDirectorySource(FrameSource):
+    """Bilder eines Verzeichnisses in alphabetischer Reihenfolge"""
+
+    def __init__(self, directory, max_speed=False, fps=10.0):
+        """
+        Initialisiert die Quelle
+
+        Args:
+            directory: Verzeichnis mit den Bildern
+            max_speed: Bilder ohne Echtzeit-Taktung so schnell wie möglich liefern
+            fps: Bilder pro Sekunde im Echtzeit-Modus (bestimmt auch die Zeitstempel)
+        """
+        super().__init__(max_speed)
+        self.directory = directory
+        self.fps = fps
+        self.files = None
+        self._index = 0
+
+    def open(self):
+        if not os.path.isdir(self.directory):
+            logger.error(f"Verzeichnis {self.directory} existiert nicht")
+            return False
+
+        self.files = sorted(
+            os.path.join(self.directory, name) for name in os.listdir(self.directory)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        self._index = 0
+        return True
+
+    def is_opened(self):
+        return self.files is not None
+
+    def read(self):
+        if not self.is_opened():
+            return None
+
+        # Nicht lesbare Dateien überspringen
+        while self._index < len(self.files):
+            path = self.files[self._index]
+            self._index += 1
+
+            image = cv2.imread(path)
+            if image is None:
+                logger.warning(f"Bild {path} konnte nicht geladen werden")
+                continue
+
+            return self._next_frame(self.seq / self.fps, image)
+
+        return None
+
+    def release(self):
+        self.files = None
+
+
+class SessionSource(FrameSource):
+    """Mit dem SessionRecorder aufgezeichnete Sitzung, mit den aufgezeichneten Zeitstempeln"""
+
+    def __init__(self, directory, max_speed=False):
+        """
+        Initialisiert die Quelle
+
+        Args:
+            directory: Sitzungsverzeichnis
+            max_speed: Frames ohne Echtzeit-Taktung so schnell wie möglich liefern
+        """
+        super().__init__(max_speed)
+        self.directory = directory
+        self.metadata = None
+        self.index = None
+        self._frames_file = None
+        self._position = 0
+
+    def open(self):
+        if not is_session(self.directory):
+            logger.error(f"Verzeichnis {self.directory} enthält keine aufgezeichnete Sitzung")
+            return False
+
+        with open(os.path.join(self.directory, SESSION_FILE), "r", encoding="utf-8") as f:
+            self.metadata = json.load(f)
+
+        with open(os.path.join(self.directory, INDEX_FILE), "r", newline="", encoding="utf-8") as f:
+            self.index = [(float(row["timestamp"]), int(row["offset"]), int(row["length"]))
+                          for row in csv.DictReader(f)]
+
+        self._frames_file = open(os.path.join(self.directory, FRAMES_FILE), "rb")
+        self._position = 0
+        return True
+
+    def is_opened(self):
+        return self._frames_file is not None
+
+    def read(self):
+        if not self.is_opened():
+            return None
+
+        while self._position < len(self.index):
+            timestamp, offset, length = self.index[self._position]
+            self._position += 1
+
+            self._frames_file.seek(offset)
+            data = self._frames_file.read(length)
+            image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+            if image is None:
+                logger.warning(f"Frame {self._position} der Sitzung {self.directory} ist beschädigt")
+                continue
+
+            return self._next_frame(timestamp, image)
+
+        return None
+
+    def release(self):
+        if self._frames_file is not None:
+            self._frames_file.close()
+            self._frames_file = None
+
+
+def open_source(spec, max_speed=False):
+    """
+    Erzeugt und öffnet die passende Quelle für eine Angabe
+
+    Args:
+        spec: Kamera-ID (int oder Ziffernfolge), Sitzungsverzeichnis, Bildverzeichnis oder Videodatei
+        max_speed: Dateien ohne Echtzeit-Taktung lesen
+
+    Returns:
+        FrameSource: Die geöffnete Quelle
+
+    Raises:
+        ValueError: Wenn die Quelle nicht geöffnet werden kann
+    """
+    if isinstance(spec, int) or (isinstance(spec, str) and spec.isdigit()):
+        source = DeviceSource(int(spec), max_speed=max_speed)
+    elif is_session(spec):
+        source = SessionSource(spec, max_speed=max_speed)
+    elif os.path.isdir(spec):
+        source = ImageDirectorySource(spec, max_speed=max_speed)
+    else:
+        source = VideoFileSource(spec, max_speed=max_speed)
+
+    if not source.open():
+        source.release()
+        raise ValueError(f"Quelle {spec} konnte nicht geöffnet werden")
+    return source
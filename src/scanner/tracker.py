@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Verfolgung von Etiketten über mehrere Frames anhand ihrer Positionen
+"""
+
+import itertools
+
+
+def bounding_box(position):
+    """
+    Berechnet das umschließende Rechteck eines Polygons
+
+    Args:
+        position: Polygon als numpy-Array der Form (n, 1, 2)
+
+    Returns:
+        tuple: (x_min, y_min, x_max, y_max)
+    """
+    points = position.reshape(-1, 2)
+    x_min, y_min = points.min(axis=0)
+    x_max, y_max = points.max(axis=0)
+    return int(x_min), int(y_min), int(x_max), int(y_max)
+
+
+def iou(box_a, box_b):
+    """
+    Berechnet die Überlappung (Intersection over Union) zweier Rechtecke
+
+    Returns:
+        float: Wert zwischen 0 (keine Überlappung) und 1 (identisch)
+    """
+    x0 = max(box_a[0], box_b[0])
+    y0 = max(box_a[1], box_b[1])
+    x1 = min(box_a[2], box_b[2])
+    y1 = min(box_a[3], box_b[3])
+
+    intersection = max(0, x1 - x0) * max(0, y1 - y0)
+    if intersection == 0:
+        return 0.0
+
+    area_a = (box_a[2] - box_a[0]) * (box_a[3] - box_a[1])
+    area_b = (box_b[2] - box_b[0]) * (box_b[3] - box_b[1])
+    return intersection / float(area_a + area_b - intersection)
+
+
+class Track:
+    """Ein über mehrere Frames verfolgtes Etikett"""
+
+    def __init__(self, track_id, box, raw_data):
+        self.track_id = track_id
+        self.box = box
+        self.raw_data = raw_data
+        self.missed = 0
+        self.hits = 1
+
+
+class LabelTracker:
+    """Ordnet erkannte Codes über IoU den Etiketten der vorherigen Frames zu"""
+
+    def __init__(self, iou_threshold=0.3, max_missed=5, ids=None):
+        """
+        Initialisiert den Tracker
+
+        Args:
+            iou_threshold: Mindestüberlappung, ab der ein Code einem bestehenden Track zugeordnet wird
+            max_missed: Anzahl decodierter Frames ohne Treffer, nach der ein Track verworfen wird
+            ids: Gemeinsamer Zähler für Track-IDs (z.B. für mehrere Kameras), Standard: eigener Zähler
+        """
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.tracks = []
+        self._ids = ids if ids is not None else itertools.count(1)
+
+    def update(self, qr_codes, positions):
+        """
+        Ordnet die Codes eines Frames den bestehenden Tracks zu
+
+        Jeder Code erhält das Feld "track_id". Codes ohne Position (Anzahl der
+        Positionen passt nicht) bekommen jeweils einen neuen Track.
+
+        Args:
+            qr_codes: Decodierte Codes eines Frames
+            positions: Polygone der Codes in gleicher Reihenfolge
+
+        Returns:
+            list: Liste von (qr_code, is_new); is_new ist True beim ersten Auftreten eines Etiketts
+        """
+        if len(positions) != len(qr_codes):
+            positions = [None] * len(qr_codes)
+
+        boxes = [bounding_box(position) if position is not None else None for position in positions]
+
+        # Alle Paare nach Überlappung sortiert gierig zuordnen
+        candidates = []
+        for code_index, box in enumerate(boxes):
+            if box is None:
+                continue
+            for track_index, track in enumerate(self.tracks):
+                overlap = iou(box, track.box)
+                if overlap >= self.iou_threshold:
+                    candidates.append((overlap, code_index, track_index))
+        candidates.sort(reverse=True)
+
+        assigned_codes = {}
+        used_tracks = set()
+        for overlap, code_index, track_index in candidates:
+            if code_index in assigned_codes or track_index in used_tracks:
+                continue
+            # Anderer Inhalt an gleicher Stelle: neues Etikett
+            if self.tracks[track_index].raw_data != qr_codes[code_index].get("raw_data"):
+                continue
+            assigned_codes[code_index] = track_index
+            used_tracks.add(track_index)
+
+        results = []
+        new_tracks = []
+        for code_index, qr_code in enumerate(qr_codes):
+            track_index = assigned_codes.get(code_index)
+            if track_index is not None:
+                track = self.tracks[track_index]
+                track.box = boxes[code_index]
+                track.missed = 0
+                track.hits += 1
+                is_new = False
+            else:
+                track = Track(next(self._ids), boxes[code_index], qr_code.get("raw_data"))
+                new_tracks.append(track)
+                is_new = True
+
+            qr_code["track_id"] = track.track_id
+            results.append((qr_code, is_new))
+
+        # Nicht gefundene Tracks altern lassen
+        for track_index, track in enumerate(self.tracks):
+            if track_index not in used_tracks:
+                track.missed += 1
+
+        self.tracks = [track for track in self.tracks if track.missed <= self.max_missed]
+        self.tracks.extend(track for track in new_tracks if track.box is not None)
+
+        return results
+
+    def reset(self):
+        """Verwirft alle Tracks"""
+        self.tracks = []
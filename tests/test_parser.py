@@ -12,7 +12,8 @@ import os
 # Projektverzeichnis zum Python-Pfad hinzufügen
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.data.parser import ShippingLabelParser
+from src.data.parser import ShippingLabelParser, parse_label, parse_many
+from src.data.gs1 import GS, check_digit, has_valid_check_digit, parse_gs1
 
 
 class TestShippingLabelParser(unittest.TestCase):
@@ -111,6 +112,127 @@ Tracking: 04002338535"""
         # Hier testen wir, ob der Parser flexibel genug ist, um die Daten zu finden
         self.assertTrue(result["auftrags_nr"] == "NL-2581949" or result["paket_nr"] == "04002338535")
 
+    def test_parse_delimited_data_with_bom(self):
+        """Test für das ^-Format mit vorangestelltem Byte Order Mark (wie auf den Etiketten)"""
+        result = self.parser.parse_qr_content("\ufeff6^2581949^19361028^040023385356^2^2802-610")
+
+        self.assertEqual(result["auftrags_nr"], "2581949")
+        self.assertEqual(result["paket_nr"], "040023385356")
+        self.assertEqual(result["kunden_name"], "Kunden-ID: 19361028")
+
+    def test_parse_comma_separated_pairs(self):
+        """Test für mehrere Schlüssel-Wert-Paare in einer Zeile"""
+        result = self.parser.parse_qr_content("Referenz: NL-2581949, Sendungsnummer: 04002338535, Kunde: Test")
+
+        self.assertEqual(result["auftrags_nr"], "NL-2581949")
+        self.assertEqual(result["paket_nr"], "04002338535")
+        self.assertEqual(result["kunden_name"], "Test")
+
+    def test_parse_json_array(self):
+        """Ein JSON-Array ist kein Etikett, die Nummern werden wie im Freitext gesucht"""
+        result = self.parser.parse_qr_content('["NL-2581949", "04002338535"]')
+
+        self.assertEqual(result["auftrags_nr"], "NL-2581949")
+        self.assertEqual(result["paket_nr"], "04002338535")
+
+    def test_parse_label_uses_shared_parser(self):
+        """parse_label liefert dieselben Felder wie eine eigene Parser-Instanz"""
+        content = "AUFTRAG: NL-2581949\nPAKET-NR: 04002338535\nKUNDENNAME: Zorgboederij In Het Weste"
+
+        self.assertEqual(parse_label(content), self.parser.parse_qr_content(content))
+
+    def test_keyword_index_leftmost_keyword(self):
+        """Das am weitesten links stehende Schlüsselwort bestimmt das Feld"""
+        self.assertEqual(self.parser._field_for_key("Kundenname"), "kunden_name")
+        self.assertEqual(self.parser._field_for_key("auftragsNr"), "auftrags_nr")
+        self.assertEqual(self.parser._field_for_key("Sendungsnummer"), "paket_nr")
+        self.assertIsNone(self.parser._field_for_key("Gewicht"))
+
+    def test_add_synonyms(self):
+        """Standortspezifische Schlüsselwörter werden erkannt"""
+        content = "Colli: 04002338535\nKommission: NL-2581949"
+
+        self.assertEqual(self.parser.parse_qr_content(content)["auftrags_nr"], "NL-2581949")
+        self.assertEqual(self.parser.parse_qr_content(content)["kunden_name"], "")
+
+        self.parser.add_synonyms("kunden_name", "Kommission")
+        result = self.parser.parse_qr_content(content)
+
+        self.assertEqual(result["kunden_name"], "NL-2581949")
+        self.assertEqual(result["paket_nr"], "04002338535")
+
+        parser = ShippingLabelParser(synonyms={"paket_nr": ["colli"]})
+        self.assertEqual(parser._field_for_key("COLLI"), "paket_nr")
+
+        with self.assertRaises(ValueError):
+            self.parser.add_synonyms("gewicht", "kg")
+
+    def test_parse_many_keeps_order(self):
+        """parse_many liefert dieselben Ergebnisse in Eingabereihenfolge, mit und ohne Prozess-Pool"""
+        payloads = [f"6^{i}^19361028^0400233{i:05d}^2^2802-610" if i % 2 else f"Referenz: NL-{i}"
+                    for i in range(50)]
+        expected = [self.parser.parse_qr_content(payload) for payload in payloads]
+
+        self.assertEqual(list(parse_many(iter(payloads), workers=1, chunk_size=7)), expected)
+        self.assertEqual(list(parse_many(iter(payloads), workers=2, chunk_size=7)), expected)
+
+    def test_parse_many_with_synonyms(self):
+        """parse_many verwendet die zusätzlichen Schlüsselwörter auch in den Worker-Prozessen"""
+        results = list(parse_many(["Colli: 04002338535"] * 3, workers=2, chunk_size=1,
+                                  synonyms={"paket_nr": ["colli"]}))
+
+        self.assertEqual([result["paket_nr"] for result in results], ["04002338535"] * 3)
+
+
+class TestGS1(unittest.TestCase):
+    """Testklasse für GS1-Elementketten"""
+
+    SSCC = "340123450000000017"
+
+    def setUp(self):
+        """Wird vor jedem Test ausgeführt"""
+        self.parser = ShippingLabelParser()
+
+    def test_check_digit(self):
+        """Test für die GS1-Prüfziffer"""
+        self.assertEqual(check_digit("34012345000000001"), "7")
+        self.assertEqual(check_digit("400638133393"), "1")
+        self.assertTrue(has_valid_check_digit(self.SSCC))
+        self.assertFalse(has_valid_check_digit("340123450000000018"))
+
+    def test_raw_element_string(self):
+        """Test für die Rohform mit Symbologie-Kennung und GS-Trennzeichen"""
+        content = f"]C100{self.SSCC}401NL-2581949{GS}10LOT42"
+
+        self.assertEqual(parse_gs1(content), {"00": self.SSCC, "401": "NL-2581949", "10": "LOT42"})
+
+        result = self.parser.parse_qr_content(content)
+        self.assertEqual(result["paket_nr"], self.SSCC)
+        self.assertEqual(result["auftrags_nr"], "NL-2581949")
+
+    def test_bracketed_element_string(self):
+        """Test für die Klarschrift mit Klammern"""
+        result = self.parser.parse_qr_content(f"(00){self.SSCC}(400)2581949(410)4006381333931")
+
+        self.assertEqual(result["paket_nr"], self.SSCC)
+        self.assertEqual(result["auftrags_nr"], "2581949")
+        self.assertEqual(result["kunden_name"], "GLN: 4006381333931")
+
+    def test_plain_sscc(self):
+        """Eine reine Ziffernfolge ist nur mit gültiger SSCC eine GS1-Kette"""
+        self.assertEqual(parse_gs1("00" + self.SSCC), {"00": self.SSCC})
+        self.assertIsNone(parse_gs1("00340123450000000018"))
+        self.assertIsNone(parse_gs1("040023385356"))
+
+    def test_invalid_element_string_falls_back(self):
+        """Ungültige GS1-Daten werden wie bisher geparst"""
+        self.assertIsNone(parse_gs1(f"]C100{self.SSCC[:-1]}8"))
+        self.assertIsNone(parse_gs1("(00)123(401)NL-1"))
+
+        result = self.parser.parse_qr_content("(Referenz) NL-2581949 04002338535")
+        self.assertEqual(result["auftrags_nr"], "NL-2581949")
+        self.assertEqual(result["paket_nr"], "04002338535")
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
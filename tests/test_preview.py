@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests für die Vorschau des Kamerabilds
+"""
+
+import unittest
+import sys
+import os
+import time
+import numpy as np
+
+# Ohne Bildschirm testen
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+# Projektverzeichnis zum Python-Pfad hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PyQt6.QtWidgets import QApplication
+
+from src.gui.preview import PreviewRenderer, MIN_FPS
+from src.scanner.camera import Frame
+
+
+class FakeLabel:
+    """QLabel-Ersatz mit fester Größe, merkt sich die gesetzten Bilder"""
+
+    def __init__(self, width=320, height=240):
+        self.size = (width, height)
+        self.pixmaps = []
+
+    def width(self):
+        return self.size[0]
+
+    def height(self):
+        return self.size[1]
+
+    def setPixmap(self, pixmap):
+        self.pixmaps.append(pixmap)
+
+
+class FakeCamera:
+    """Kamera-Ersatz, die bei jeder Abfrage einen neuen Frame liefert"""
+
+    def __init__(self):
+        self.image = np.zeros((480, 640, 3), dtype=np.uint8)
+        self.seq = 0
+        self.retained = 0
+        self.released = 0
+
+    def latest_frame(self, newer_than=None, timeout=None, retain=False):
+        self.seq += 1
+        if retain:
+            self.retained += 1
+        return Frame(self.seq, time.monotonic(), self.image)
+
+    def release_frame(self, frame):
+        self.released += 1
+
+
+class TestPreviewRenderer(unittest.TestCase):
+    """Testklasse für den PreviewRenderer"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QApplication.instance() or QApplication([])
+
+    def test_fps_cap(self):
+        """Die Vorschau zeichnet höchstens mit der eingestellten Bildrate"""
+        label = FakeLabel()
+        camera = FakeCamera()
+        renderer = PreviewRenderer(label, max_fps=10)
+        self.assertEqual(renderer.timer.interval(), 100)
+
+        renderer.start(camera)
+        deadline = time.monotonic() + 0.5
+        while time.monotonic() < deadline:
+            self.app.processEvents()
+            time.sleep(0.005)
+        renderer.stop()
+
+        # Die Kamera liefert immer neue Frames, gezeichnet wird nur im Takt des Timers
+        self.assertGreaterEqual(len(label.pixmaps), 2)
+        self.assertLessEqual(len(label.pixmaps), 7)
+        self.assertEqual(camera.retained, camera.released)
+
+    def test_invalid_fps_is_clamped(self):
+        """Eine Bildrate von 0 führt nicht zu einer Division durch 0"""
+        renderer = PreviewRenderer(FakeLabel(), max_fps=0)
+        self.assertEqual(renderer.max_fps, MIN_FPS)
+        self.assertEqual(renderer.timer.interval(), 1000 // MIN_FPS)
+
+    def test_buffer_reuse(self):
+        """Der verkleinerte Puffer wird wiederverwendet, solange sich die Größe nicht ändert"""
+        label = FakeLabel(320, 240)
+        renderer = PreviewRenderer(label)
+        image = np.full((480, 640, 3), 255, dtype=np.uint8)
+        original = image.copy()
+
+        renderer.render(image)
+        buffer = renderer._buffer
+        self.assertEqual(buffer.shape, (240, 320, 3))
+
+        renderer.render(image, [np.array([[[10, 10]], [[100, 10]], [[100, 100]]], dtype=np.int32)])
+        self.assertIs(renderer._buffer, buffer)
+
+        # Größeres Label: neuer Puffer, das Original wird nie verändert
+        label.size = (640, 480)
+        renderer.render(image)
+        self.assertIsNot(renderer._buffer, buffer)
+        self.assertEqual(renderer._buffer.shape, (480, 640, 3))
+        self.assertTrue(np.array_equal(image, original))
+        self.assertEqual(len(label.pixmaps), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -8,15 +8,35 @@ Tests für den QR-Code Scanner und Decoder
 import unittest
 import sys
 import os
+import time
+import tempfile
+import threading
+import itertools
 import cv2
 import numpy as np
 from unittest.mock import MagicMock, patch
+from pyzbar.pyzbar import ZBarSymbol
 
 # Projektverzeichnis zum Python-Pfad hinzufügen
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from src.scanner.decoder import QRDecoder
+from src.scanner.decoder import (QRDecoder, DecoderBackend, OpenCVBackend, FallbackBackend,
+                                 RaceBackend, PyzbarBackend, Symbol, create_backend, calibrate_backends,
+                                 normalize_symbologies)
 from src.scanner.camera import Camera
+from src.scanner.decode_pool import DecodePool
+from src.scanner.discovery import discover_cameras, CameraCache
+from src.scanner.frame_gate import FrameGate
+from src.scanner.buffers import BufferPool
+from src.scanner.dedup import DedupCache, dedup_key
+from src.scanner.tracker import LabelTracker, iou
+from src.scanner.multi_camera import MultiCameraScanner
+from src.scanner.camera import Frame
+from src.scanner.sources import ImageDirectorySource, VideoFileSource, SessionSource, open_source
+from src.scanner.recorder import SessionRecorder
+from src.scanner.profiles import (CameraProfile, ProfileCache, measure_profile, negotiate_profile,
+                                  profile_from_string, profile_to_string)
+from src.scanner.pipeline import ScanPipeline
 
 
 class TestQRDecoder(unittest.TestCase):
@@ -85,6 +105,132 @@ class TestQRDecoder(unittest.TestCase):
         # Prüfen, ob die Positionen korrekt gespeichert wurden
         self.assertEqual(len(self.decoder.get_last_positions()), 2)
 
+    @patch('src.scanner.decoder.decode')
+    def test_tracking_decodes_region_of_interest(self, mock_decode):
+        """Test für den Tracking-Modus mit Decodierung des Bildausschnitts"""
+        decoder = QRDecoder(tracking=True, full_scan_interval=3, roi_padding=0.5)
+
+        mock_qr = MagicMock()
+        mock_qr.data = b'AUFTRAGS-NR.: NL-2581949\nPAKET-NR.: 04002338535'
+        mock_qr.polygon = [(100, 100), (200, 100), (200, 200), (100, 200)]
+        mock_decode.return_value = [mock_qr]
+
+        # Erster Frame: vollständiger Scan
+        decoder.decode_image(self.test_image)
+        self.assertEqual(mock_decode.call_args[0][0].shape, (400, 400))
+
+        # Zweiter Frame: nur der erweiterte Bereich um den Code (49..251)
+        crop_qr = MagicMock()
+        crop_qr.data = mock_qr.data
+        crop_qr.polygon = [(60, 60), (160, 60), (160, 160), (60, 160)]
+        mock_decode.return_value = [crop_qr]
+
+        result = decoder.decode_image(self.test_image)
+        self.assertEqual(mock_decode.call_args[0][0].shape, (202, 202))
+        self.assertEqual(result[0]["auftrags_nr"], "NL-2581949")
+
+        # Polygon wird in Bildkoordinaten zurückgerechnet
+        position = decoder.get_last_positions()[0].reshape(-1, 2)
+        self.assertEqual(tuple(position[0]), (109, 109))
+
+        # Dritter Frame: Ausschnitt, vierter Frame: wieder vollständiger Scan
+        decoder.decode_image(self.test_image)
+        decoder.decode_image(self.test_image)
+        self.assertEqual(mock_decode.call_args[0][0].shape, (400, 400))
+        self.assertEqual(decoder.stats["full_scans"], 2)
+        self.assertEqual(decoder.stats["roi_scans"], 2)
+
+    @patch('src.scanner.decoder.decode')
+    def test_tracking_falls_back_to_full_scan(self, mock_decode):
+        """Test für den vollständigen Scan, wenn der verfolgte Code verschwindet"""
+        decoder = QRDecoder(tracking=True, full_scan_interval=10)
+
+        mock_qr = MagicMock()
+        mock_qr.data = b'NL-2581949'
+        mock_qr.polygon = [(100, 100), (200, 100), (200, 200), (100, 200)]
+        mock_decode.return_value = [mock_qr]
+        decoder.decode_image(self.test_image)
+
+        # Im Ausschnitt wird nichts gefunden, danach folgt der vollständige Scan
+        mock_decode.return_value = []
+        result = decoder.decode_image(self.test_image)
+
+        self.assertEqual(result, [])
+        self.assertEqual(mock_decode.call_count, 3)
+        self.assertEqual(mock_decode.call_args[0][0].shape, (400, 400))
+        self.assertEqual(decoder.stats["roi_misses"], 1)
+
+    @patch('src.scanner.decoder.decode')
+    def test_pyramid_escalates_on_miss(self, mock_decode):
+        """Test für die Bildpyramide mit Eskalation auf die nächste Stufe"""
+        decoder = QRDecoder(scales=(0.5, 1.0, 2.0))
+
+        mock_qr = MagicMock()
+        mock_qr.data = b'NL-2581949'
+        mock_qr.polygon = [(20, 20), (40, 20), (40, 40), (20, 40)]
+
+        # Halbe Größe findet nichts, volle Größe findet den Code
+        mock_decode.side_effect = [[], [mock_qr]]
+        result = decoder.decode_image(self.test_image)
+
+        self.assertEqual(len(result), 1)
+        shapes = [call[0][0].shape for call in mock_decode.call_args_list]
+        self.assertEqual(shapes, [(200, 200), (400, 400)])
+
+        # Treffer auf halber Größe: Polygon wird auf Originalgröße zurückgerechnet
+        mock_decode.side_effect = [[mock_qr]]
+        decoder.decode_image(self.test_image)
+        position = decoder.get_last_positions()[0].reshape(-1, 2)
+        self.assertEqual(tuple(position[0]), (40, 40))
+
+        stats = {entry["scale"]: entry for entry in decoder.get_scale_stats()}
+        self.assertEqual(stats[0.5]["attempts"], 2)
+        self.assertEqual(stats[0.5]["hits"], 1)
+        self.assertEqual(stats[0.5]["hit_rate"], 0.5)
+        self.assertEqual(stats[1.0]["hits"], 1)
+        self.assertEqual(stats[2.0]["attempts"], 0)
+        self.assertEqual(decoder.suggest_scale_order(), (0.5, 1.0, 2.0))
+
+    @patch('src.scanner.decoder.decode')
+    def test_symbologies_single_pass(self, mock_decode):
+        """Test für die Symbologie-Auswahl mit QR-Code und Code128 in einem Durchlauf"""
+        decoder = QRDecoder(symbologies=["QRCODE", "code128"])
+
+        mock_qr = MagicMock()
+        mock_qr.data = b'AUFTRAGS-NR.: NL-2581949'
+        mock_qr.polygon = [(10, 10), (100, 10), (100, 100), (10, 100)]
+        mock_qr.type = "QRCODE"
+
+        mock_barcode = MagicMock()
+        mock_barcode.data = b'04002338535'
+        mock_barcode.polygon = [(150, 10), (350, 10), (350, 60), (150, 60)]
+        mock_barcode.type = "CODE128"
+
+        mock_decode.return_value = [mock_qr, mock_barcode]
+
+        result = decoder.decode_image(self.test_image)
+
+        # Nur ein Aufruf mit den aktivierten Symbologien
+        mock_decode.assert_called_once()
+        self.assertEqual(mock_decode.call_args[1]["symbols"], [ZBarSymbol.QRCODE, ZBarSymbol.CODE128])
+
+        self.assertEqual([r["symbology"] for r in result], ["QRCODE", "CODE128"])
+        self.assertEqual(result[1]["paket_nr"], "04002338535")
+
+    def test_unknown_symbology(self):
+        """Test für eine unbekannte Symbologie"""
+        with self.assertRaises(ValueError):
+            QRDecoder(symbologies=["QRCODE", "UNBEKANNT"])
+
+    def test_symbology_names(self):
+        """Unterstriche gehören zum Namen, Leerzeichen und Bindestriche nicht"""
+        self.assertEqual(normalize_symbologies(["DATABAR_EXP", "databar", " ean-13 ", "Code 128", "CODE_39"]),
+                         ["DATABAR_EXP", "DATABAR", "EAN13", "CODE128", "CODE39"])
+        self.assertEqual(PyzbarBackend(["DATABAR_EXP"]).symbols, [ZBarSymbol.DATABAR_EXP])
+        self.assertIsNone(normalize_symbologies([" "]))
+        with self.assertRaises(ValueError):
+            normalize_symbologies(["DATABAR_UNBEKANNT"])
+
     def test_parse_qr_data(self):
         """Test für das Parsen von QR-Code-Daten"""
         # Standard-Format testen
@@ -103,6 +249,341 @@ class TestQRDecoder(unittest.TestCase):
         self.assertEqual(result["paket_nr"], "04002338535")
 
 
+class StaticBackend(DecoderBackend):
+    """Test-Backend mit fester Antwort"""
+
+    def __init__(self, name, symbols):
+        self.name = name
+        self.symbols = symbols
+        self.calls = 0
+
+    def decode(self, gray):
+        self.calls += 1
+        return self.symbols
+
+
+class SlowBackend(StaticBackend):
+    """Test-Backend mit fester Antwort nach einer Verzögerung"""
+
+    def __init__(self, name, symbols, delay):
+        super().__init__(name, symbols)
+        self.delay = delay
+
+    def decode(self, gray):
+        time.sleep(self.delay)
+        return super().decode(gray)
+
+
+class InputCheckingBackend(DecoderBackend):
+    """Langsames Test-Backend, das prüft, ob sich sein Bild während des Lesens ändert"""
+
+    name = "checking"
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+        self.calls = 0
+        self.changed = 0
+        self.idle = threading.Event()
+        self.idle.set()
+
+    def decode(self, gray):
+        self.idle.clear()
+        self.calls += 1
+        before = gray.copy()
+        time.sleep(self.delay)
+        if not np.array_equal(before, gray):
+            self.changed += 1
+        self.idle.set()
+        return []
+
+
+class TestDecoderBackends(unittest.TestCase):
+    """Testklasse für die Decoder-Backends"""
+
+    def setUp(self):
+        """Wird vor jedem Test ausgeführt"""
+        self.symbol = Symbol(b'NL-2581949', [(10, 10), (50, 10), (50, 50), (10, 50)], "QRCODE")
+
+    def test_opencv_backend_decodes_qr_code(self):
+        """Test für das OpenCV-Backend mit einem erzeugten QR-Code"""
+        qr_image = cv2.QRCodeEncoder.create().encode('AUFTRAGS-NR.: NL-2581949')
+        qr_image = cv2.resize(qr_image, None, fx=6, fy=6, interpolation=cv2.INTER_NEAREST)
+        qr_image = cv2.copyMakeBorder(qr_image, 40, 40, 40, 40, cv2.BORDER_CONSTANT, value=255)
+
+        decoder = QRDecoder(backend="opencv", symbologies=["QRCODE"])
+        result = decoder.decode_image(cv2.cvtColor(qr_image, cv2.COLOR_GRAY2BGR))
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0]["auftrags_nr"], "NL-2581949")
+        self.assertEqual(result[0]["symbology"], "QRCODE")
+        self.assertEqual(len(decoder.get_last_positions()), 1)
+
+    def test_fallback_backend_order(self):
+        """Test für das Fallback-Backend"""
+        empty = StaticBackend("empty", [])
+        hit = StaticBackend("hit", [self.symbol])
+        unused = StaticBackend("unused", [self.symbol])
+
+        backend = FallbackBackend([empty, hit, unused])
+        self.assertEqual(backend.decode(None), [self.symbol])
+        self.assertEqual((empty.calls, hit.calls, unused.calls), (1, 1, 0))
+
+    def test_race_backend_returns_first_hit(self):
+        """Test für das Race-Backend"""
+        backend = RaceBackend([StaticBackend("empty", []), StaticBackend("hit", [self.symbol])])
+        self.assertEqual(backend.decode(None), [self.symbol])
+
+        backend = RaceBackend([StaticBackend("a", []), StaticBackend("b", [])])
+        self.assertEqual(backend.decode(None), [])
+        backend.close()
+
+    def test_race_backend_does_not_wait_for_slow_backend(self):
+        """Ein langsames Backend bremst die folgenden Aufrufe nicht aus"""
+        fast = SlowBackend("fast", [self.symbol], 0.005)
+        slow = SlowBackend("slow", [self.symbol], 0.05)
+        backend = RaceBackend([slow, fast])
+        self.addCleanup(backend.close)
+
+        start = time.perf_counter()
+        for _ in range(10):
+            self.assertEqual(backend.decode(None), [self.symbol])
+        elapsed = time.perf_counter() - start
+
+        # Veraltete Aufrufe des langsamen Backends stauen sich nicht auf
+        self.assertLess(elapsed, 0.25)
+        self.assertLess(slow.calls, 10)
+        self.assertGreater(backend.skipped, 0)
+
+        backend.close()
+        self.assertEqual(backend.decode(None), [])
+
+    def test_race_backend_copies_input(self):
+        """Unterlegene Backends lesen eine eigene Kopie, der Aufrufer darf seinen Puffer überschreiben"""
+        checking = InputCheckingBackend()
+        backend = RaceBackend([checking, StaticBackend("hit", [self.symbol])])
+        self.addCleanup(backend.close)
+
+        buffer = np.zeros((40, 40), dtype=np.uint8)
+        for i in range(10):
+            buffer[:] = i
+            self.assertEqual(backend.decode(buffer), [self.symbol])
+            time.sleep(0.005)
+
+        self.assertTrue(checking.idle.wait(1.0))
+        self.assertGreater(checking.calls, 0)
+        self.assertEqual(checking.changed, 0)
+
+    def test_decoder_buffers_are_not_changed_while_read(self):
+        """Die wiederverwendeten Puffer des Decoders ändern sich nicht, während ein Backend sie liest"""
+        checking = InputCheckingBackend()
+        hit = StaticBackend("hit", [Symbol(b"NL-2581949", [(0, 0), (9, 0), (9, 9), (0, 9)], "QRCODE")])
+        decoder = QRDecoder(backend=RaceBackend([checking, hit]), scales=(0.5, 1.0))
+        self.addCleanup(decoder.close)
+
+        rng = np.random.default_rng(0)
+        for _ in range(10):
+            image = rng.integers(0, 256, (60, 80, 3), dtype=np.uint8)
+            self.assertEqual(len(decoder.decode_image(image)), 1)
+            time.sleep(0.005)
+
+        self.assertTrue(checking.idle.wait(1.0))
+        self.assertGreater(checking.calls, 0)
+        self.assertEqual(checking.changed, 0)
+
+    def test_create_backend(self):
+        """Test für die Erzeugung der Backends über den Namen"""
+        self.assertIsInstance(create_backend("opencv"), OpenCVBackend)
+
+        backend = create_backend("fallback:opencv,pyzbar")
+        self.assertIsInstance(backend, FallbackBackend)
+        self.assertEqual([b.name for b in backend.backends], ["opencv", "pyzbar"])
+
+        with self.assertRaises(ValueError):
+            create_backend("unbekannt")
+
+    def test_calibrate_backends_ranking(self):
+        """Test für die Kalibrierung nach Trefferquote und Latenz"""
+        images = [np.zeros((50, 50), dtype=np.uint8)] * 4
+        results = calibrate_backends(images, [StaticBackend("miss", []), StaticBackend("hit", [self.symbol])])
+
+        self.assertEqual([r["name"] for r in results], ["hit", "miss"])
+        self.assertEqual(results[0]["hit_rate"], 1.0)
+        self.assertEqual(results[1]["hit_rate"], 0.0)
+
+
+class TestFrameGate(unittest.TestCase):
+    """Testklasse für den Vorfilter"""
+
+    def setUp(self):
+        """Wird vor jedem Test ausgeführt"""
+        # Scharfes Schachbrettmuster als Testbild
+        pattern = (np.indices((480, 640)).sum(axis=0) // 16 % 2 * 255).astype(np.uint8)
+        self.sharp_image = cv2.cvtColor(pattern, cv2.COLOR_GRAY2BGR)
+        self.blurred_image = cv2.GaussianBlur(self.sharp_image, (51, 51), 0)
+
+    def test_static_frames_are_skipped(self):
+        """Test für das Verwerfen unveränderter Frames"""
+        gate = FrameGate(max_skipped_frames=3)
+
+        self.assertTrue(gate.check(self.sharp_image))
+        self.assertFalse(gate.check(self.sharp_image))
+        self.assertFalse(gate.check(self.sharp_image))
+        self.assertFalse(gate.check(self.sharp_image))
+
+        # Nach max_skipped_frames wird ein ruhender Frame trotzdem durchgelassen
+        self.assertTrue(gate.check(self.sharp_image))
+        self.assertEqual(gate.get_stats(), {"passed": 2, "skipped_static": 3, "skipped_blur": 0})
+
+    def test_changed_frame_passes(self):
+        """Test für das Durchlassen veränderter Frames"""
+        gate = FrameGate()
+        shifted = np.roll(self.sharp_image, 8, axis=1)
+
+        self.assertTrue(gate.check(self.sharp_image))
+        self.assertTrue(gate.check(shifted))
+        self.assertGreater(gate.last_motion, gate.motion_threshold)
+
+    def test_blurred_frames_are_skipped(self):
+        """Test für das Verwerfen verwackelter Frames"""
+        gate = FrameGate(sharpness_threshold=1000.0)
+
+        self.assertFalse(gate.check(self.blurred_image))
+        self.assertEqual(gate.skipped_blur, 1)
+
+        # Der scharfe Frame danach wird durchgelassen
+        self.assertTrue(gate.check(self.sharp_image))
+
+
+class TestBufferPool(unittest.TestCase):
+    """Testklasse für den BufferPool"""
+
+    def test_buffers_are_reused_after_release(self):
+        """Test für die Wiederverwendung freigegebener Puffer"""
+        pool = BufferPool((4, 4, 3), size=1)
+
+        first = pool.acquire()
+        pool.release(first)
+        second = pool.acquire()
+
+        self.assertIs(first, second)
+        self.assertEqual(pool.allocations, 1)
+
+    def test_retained_buffer_is_not_reused(self):
+        """Test für die Referenzzählung"""
+        pool = BufferPool((4, 4, 3), size=1)
+
+        buffer = pool.acquire()
+        pool.retain(buffer)
+        pool.release(buffer)
+
+        # Noch eine Referenz offen: ein neuer Puffer muss angelegt werden
+        other = pool.acquire()
+        self.assertIsNot(buffer, other)
+        self.assertEqual(pool.allocations, 2)
+
+        pool.release(buffer)
+        self.assertEqual(pool.get_stats(), {"allocations": 2, "free": 1, "in_use": 1})
+
+        # Fremde Arrays werden ignoriert
+        pool.release(np.zeros((4, 4, 3), dtype=np.uint8))
+        self.assertEqual(pool.get_stats()["free"], 1)
+
+
+class TestDedupCache(unittest.TestCase):
+    """Testklasse für den DedupCache"""
+
+    def test_distinct_codes_are_not_duplicates(self):
+        """Test für verschiedene Codes innerhalb des Zeitfensters"""
+        cache = DedupCache(ttl=2.0)
+
+        self.assertFalse(cache.is_duplicate("a", now=0.0))
+        self.assertFalse(cache.is_duplicate("b", now=0.1))
+        self.assertTrue(cache.is_duplicate("a", now=0.2))
+
+    def test_entries_expire_after_ttl(self):
+        """Test für das Ablaufen des Zeitfensters"""
+        cache = DedupCache(ttl=2.0)
+
+        self.assertFalse(cache.is_duplicate("a", now=0.0))
+        self.assertTrue(cache.is_duplicate("a", now=1.5))
+        # Erneutes Erkennen verlängert das Fenster bis 3.5
+        self.assertTrue(cache.is_duplicate("a", now=3.0))
+        self.assertFalse(cache.is_duplicate("a", now=6.0))
+
+    def test_lru_eviction(self):
+        """Test für die Verdrängung des am längsten nicht gesehenen Codes"""
+        cache = DedupCache(ttl=100.0, max_size=2)
+
+        cache.is_duplicate("a", now=0.0)
+        cache.is_duplicate("b", now=1.0)
+        cache.is_duplicate("a", now=2.0)
+        cache.is_duplicate("c", now=3.0)
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertIn("c", cache)
+
+    def test_dedup_key(self):
+        """Test für den Schlüssel nach Paketnummer bzw. Rohdaten"""
+        self.assertEqual(dedup_key({"paket_nr": "04002338535", "raw_data": "x"}), "paket_nr:04002338535")
+        self.assertEqual(dedup_key({"paket_nr": "", "raw_data": "x"}), "raw_data:x")
+
+
+class TestLabelTracker(unittest.TestCase):
+    """Testklasse für den LabelTracker"""
+
+    @staticmethod
+    def polygon(x, y, size=100):
+        return np.array([(x, y), (x + size, y), (x + size, y + size), (x, y + size)],
+                        dtype=np.int32).reshape((-1, 1, 2))
+
+    def test_iou(self):
+        """Test für die Berechnung der Überlappung"""
+        self.assertEqual(iou((0, 0, 10, 10), (0, 0, 10, 10)), 1.0)
+        self.assertEqual(iou((0, 0, 10, 10), (20, 20, 30, 30)), 0.0)
+        self.assertAlmostEqual(iou((0, 0, 10, 10), (5, 0, 15, 10)), 1 / 3)
+
+    def test_multiple_labels_keep_track_ids(self):
+        """Test für mehrere Etiketten mit stabilen Track-IDs"""
+        tracker = LabelTracker(max_missed=1)
+
+        first = tracker.update([{"raw_data": "A"}, {"raw_data": "B"}],
+                               [self.polygon(10, 10), self.polygon(300, 10)])
+        self.assertEqual([is_new for _, is_new in first], [True, True])
+        ids = [code["track_id"] for code, _ in first]
+        self.assertNotEqual(ids[0], ids[1])
+
+        # Leicht verschobene Etiketten in anderer Reihenfolge
+        second = tracker.update([{"raw_data": "B"}, {"raw_data": "A"}],
+                                [self.polygon(305, 12), self.polygon(14, 12)])
+        self.assertEqual([is_new for _, is_new in second], [False, False])
+        self.assertEqual([code["track_id"] for code, _ in second], [ids[1], ids[0]])
+
+        # Ein drittes Etikett kommt hinzu
+        third = tracker.update([{"raw_data": "A"}, {"raw_data": "C"}],
+                               [self.polygon(16, 12), self.polygon(150, 250)])
+        self.assertEqual([is_new for _, is_new in third], [False, True])
+
+    def test_track_expires(self):
+        """Test für das Verwerfen verschwundener Etiketten"""
+        tracker = LabelTracker(max_missed=1)
+
+        tracker.update([{"raw_data": "A"}], [self.polygon(10, 10)])
+        tracker.update([], [])
+        tracker.update([], [])
+
+        result = tracker.update([{"raw_data": "A"}], [self.polygon(10, 10)])
+        self.assertTrue(result[0][1])
+
+    def test_different_content_at_same_position(self):
+        """Test für ein neues Etikett an der Stelle eines alten"""
+        tracker = LabelTracker()
+
+        tracker.update([{"raw_data": "A"}], [self.polygon(10, 10)])
+        result = tracker.update([{"raw_data": "B"}], [self.polygon(10, 10)])
+        self.assertTrue(result[0][1])
+
+
 class TestCamera(unittest.TestCase):
     """Testklasse für die Kamera"""
 
@@ -151,6 +632,658 @@ class TestCamera(unittest.TestCase):
         # Prüfen, ob release() aufgerufen wurde
         mock_instance.release.assert_called_once()
 
+    @patch('cv2.VideoCapture')
+    def test_camera_threaded_latest_frame(self, mock_video_capture):
+        """Test für den Aufnahme-Thread mit Ringpuffer"""
+        test_frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+        mock_instance = mock_video_capture.return_value
+        mock_instance.isOpened.return_value = True
+        mock_instance.read.return_value = (True, test_frame)
+
+        camera = Camera(0, threaded=True, buffer_size=2)
+        try:
+            first = camera.latest_frame(timeout=1.0)
+            self.assertIsNotNone(first)
+            self.assertEqual(first.image.shape, (480, 640, 3))
+
+            # Ein neuerer Frame muss eine höhere Sequenznummer haben
+            second = camera.latest_frame(newer_than=first.seq, timeout=1.0)
+            self.assertIsNotNone(second)
+            self.assertGreater(second.seq, first.seq)
+            self.assertGreaterEqual(second.timestamp, first.timestamp)
+
+            success, frame = camera.read_frame()
+            self.assertTrue(success)
+            self.assertEqual(frame.shape, (480, 640, 3))
+        finally:
+            camera.release()
+
+        # Nach der Freigabe ist der Puffer leer und der Thread beendet
+        self.assertIsNone(camera.latest_frame())
+        self.assertFalse(camera.is_opened())
+
+    @patch('cv2.VideoCapture')
+    def test_camera_reuses_buffers(self, mock_video_capture):
+        """Test für das Lesen in wiederverwendete Puffer"""
+        def read(image=None):
+            if image is None:
+                image = np.zeros((480, 640, 3), dtype=np.uint8)
+            return True, image
+
+        mock_instance = mock_video_capture.return_value
+        mock_instance.isOpened.return_value = True
+        mock_instance.read.side_effect = read
+
+        camera = Camera(0, threaded=True, buffer_size=2, reuse_buffers=True)
+        try:
+            last_seq = 0
+            for _ in range(20):
+                frame = camera.latest_frame(newer_than=last_seq, timeout=1.0, retain=True)
+                self.assertIsNotNone(frame)
+                self.assertTrue(camera.buffer_pool.owns(frame.image))
+                last_seq = frame.seq
+                camera.release_frame(frame)
+
+            # Im Dauerbetrieb werden keine weiteren Puffer angelegt
+            self.assertEqual(camera.buffer_pool.allocations, 6)
+        finally:
+            camera.release()
+
+    @patch('cv2.VideoCapture')
+    def test_camera_releases_buffers_on_read_failure(self, mock_video_capture):
+        """Test, dass fehlgeschlagene Lesevorgänge keine Puffer belegen"""
+        reads = itertools.count()
+
+        def read(image=None):
+            if image is None:
+                image = np.zeros((480, 640, 3), dtype=np.uint8)
+            # Jeder zweite Lesevorgang schlägt fehl, OpenCV gibt dabei den Puffer zurück
+            return next(reads) % 2 == 0, image
+
+        mock_instance = mock_video_capture.return_value
+        mock_instance.isOpened.return_value = True
+        mock_instance.read.side_effect = read
+
+        camera = Camera(0, threaded=True, buffer_size=2, reuse_buffers=True)
+        try:
+            last_seq = 0
+            for _ in range(20):
+                frame = camera.latest_frame(newer_than=last_seq, timeout=1.0)
+                self.assertIsNotNone(frame)
+                last_seq = frame.seq
+
+            self.assertEqual(camera.buffer_pool.allocations, 6)
+        finally:
+            camera.release()
+
+    @patch('cv2.VideoCapture')
+    def test_camera_threaded_read_failure(self, mock_video_capture):
+        """Test für das Beenden des Aufnahme-Threads bei dauerhaften Lesefehlern"""
+        test_frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+        mock_instance = mock_video_capture.return_value
+        mock_instance.isOpened.return_value = True
+        # Erster Lesevorgang (Test in open()) gelingt, danach nur noch Fehler
+        mock_instance.read.side_effect = [(True, test_frame)] + [(False, None)] * Camera.MAX_READ_FAILURES
+
+        camera = Camera(0, threaded=True)
+        try:
+            success, frame = camera.read_frame()
+            self.assertFalse(success)
+            self.assertIsNone(frame)
+            self.assertFalse(camera.is_opened())
+        finally:
+            camera.release()
+
+
+class TestDecodePool(unittest.TestCase):
+    """Testklasse für den DecodePool"""
+
+    def setUp(self):
+        """Wird vor jedem Test ausgeführt"""
+        self.test_image = np.zeros((400, 400, 3), dtype=np.uint8)
+        self.results = []
+        self.done = threading.Event()
+
+    def _callback(self, frame_id, codes, positions):
+        self.results.append((frame_id, codes, positions))
+        self.done.set()
+
+    @patch('src.scanner.decoder.decode')
+    def test_submit_reports_frame_id(self, mock_decode):
+        """Test für die Rückmeldung der Ergebnisse mit Frame-ID"""
+        mock_qr = MagicMock()
+        mock_qr.data = b'AUFTRAGS-NR.: NL-2581949\nPAKET-NR.: 04002338535'
+        mock_qr.polygon = [(10, 10), (100, 10), (100, 100), (10, 100)]
+        mock_decode.return_value = [mock_qr]
+
+        pool = DecodePool(self._callback, workers=1)
+        try:
+            self.assertTrue(pool.submit(42, self.test_image))
+            self.assertTrue(self.done.wait(2.0))
+        finally:
+            pool.shutdown()
+
+        frame_id, codes, positions = self.results[0]
+        self.assertEqual(frame_id, 42)
+        self.assertEqual(codes[0]["auftrags_nr"], "NL-2581949")
+        self.assertEqual(len(positions), 1)
+        self.assertEqual(pool.get_stats()["completed"], 1)
+
+    @patch('src.scanner.decoder.decode')
+    def test_submit_skips_when_busy(self, mock_decode):
+        """Test für das Verwerfen von Frames, wenn alle Worker belegt sind"""
+        release = threading.Event()
+
+        def slow_decode(*args, **kwargs):
+            release.wait(2.0)
+            return []
+
+        mock_decode.side_effect = slow_decode
+
+        pool = DecodePool(self._callback, workers=1)
+        try:
+            self.assertTrue(pool.submit(1, self.test_image))
+            self.assertFalse(pool.submit(2, self.test_image))
+            self.assertTrue(pool.is_busy())
+            release.set()
+            self.assertTrue(self.done.wait(2.0))
+        finally:
+            pool.shutdown()
+
+        stats = pool.get_stats()
+        self.assertEqual(stats["submitted"], 1)
+        self.assertEqual(stats["skipped"], 1)
+        self.assertEqual([r[0] for r in self.results], [1])
+
+
+class FakeCamera:
+    """Kamera-Ersatz, der gleiche Frames liefert (eine feste Anzahl oder bis zum Stoppen)"""
+
+    def __init__(self, camera_id, frames=5, interval=0.005):
+        self.camera_id = camera_id
+        self.frames = frames
+        self.interval = interval
+        self.seq = 0
+        self.released = False
+        self.image = np.zeros((400, 400, 3), dtype=np.uint8)
+
+    def is_opened(self):
+        return not self.released
+
+    def latest_frame(self, newer_than=None, timeout=None, retain=False):
+        if self.frames is not None and self.seq >= self.frames:
+            time.sleep(timeout or 0)
+            return None
+        if self.frames is None:
+            # Laufende Kamera: neue Frames im Abstand der Bildrate
+            time.sleep(self.interval)
+        self.seq += 1
+        return Frame(self.seq, time.monotonic(), self.image)
+
+    def retain_frame(self, frame):
+        pass
+
+    def release_frame(self, frame):
+        pass
+
+    def release(self):
+        self.released = True
+
+
+class TestMultiCameraScanner(unittest.TestCase):
+    """Testklasse für den MultiCameraScanner"""
+
+    def setUp(self):
+        """Wird vor jedem Test ausgeführt"""
+        self.results = []
+        self.lock = threading.Lock()
+
+    def _callback(self, camera_id, new_codes, positions):
+        with self.lock:
+            self.results.append((camera_id, new_codes))
+
+    def _wait_for_decoded(self, scanner, camera_ids, frames, timeout=3.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            stats = scanner.get_stats()
+            if all(stats[camera_id]["decoded"] >= frames for camera_id in camera_ids):
+                return stats
+            time.sleep(0.01)
+        return scanner.get_stats()
+
+    @patch('src.scanner.decoder.decode')
+    def test_cross_camera_dedup(self, mock_decode):
+        """Test für die kameraübergreifende Duplikaterkennung mit gemeinsamem Pool"""
+        mock_qr = MagicMock()
+        mock_qr.data = b'AUFTRAGS-NR.: NL-2581949\nPAKET-NR.: 04002338535'
+        mock_qr.polygon = [(10, 10), (100, 10), (100, 100), (10, 100)]
+        mock_decode.return_value = [mock_qr]
+
+        scanner = MultiCameraScanner(self._callback, workers=2, gate_factory=None,
+                                     camera_factory=lambda camera_id: FakeCamera(camera_id, frames=None))
+        try:
+            self.assertTrue(scanner.add_camera(0))
+            self.assertTrue(scanner.add_camera(1))
+            self.assertEqual(sorted(scanner.camera_ids()), [0, 1])
+
+            stats = self._wait_for_decoded(scanner, [0, 1], 1)
+            self.assertGreaterEqual(stats[0]["decoded"], 1)
+            self.assertGreaterEqual(stats[1]["decoded"], 1)
+        finally:
+            scanner.shutdown(wait=True)
+
+        # Dasselbe Paket vor beiden Kameras wird nur einmal gemeldet
+        detections = [code for _, codes in self.results for code in codes]
+        self.assertEqual(len(detections), 1)
+        self.assertEqual(detections[0]["paket_nr"], "04002338535")
+        self.assertIn(detections[0]["camera_id"], (0, 1))
+        self.assertEqual(scanner.camera_ids(), [])
+
+    @patch('src.scanner.decoder.decode')
+    def test_shared_pool_is_fair(self, mock_decode):
+        """Test, dass keine Kamera den gemeinsamen Pool für sich allein belegt"""
+        def slow_decode(*args, **kwargs):
+            time.sleep(0.02)
+            return []
+        mock_decode.side_effect = slow_decode
+
+        scanner = MultiCameraScanner(self._callback, workers=1, gate_factory=None,
+                                     camera_factory=lambda camera_id: FakeCamera(camera_id, frames=None))
+        try:
+            for camera_id in (0, 1, 2):
+                scanner.add_camera(camera_id)
+            stats = self._wait_for_decoded(scanner, [0, 1, 2], 5)
+        finally:
+            scanner.shutdown(wait=True)
+
+        decoded = [stats[camera_id]["decoded"] for camera_id in (0, 1, 2)]
+        self.assertGreaterEqual(min(decoded), 5)
+        # Die Kameras kommen abwechselnd an die Reihe
+        self.assertLessEqual(max(decoded) - min(decoded), 2)
+
+    def test_remove_camera_releases_it(self):
+        """Test für das Stoppen einer einzelnen Kamera"""
+        cameras = {}
+
+        def camera_factory(camera_id):
+            cameras[camera_id] = FakeCamera(camera_id, frames=0)
+            return cameras[camera_id]
+
+        scanner = MultiCameraScanner(self._callback, workers=1, gate_factory=None,
+                                     camera_factory=camera_factory)
+        try:
+            scanner.add_camera(0)
+            scanner.add_camera(1)
+
+            stats = scanner.remove_camera(0)
+            self.assertEqual(stats["frames"], 0)
+            self.assertTrue(cameras[0].released)
+            self.assertFalse(cameras[1].released)
+            self.assertEqual(scanner.camera_ids(), [1])
+            self.assertIsNone(scanner.remove_camera(0))
+        finally:
+            scanner.shutdown(wait=True)
+
+
+class ListSource:
+    """Bildquelle aus einer Liste von (Zeitstempel, Bild)"""
+
+    def __init__(self, items):
+        self.items = items
+
+    def __iter__(self):
+        for seq, (timestamp, image) in enumerate(self.items, 1):
+            yield Frame(seq, timestamp, image)
+
+
+class TestFrameSources(unittest.TestCase):
+    """Testklasse für die Bildquellen"""
+
+    def setUp(self):
+        """Wird vor jedem Test ausgeführt"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = self.temp_dir.name
+
+    def tearDown(self):
+        """Wird nach jedem Test ausgeführt"""
+        self.temp_dir.cleanup()
+
+    def test_image_directory_source(self):
+        """Test für das Lesen eines Bildverzeichnisses in alphabetischer Reihenfolge"""
+        for index in (2, 1, 3):
+            cv2.imwrite(os.path.join(self.directory, f"img_{index}.png"),
+                        np.full((20, 30, 3), index, dtype=np.uint8))
+        with open(os.path.join(self.directory, "notiz.txt"), "w") as f:
+            f.write("kein Bild")
+
+        source = ImageDirectorySource(self.directory, max_speed=True, fps=10.0)
+        self.assertTrue(source.open())
+        frames = list(source)
+
+        self.assertEqual([frame.seq for frame in frames], [1, 2, 3])
+        self.assertEqual([int(frame.image[0, 0, 0]) for frame in frames], [1, 2, 3])
+        self.assertAlmostEqual(frames[2].timestamp, 0.2)
+
+    def test_video_file_source_pacing(self):
+        """Test für die Echtzeit-Taktung und den max_speed-Modus einer Videodatei"""
+        path = os.path.join(self.directory, "video.avi")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 20.0, (64, 48))
+        for _ in range(5):
+            writer.write(np.zeros((48, 64, 3), dtype=np.uint8))
+        writer.release()
+
+        start = time.monotonic()
+        with VideoFileSource(path) as source:
+            frames = list(source)
+        paced = time.monotonic() - start
+
+        start = time.monotonic()
+        with open_source(path, max_speed=True) as source:
+            fast_frames = list(source)
+        fast = time.monotonic() - start
+
+        self.assertEqual(len(frames), 5)
+        self.assertEqual(len(fast_frames), 5)
+        self.assertAlmostEqual(frames[4].timestamp, 0.2)
+        self.assertGreaterEqual(paced, 0.18)
+        self.assertLess(fast, paced)
+
+    def test_open_source_invalid(self):
+        """Test für eine nicht vorhandene Quelle"""
+        with self.assertRaises(ValueError):
+            open_source(os.path.join(self.directory, "fehlt.avi"))
+
+
+class TestSessionRecorder(unittest.TestCase):
+    """Testklasse für Aufzeichnung und Wiedergabe von Sitzungen"""
+
+    def setUp(self):
+        """Wird vor jedem Test ausgeführt"""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp_dir.name, "session")
+        self.images = [np.random.RandomState(index).randint(0, 255, (48, 64, 3), dtype=np.uint8)
+                       for index in range(3)]
+
+    def tearDown(self):
+        """Wird nach jedem Test ausgeführt"""
+        self.temp_dir.cleanup()
+
+    def test_lossless_roundtrip(self):
+        """Test für die verlustfreie Aufzeichnung mit Zeitstempeln"""
+        with SessionRecorder(self.directory, format="png", metadata={"camera_id": 1}) as recorder:
+            for index, image in enumerate(self.images):
+                self.assertTrue(recorder.write(100.0 + 0.5 * index, image))
+
+        source = open_source(self.directory, max_speed=True)
+        self.assertIsInstance(source, SessionSource)
+        with source:
+            frames = list(source)
+
+        self.assertEqual(source.metadata["camera_id"], 1)
+        self.assertEqual(source.metadata["frames"], 3)
+        self.assertEqual([frame.timestamp for frame in frames], [0.0, 0.5, 1.0])
+        for frame, image in zip(frames, self.images):
+            np.testing.assert_array_equal(frame.image, image)
+
+    def test_mjpeg_format(self):
+        """Test für die kompakte MJPEG-Aufzeichnung"""
+        with SessionRecorder(self.directory, format="mjpeg") as recorder:
+            for image in self.images:
+                recorder.write(time.monotonic(), image)
+
+        with SessionSource(self.directory, max_speed=True) as source:
+            frames = list(source)
+
+        self.assertEqual(len(frames), 3)
+        self.assertEqual(frames[0].image.shape, (48, 64, 3))
+
+        with self.assertRaises(ValueError):
+            SessionRecorder(os.path.join(self.temp_dir.name, "andere"), format="avi")
+
+    @patch('cv2.VideoCapture')
+    def test_camera_records_read_frames(self, mock_video_capture):
+        """Test für die Aufzeichnung der von der Kamera gelesenen Frames"""
+        mock_instance = MagicMock()
+        mock_instance.isOpened.return_value = True
+        mock_instance.read.return_value = (True, self.images[0])
+        mock_video_capture.return_value = mock_instance
+
+        camera = Camera(0)
+        camera.set_recorder(SessionRecorder(self.directory, format="png"))
+        camera.read_frame()
+        camera.read_frame()
+        camera.release()
+
+        with SessionSource(self.directory, max_speed=True) as source:
+            frames = list(source)
+        self.assertEqual(len(frames), 2)
+        self.assertIsNone(camera.recorder)
+
+    @patch('src.scanner.decoder.decode')
+    def test_replay_is_deterministic(self, mock_decode):
+        """Test für die reproduzierbare Wiedergabe durch die Scan-Pipeline"""
+        def decode(image, **kwargs):
+            # Ein Code pro Bild, abhängig vom Bildinhalt
+            qr = MagicMock()
+            qr.data = f"PAKET-NR.: {int(image.flat[0]):012d}".encode()
+            qr.polygon = [(10, 10), (40, 10), (40, 40), (10, 40)]
+            return [qr]
+
+        mock_decode.side_effect = decode
+
+        with SessionRecorder(self.directory, format="png") as recorder:
+            for timestamp, value in [(0.0, 0), (1.0, 1), (2.0, 2), (3.0, 0), (4.0, 1), (5.0, 2), (7.0, 0)]:
+                recorder.write(timestamp, np.full((48, 64, 3), value, dtype=np.uint8))
+
+        runs = []
+        for workers in (1, 3):
+            detections = []
+            with SessionSource(self.directory, max_speed=True) as source:
+                ScanPipeline(source, workers=workers, dedup_ttl=3.5,
+                             on_detection=detections.append).run()
+            runs.append([qr_code["paket_nr"] for qr_code in detections])
+
+        self.assertEqual(runs[0], runs[1])
+        # Wiederkehrende Etiketten an gleicher Stelle gehören zum selben Track
+        self.assertEqual(runs[0], ["000000000000", "000000000001", "000000000002"])
+
+
+class TestScanPipeline(unittest.TestCase):
+    """Testklasse für die Scan-Pipeline ohne GUI"""
+
+    @patch('src.scanner.decoder.decode')
+    def test_pipeline_dedups_by_media_time(self, mock_decode):
+        """Test für Reihenfolge und Duplikaterkennung in Medienzeit"""
+        mock_qr = MagicMock()
+        mock_qr.data = b'AUFTRAGS-NR.: NL-2581949\nPAKET-NR.: 04002338535'
+        mock_qr.polygon = [(10, 10), (100, 10), (100, 100), (10, 100)]
+
+        label = np.full((200, 200, 3), 255, dtype=np.uint8)
+        empty = np.zeros((200, 200, 3), dtype=np.uint8)
+
+        # Decoder findet den Code nur auf den weißen Bildern
+        mock_decode.side_effect = lambda image, **kwargs: [mock_qr] if image.max() > 0 else []
+
+        # Etikett, Lücke (Track endet), Etikett innerhalb und nach dem Zeitfenster
+        def gap(start):
+            return [(start + 0.01 * i, empty) for i in range(1, 8)]
+
+        items = [(0.0, label)] + gap(0.0) + [(1.0, label)] + gap(1.0) + [(20.0, label)]
+        detections = []
+
+        pipeline = ScanPipeline(ListSource(items), workers=3, dedup_ttl=10.0, on_detection=detections.append)
+        stats = pipeline.run()
+
+        self.assertEqual(stats["frames"], 17)
+        self.assertEqual(stats["decoded"], 17)
+        self.assertEqual(stats["detections"], 2)
+        self.assertEqual([qr_code["paket_nr"] for qr_code in detections], ["04002338535"] * 2)
+
+
+class FakeCapture:
+    """VideoCapture-Ersatz, der nur bestimmte Auflösungen unterstützt"""
+
+    def __init__(self, supported=((640, 480),)):
+        self.supported = supported
+        self.properties = {cv2.CAP_PROP_FRAME_WIDTH: 640, cv2.CAP_PROP_FRAME_HEIGHT: 480,
+                           cv2.CAP_PROP_FPS: 30.0, cv2.CAP_PROP_FOURCC: 0}
+        self.calls = []
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        self.calls.append(prop)
+        self.properties[prop] = value
+        return True
+
+    def get(self, prop):
+        # Nicht unterstützte Auflösungen fallen auf die erste unterstützte zurück
+        size = (self.properties[cv2.CAP_PROP_FRAME_WIDTH], self.properties[cv2.CAP_PROP_FRAME_HEIGHT])
+        if size not in self.supported:
+            size = self.supported[0]
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return size[0]
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return size[1]
+        return self.properties.get(prop, 0)
+
+    def read(self):
+        return True, np.zeros((4, 4, 3), dtype=np.uint8)
+
+    def release(self):
+        pass
+
+
+class TestCameraProfiles(unittest.TestCase):
+    """Testklasse für die Aushandlung der Kameraprofile"""
+
+    def test_profile_string_roundtrip(self):
+        """Test für die Textform der Profile"""
+        profile = CameraProfile("MJPG", 1280, 720, 30.0)
+        self.assertEqual(profile_to_string(profile), "MJPG 1280x720@30")
+        self.assertEqual(profile_from_string("MJPG 1280x720@30"), profile)
+        self.assertEqual(profile_from_string("640x480"), CameraProfile(None, 640, 480, None))
+
+        with self.assertRaises(ValueError):
+            profile_from_string("groß")
+
+    def test_measure_profile(self):
+        """Test für die Messung und das Erkennen nicht unterstützter Auflösungen"""
+        capture = FakeCapture(supported=((640, 480), (1280, 720)))
+
+        result = measure_profile(0, CameraProfile("MJPG", 1280, 720, 30), frames=5,
+                                 capture_factory=lambda camera_id: capture)
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["actual"].fourcc, "MJPG")
+        self.assertGreater(result["fps"], 0)
+        self.assertIsNotNone(result["latency_ms"])
+
+        # FOURCC wird vor der Auflösung gesetzt
+        self.assertLess(capture.calls.index(cv2.CAP_PROP_FOURCC), capture.calls.index(cv2.CAP_PROP_FRAME_WIDTH))
+
+        result = measure_profile(0, CameraProfile("MJPG", 1920, 1080, 30), frames=5,
+                                 capture_factory=lambda camera_id: FakeCapture())
+        self.assertFalse(result["ok"])
+
+    def test_negotiate_prefers_resolution_at_sufficient_fps(self):
+        """Test für die Auswahl des besten Profils"""
+        measured = {
+            "MJPG 1920x1080@30": 12.0,
+            "MJPG 1280x720@30": 29.5,
+            "MJPG 640x480@30": 30.0,
+            "YUYV 1280x720@30": 9.8,
+            "YUYV 640x480@30": None
+        }
+
+        def measure(camera_id, profile, frames=30):
+            fps = measured[profile_to_string(profile)]
+            return {"profile": profile, "actual": profile, "fps": fps or 0.0,
+                    "latency_ms": 1000.0 / fps if fps else None, "ok": fps is not None}
+
+        candidates = [profile_from_string(text) for text in measured]
+        results = negotiate_profile(0, candidates, measure=measure)
+
+        self.assertEqual(profile_to_string(results[0]["profile"]), "MJPG 1280x720@30")
+        self.assertEqual(len(results), 4)
+
+    def test_profile_cache(self):
+        """Test für die Speicherung der Profile pro Kamera"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = ProfileCache(os.path.join(temp_dir, "profiles.json"))
+            self.assertIsNone(cache.get_selected(0))
+
+            best = CameraProfile("MJPG", 1280, 720, 30.0)
+            other = CameraProfile("YUYV", 640, 480, 30.0)
+            cache.save(0, [{"profile": best, "fps": 29.7, "latency_ms": 33.4},
+                           {"profile": other, "fps": 30.0, "latency_ms": 33.0}])
+
+            self.assertEqual([item["profile"] for item in cache.load(0)], [best, other])
+            self.assertEqual(cache.get_selected(0), best)
+            self.assertIsNone(cache.get_selected(0, fallback_to_best=False))
+
+            cache.set_selected(0, other)
+            self.assertEqual(ProfileCache(cache.cache_path).get_selected(0), other)
+            self.assertEqual(cache.load(1), [])
+
+            cache.set_selected(0, None)
+            self.assertEqual(cache.get_selected(0), best)
+
+
+class TestCameraDiscovery(unittest.TestCase):
+    """Testklasse für die Kamerasuche"""
+
+    def test_discover_cameras_parallel_with_timeout(self):
+        """Test für die parallele Suche mit Timeout pro Gerät"""
+        def probe(camera_id):
+            if camera_id == 3:
+                # Hängendes Gerät
+                time.sleep(5)
+            else:
+                time.sleep(0.2)
+            return camera_id in (0, 2, 3)
+
+        start = time.monotonic()
+        available = discover_cameras(range(5), timeout=0.5, probe=probe)
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(available, [0, 2])
+        # Parallel geprüft: deutlich schneller als 5 x 0.2 Sekunden plus hängendes Gerät
+        self.assertLess(elapsed, 1.0)
+
+    def test_camera_cache_roundtrip(self):
+        """Test für das Speichern und Laden des Kamera-Caches"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = CameraCache(os.path.join(tmp_dir, "sub", "camera_cache.json"))
+
+            self.assertEqual(cache.load(), [])
+            self.assertTrue(cache.save([0, 2]))
+            self.assertEqual(cache.load(), [0, 2])
+
+    def test_timed_out_cameras_stay_cached(self):
+        """Test, dass eine zu langsam öffnende Kamera nicht aus dem Cache fällt"""
+        def probe(camera_id):
+            if camera_id == 1:
+                # Langsam öffnendes Gerät
+                time.sleep(1.0)
+            return camera_id in (0, 1)
+
+        available, timed_out = discover_cameras(range(3), timeout=0.3, probe=probe, with_timeouts=True)
+        self.assertEqual(available, [0])
+        self.assertEqual(timed_out, [1])
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            cache = CameraCache(os.path.join(tmp_dir, "camera_cache.json"))
+
+            # Nicht zwischengespeicherte Geräte mit Timeout werden nicht übernommen
+            self.assertEqual(cache.merge(available, timed_out), [0])
+
+            cache.save([0, 1])
+            self.assertEqual(cache.merge(available, timed_out), [0, 1])
+            self.assertEqual(cache.merge([0], []), [0])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,586 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests für die Speicherung der Scan-Ergebnisse
+"""
+
+import unittest
+import sys
+import os
+import csv
+import gzip
+import json
+import sqlite3
+import tempfile
+import threading
+import time
+import tracemalloc
+
+# Projektverzeichnis zum Python-Pfad hinzufügen
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.data.storage import (ScanResultStorage, SQLiteBackend, JournalBackend, ArchiveBackend,
+                              DATABASE_FILE, JOURNAL_FILE, CHECKPOINT_SUFFIX, SNAPSHOT_SUFFIX,
+                              read_checkpoint)
+from src.data.archive import ScanArchive, INDEX_SUFFIX
+from src.data.storage_service import StorageService
+from src.data.export import export_format, export_results
+
+
+def make_result(i, **extra):
+    """Erzeugt ein Scan-Ergebnis für die Tests"""
+    result = {
+        "timestamp": f"2026-01-{1 + i % 28:02d}T12:00:{i % 60:02d}",
+        "auftrags_nr": f"NL-{i % 10}",
+        "paket_nr": f"0400233{i:05d}",
+        "kunden_name": "Test",
+        "raw_data": f"NL-{i % 10} 0400233{i:05d}"
+    }
+    result.update(extra)
+    return result
+
+
+class TestScanResultStorage(unittest.TestCase):
+    """Testklasse für den ScanResultStorage"""
+
+    def setUp(self):
+        """Wird vor jedem Test ausgeführt"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _storage(self, backend, **options):
+        storage = ScanResultStorage(self.tmp.name, backend=backend, **options)
+        self.addCleanup(storage.close)
+        return storage
+
+    def test_memory_backend_keeps_behaviour(self):
+        """Test für die Ablage im Speicher (Standard)"""
+        storage = self._storage("memory")
+        storage.add_result({"raw_data": "NL-1"})
+
+        self.assertEqual(len(storage.results), 1)
+        self.assertIn("timestamp", storage.get_results()[0])
+
+        storage.clear_results()
+        self.assertEqual(storage.get_results(), [])
+
+    def test_backends_return_same_pages(self):
+        """Speicher und Datenbank liefern dieselben Seiten und Suchergebnisse"""
+        memory = self._storage("memory")
+        database = self._storage("sqlite", batch_size=7)
+
+        for i in range(50):
+            memory.add_result(make_result(i, camera_id=i % 2))
+            database.add_result(make_result(i, camera_id=i % 2))
+
+        for storage in (memory, database):
+            self.assertEqual(storage.count_results(), 50)
+            self.assertEqual(storage.get_results(limit=10, offset=20), memory.get_results()[20:30])
+            self.assertEqual(storage.find_results(auftrags_nr="NL-3"),
+                             [make_result(i, camera_id=i % 2) for i in range(3, 50, 10)])
+            self.assertEqual(storage.count_results(paket_nr="040023300007"), 1)
+            self.assertEqual(storage.count_results(since="2026-01-05", until="2026-01-07"), 4)
+
+    def test_sqlite_batches_and_flushes(self):
+        """Ergebnisse werden gesammelt und spätestens nach max_delay geschrieben"""
+        storage = self._storage("sqlite", batch_size=100, max_delay=0.05)
+        database_path = os.path.join(self.tmp.name, DATABASE_FILE)
+
+        storage.add_result(make_result(1))
+
+        # Eine zweite Verbindung sieht nur geschriebene Ergebnisse
+        with sqlite3.connect(database_path) as connection:
+            self.assertEqual(connection.execute("SELECT COUNT(*) FROM scan_results").fetchone()[0], 0)
+
+        time.sleep(0.3)
+        with sqlite3.connect(database_path) as connection:
+            self.assertEqual(connection.execute("SELECT COUNT(*) FROM scan_results").fetchone()[0], 1)
+            mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+            indexes = {row[1] for row in connection.execute("PRAGMA index_list(scan_results)")}
+
+        self.assertEqual(mode, "wal")
+        self.assertTrue({"idx_scan_results_paket_nr", "idx_scan_results_auftrags_nr",
+                         "idx_scan_results_timestamp"} <= indexes)
+
+    def test_sqlite_persists_across_instances(self):
+        """Die Datenbank bleibt nach dem Schließen erhalten"""
+        storage = ScanResultStorage(self.tmp.name, backend="sqlite")
+        storage.add_result(make_result(1, symbology="QRCODE"))
+        storage.close()
+
+        backend = SQLiteBackend(os.path.join(self.tmp.name, DATABASE_FILE))
+        self.addCleanup(backend.close)
+        self.assertEqual(backend.query(), [make_result(1, symbology="QRCODE")])
+
+    def test_sqlite_export_and_load(self):
+        """Export als JSON und erneutes Laden in die Datenbank"""
+        storage = self._storage("sqlite")
+        for i in range(5):
+            storage.add_result(make_result(i))
+
+        self.assertTrue(storage.save_to_json("export.json"))
+        with open(os.path.join(self.tmp.name, "export.json"), encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)), 5)
+
+        storage.clear_results()
+        self.assertEqual(storage.count_results(), 0)
+
+        self.assertTrue(storage.load_from_json(os.path.join(self.tmp.name, "export.json")))
+        self.assertEqual(storage.get_results(), [make_result(i) for i in range(5)])
+
+
+class TestJournalBackend(unittest.TestCase):
+    """Testklasse für das Journal der Scan-Ergebnisse"""
+
+    def setUp(self):
+        """Wird vor jedem Test ausgeführt"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.journal_path = os.path.join(self.tmp.name, JOURNAL_FILE)
+
+    def _read_lines(self):
+        with open(self.journal_path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_journal_writes_one_line_per_scan(self):
+        """Jeder Scan wird als eine Zeile angehängt, fsync erfolgt gesammelt"""
+        storage = ScanResultStorage(self.tmp.name, backend="journal", sync_count=10, sync_interval=60)
+        for i in range(25):
+            storage.add_result(make_result(i))
+        storage.flush()
+
+        self.assertEqual(self._read_lines(), [make_result(i) for i in range(25)])
+        self.assertLessEqual(storage.backend.syncs, 3)
+        storage.close()
+
+    def test_journal_syncs_after_interval(self):
+        """Ungesicherte Zeilen werden spätestens nach sync_interval gesichert"""
+        backend = JournalBackend(self.journal_path, sync_interval=0.05, sync_count=100)
+        self.addCleanup(backend.close)
+
+        backend.add(make_result(1))
+        deadline = time.monotonic() + 2.0
+        while backend.syncs == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(backend.syncs, 1)
+        self.assertEqual(self._read_lines(), [make_result(1)])
+
+    def test_replay_from_checkpoint(self):
+        """Beim Start werden nur die Ergebnisse nach dem Checkpoint wiederhergestellt"""
+        storage = ScanResultStorage(self.tmp.name, backend="journal")
+        storage.add_result(make_result(1))
+        storage.clear_results()
+        storage.add_result(make_result(2))
+        storage.add_result(make_result(3))
+        storage.close()
+
+        # Das Journal enthält weiterhin alle Scans
+        self.assertEqual(len(self._read_lines()), 3)
+
+        storage = ScanResultStorage(self.tmp.name, backend="journal")
+        self.addCleanup(storage.close)
+        self.assertEqual(storage.get_results(), [make_result(2), make_result(3)])
+        self.assertEqual(storage.backend.replayed, 2)
+
+    def test_replay_starts_at_snapshot(self):
+        """Beim Start werden der Snapshot und nur die Zeilen dahinter gelesen"""
+        backend = JournalBackend(self.journal_path, sync_count=1, snapshot_count=10)
+        for i in range(25):
+            backend.add(make_result(i))
+        backend.flush()
+
+        # Snapshots entstehen schon während des Betriebs
+        self.assertGreaterEqual(backend.snapshots, 1)
+        with open(self.journal_path + CHECKPOINT_SUFFIX, encoding="utf-8") as f:
+            snapshot = json.load(f)["snapshot"]
+        self.assertGreaterEqual(snapshot["count"], 10)
+        backend.close()
+
+        # Zeilen hinter dem Snapshot, z.B. nach einem Absturz
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            for i in (25, 26):
+                f.write(json.dumps(make_result(i)) + "\n")
+
+        backend = JournalBackend(self.journal_path, snapshot_count=10)
+        self.addCleanup(backend.close)
+        self.assertEqual(backend.query(), [make_result(i) for i in range(27)])
+        self.assertEqual(backend.replayed, 27)
+        self.assertEqual(backend.replayed_lines, 2)
+
+    def test_replay_without_snapshot(self):
+        """Ohne passenden Snapshot wird das Journal ab dem Checkpoint gelesen"""
+        storage = ScanResultStorage(self.tmp.name, backend="journal")
+        storage.add_result(make_result(1))
+        storage.clear_results()
+        storage.add_result(make_result(2))
+        storage.close()
+        os.remove(self.journal_path + SNAPSHOT_SUFFIX)
+
+        storage = ScanResultStorage(self.tmp.name, backend="journal")
+        self.addCleanup(storage.close)
+        self.assertEqual(storage.get_results(), [make_result(2)])
+        self.assertEqual(storage.backend.replayed_lines, 1)
+
+    def test_replay_drops_incomplete_line(self):
+        """Eine beim Absturz abgeschnittene letzte Zeile wird verworfen"""
+        with open(self.journal_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(make_result(1)) + "\n" + '{"paket_nr": "0400')
+
+        backend = JournalBackend(self.journal_path)
+        backend.add(make_result(2))
+        backend.close()
+
+        self.assertEqual(self._read_lines(), [make_result(1), make_result(2)])
+
+
+class SlowStorage(ScanResultStorage):
+    """Speicher, der bis zur Freigabe blockiert (langsames Laufwerk)"""
+
+    def __init__(self, storage_dir):
+        super().__init__(storage_dir)
+        self.release = threading.Event()
+        self.closed = False
+
+    def add_result(self, scan_result):
+        self.release.wait(5.0)
+        super().add_result(scan_result)
+
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+class TestStorageService(unittest.TestCase):
+    """Testklasse für den StorageService"""
+
+    def setUp(self):
+        """Wird vor jedem Test ausgeführt"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_results_are_written_in_background(self):
+        """Ergebnisse werden im Schreib-Thread gespeichert, flush wartet darauf"""
+        storage = ScanResultStorage(self.tmp.name, backend="sqlite", max_delay=60)
+        service = StorageService(storage)
+
+        for i in range(20):
+            self.assertTrue(service.add_result(make_result(i)))
+
+        self.assertTrue(service.flush(timeout=5.0))
+        self.assertEqual(storage.count_results(), 20)
+        self.assertEqual(service.get_stats()["written"], 20)
+        self.assertTrue(service.close())
+
+    def test_full_queue_drops_without_blocking(self):
+        """Bei voller Warteschlange wird verworfen statt zu blockieren"""
+        storage = SlowStorage(self.tmp.name)
+        service = StorageService(storage, queue_size=2, put_timeout=0.01)
+
+        results = [service.add_result(make_result(i)) for i in range(6)]
+        stats = service.get_stats()
+
+        self.assertIn(False, results)
+        self.assertGreater(stats["dropped"], 0)
+        self.assertEqual(stats["max_depth"], 2)
+
+        storage.release.set()
+        self.assertTrue(service.close())
+        self.assertTrue(storage.closed)
+        self.assertEqual(len(storage.get_results()), results.count(True))
+        self.assertFalse(service.add_result(make_result(99)))
+
+    def test_submit_rejects_when_full(self):
+        """Aufgaben blockieren bei voller Warteschlange nicht, sondern werden abgelehnt"""
+        storage = SlowStorage(self.tmp.name)
+        service = StorageService(storage, queue_size=1, put_timeout=0.01)
+
+        # Ein Ergebnis wird geschrieben (blockiert), eines wartet
+        service.add_result(make_result(0))
+        time.sleep(0.05)
+        service.add_result(make_result(1))
+
+        start = time.monotonic()
+        self.assertFalse(service.submit(lambda: None))
+        self.assertFalse(service.submit(lambda: None, timeout=0.05))
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertEqual(service.get_stats()["dropped"], 0)
+
+        storage.release.set()
+        self.assertTrue(service.flush(5.0))
+        self.assertTrue(service.submit(lambda: None))
+        self.assertTrue(service.close())
+
+    def test_submit_runs_task_with_callback(self):
+        """Aufgaben laufen im Schreib-Thread, das Ergebnis kommt über den Callback"""
+        service = StorageService(ScanResultStorage(self.tmp.name))
+        self.addCleanup(service.close)
+        done = threading.Event()
+        outcome = []
+
+        def task():
+            return threading.current_thread().name
+
+        def callback(result, error):
+            outcome.append((result, error))
+            done.set()
+
+        service.submit(task, callback)
+        self.assertTrue(done.wait(5.0))
+        self.assertEqual(outcome, [("StorageService", None)])
+
+        done.clear()
+        service.submit(lambda: 1 / 0, callback)
+        self.assertTrue(done.wait(5.0))
+        self.assertIsInstance(outcome[1][1], ZeroDivisionError)
+
+
+class TestExport(unittest.TestCase):
+    """Testklasse für den zeilenweisen Export"""
+
+    def setUp(self):
+        """Wird vor jedem Test ausgeführt"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def test_export_format(self):
+        """Das Format wird am Dateinamen erkannt, auch mit .gz"""
+        self.assertEqual(export_format("scans.csv"), "csv")
+        self.assertEqual(export_format("scans.JSON.gz"), "json")
+        self.assertEqual(export_format("scans.jsonl"), "jsonl")
+        with self.assertRaises(ValueError):
+            export_format("scans.xlsx")
+
+    def test_csv_uses_fixed_schema_and_gzip(self):
+        """CSV mit festen Spalten aus einem Iterator, gzip-komprimiert"""
+        progress = []
+        results = (make_result(i, camera_id=1, track_id=i) for i in range(25))
+
+        count = export_results(results, self._path("scans.csv.gz"), progress=progress.append, interval=10)
+
+        self.assertEqual(count, 25)
+        self.assertEqual(progress, [10, 20, 25])
+        with gzip.open(self._path("scans.csv.gz"), "rt", encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(list(rows[0]), ["timestamp", "auftrags_nr", "paket_nr", "kunden_name",
+                                         "raw_data", "symbology", "camera_id"])
+        self.assertEqual(rows[3]["paket_nr"], "040023300003")
+        self.assertEqual(rows[3]["camera_id"], "1")
+
+    def test_json_is_valid_for_any_length(self):
+        """Die zeilenweise geschriebene JSON-Liste ist gültiges JSON"""
+        for n in (0, 1, 3):
+            path = self._path(f"scans_{n}.json")
+            export_results((make_result(i) for i in range(n)), path)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(json.load(f), [make_result(i) for i in range(n)])
+
+    def test_storage_exports_ranges(self):
+        """Export eines Zeitraums bzw. eines Zeilenbereichs aus der Datenbank"""
+        storage = ScanResultStorage(self.tmp.name, backend="sqlite", batch_size=7)
+        self.addCleanup(storage.close)
+        for i in range(50):
+            storage.add_result(make_result(i))
+
+        count = storage.export(self._path("range.jsonl"), since="2026-01-05", until="2026-01-07")
+        self.assertEqual(count, 4)
+
+        self.assertTrue(storage.save_to_csv("page.csv", offset=10, limit=5, compress=True))
+        with gzip.open(self._path("page.csv.gz"), "rt", encoding="utf-8", newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([row["paket_nr"] for row in rows], [f"0400233{i:05d}" for i in range(10, 15)])
+
+        # Seitenweises Lesen über mehrere Abfragen liefert alle Ergebnisse genau einmal
+        self.assertEqual(list(storage.backend.iter_results(batch_size=8)), [make_result(i) for i in range(50)])
+
+
+class TestScanArchive(unittest.TestCase):
+    """Testklasse für das seitenweise Laden großer Archive"""
+
+    def setUp(self):
+        """Wird vor jedem Test ausgeführt"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.results = [make_result(i, kunden_name="Müller, \"GmbH\" [x]") for i in range(30)]
+
+    def _write(self, name, results=None):
+        path = os.path.join(self.tmp.name, name)
+        export_results(self.results if results is None else results, path)
+        return path
+
+    def _open(self, path):
+        archive = ScanArchive(path)
+        self.addCleanup(archive.close)
+        return archive
+
+    def test_json_and_jsonl_pages(self):
+        """Einträge einer JSON-Liste und einer JSONL-Datei werden seitenweise gelesen"""
+        for name in ("scans.json", "scans.jsonl"):
+            archive = self._open(self._write(name))
+            self.assertEqual(len(archive), 30)
+            self.assertEqual(archive.page(10, 5), self.results[10:15])
+            self.assertEqual(archive.get(-1), self.results[-1])
+            self.assertEqual(list(archive.iter_records(page_size=7)), self.results)
+
+    def test_compact_array_with_bom(self):
+        """Einzeilige JSON-Liste mit BOM, wie sie andere Programme schreiben"""
+        path = os.path.join(self.tmp.name, "compact.json")
+        with open(path, "w", encoding="utf-8-sig") as f:
+            json.dump(self.results, f, ensure_ascii=False, separators=(",", ":"))
+
+        self.assertEqual(list(self._open(path)), self.results)
+
+    def test_index_is_reused_until_file_changes(self):
+        """Beim erneuten Öffnen wird der Index wiederverwendet, nach einer Änderung neu erstellt"""
+        path = self._write("scans.json")
+        self.assertFalse(self._open(path).index_reused)
+        self.assertTrue(os.path.exists(path + INDEX_SUFFIX))
+
+        archive = self._open(path)
+        self.assertTrue(archive.index_reused)
+        self.assertEqual(archive.page(28), self.results[28:])
+
+        self._write("scans.json", self.results[:3])
+        os.utime(path, ns=(0, 0))
+        archive = self._open(path)
+        self.assertFalse(archive.index_reused)
+        self.assertEqual(list(archive), self.results[:3])
+
+    def test_invalid_archive(self):
+        """Abgeschnittene oder fremde Dateien werden abgelehnt"""
+        path = os.path.join(self.tmp.name, "broken.json")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(self.results)[:-20])
+        with self.assertRaises(ValueError):
+            ScanArchive(path)
+
+        storage = ScanResultStorage(self.tmp.name)
+        self.assertFalse(storage.load_from_json(path))
+        self.assertEqual(storage.count_results(), 0)
+
+    def test_non_list_json_is_rejected(self):
+        """Kein Laden von JSON-Dateien, die keine Liste von Scan-Ergebnissen sind"""
+        contents = {
+            "object.json": '{"a": 1}',
+            "pretty.jsonl": '{\n  "a": 1\n}\n',
+            "garbage.jsonl": '{"a": 1} garbage\n',
+            "numbers.jsonl": '1\n2\n',
+            "trailing.json": '[{"a": 1}] garbage',
+            "strings.json": '["a", "b"]'
+        }
+        storage = ScanResultStorage(self.tmp.name)
+        for name, content in contents.items():
+            path = os.path.join(self.tmp.name, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+
+            with self.assertRaises(ValueError, msg=name):
+                ScanArchive(path)
+            self.assertFalse(storage.load_from_json(path), name)
+            self.assertEqual(storage.get_results(), [])
+
+    def test_incomplete_last_line_is_skipped(self):
+        """Eine halb geschriebene letzte Zeile (laufendes Journal) wird ignoriert"""
+        path = self._write("journal.jsonl")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"paket_nr": "0400')
+
+        archive = self._open(path)
+        self.assertEqual(list(archive), self.results)
+
+    def test_journal_is_read_without_changes(self):
+        """Ein laufendes Journal wird ab dem Checkpoint gelesen, ohne es zu verändern"""
+        path = os.path.join(self.tmp.name, JOURNAL_FILE)
+        journal = JournalBackend(path)
+        journal.add(make_result(0))
+        journal.clear()
+        journal.add(make_result(1))
+        journal.add(make_result(2))
+        journal.close()
+
+        # Zeile, die die Anwendung gerade schreibt
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"paket_nr": "0400')
+        with open(path, "rb") as f:
+            content = f.read()
+
+        archive = self._open_at(path, read_checkpoint(path))
+        self.assertEqual(list(archive), [make_result(1), make_result(2)])
+        self.assertFalse(os.path.exists(path + INDEX_SUFFIX))
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), content)
+
+    def _open_at(self, path, start):
+        archive = ScanArchive(path, use_index_file=False, start=start)
+        self.addCleanup(archive.close)
+        return archive
+
+    def test_sqlite_import_is_batched(self):
+        """Der Import in die Datenbank hält nie das ganze Archiv im Speicher"""
+        path = self._write("large.jsonl", (make_result(i, note="x" * 400) for i in range(10000)))
+        storage = ScanResultStorage(self.tmp.name, backend="sqlite", batch_size=100)
+        self.addCleanup(storage.close)
+
+        tracemalloc.start()
+        try:
+            self.assertTrue(storage.load_from_json(path, lazy=False))
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(storage.count_results(), 10000)
+        # Alle Ergebnisse auf einmal belegen weit über 10 MB, blockweise bleibt es eine Seite
+        self.assertLess(peak, 4 * 1024 * 1024)
+
+    def test_load_is_lazy_for_memory_backend(self):
+        """Der Speicher verwendet das Archiv direkt; neue Scans kommen dahinter"""
+        storage = ScanResultStorage(self.tmp.name)
+        self.addCleanup(storage.close)
+        self.assertTrue(storage.load_from_json(self._write("scans.jsonl")))
+
+        self.assertIsInstance(storage.backend, ArchiveBackend)
+        storage.add_result(make_result(30))
+        self.assertEqual(storage.count_results(), 31)
+        self.assertEqual(storage.get_results(limit=3, offset=29), [self.results[29], make_result(30)])
+        self.assertEqual(storage.find_results(paket_nr="040023300030"), [make_result(30)])
+        self.assertEqual(storage.count_results(auftrags_nr="NL-3"), 3)
+
+        storage.clear_results()
+        self.assertEqual(storage.get_results(), [])
+
+    def test_load_into_sqlite(self):
+        """In eine Datenbank werden die Einträge übernommen, vorhandene Ergebnisse bleiben erhalten"""
+        storage = ScanResultStorage(self.tmp.name, backend="sqlite")
+        self.addCleanup(storage.close)
+        storage.add_result(make_result(99))
+
+        self.assertTrue(storage.load_from_json(self._write("scans.json")))
+        self.assertIsInstance(storage.backend, SQLiteBackend)
+        self.assertEqual(storage.get_results(), [make_result(99)] + self.results)
+
+        # Ersetzen nur auf ausdrücklichen Wunsch
+        self.assertTrue(storage.load_from_json(self._write("scans.jsonl"), replace=True))
+        self.assertEqual(storage.get_results(), self.results)
+
+    def test_failed_sqlite_import_changes_nothing(self):
+        """Ein abgebrochener Import wird vollständig zurückgerollt"""
+        storage = ScanResultStorage(self.tmp.name, backend="sqlite")
+        self.addCleanup(storage.close)
+        storage.add_result(make_result(99))
+
+        def broken_archive():
+            yield from self.results[:10]
+            raise OSError("Archiv nicht mehr lesbar")
+
+        with self.assertRaises(OSError):
+            storage.backend.import_results(broken_archive(), replace=True)
+        self.assertEqual(storage.get_results(), [make_result(99)])
+
+
+if __name__ == '__main__':
+    unittest.main()